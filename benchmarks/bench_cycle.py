@@ -0,0 +1,299 @@
+"""Benchmark de extremo a extremo del ciclo de scraping sin red
+
+Reproduce las páginas guardadas en benchmarks/fixtures/ para ESPN, Liga MX
+oficial, Fox Sports y Medio Tiempo. Con --transport adapter (por defecto en el
+motor síncrono) se monta un adaptador de transporte en la sesión de requests
+que responde desde los archivos sin abrir sockets y conserva las URLs reales;
+con --transport server se sirven desde un servidor HTTP local, que es lo que
+usa el motor asíncrono.
+
+Mide:
+  - tiempo del ciclo completo scrape_all_sources (media, p50, p95);
+  - rendimiento del parseo por fuente (páginas/s);
+  - pico de memoria de un ciclo (tracemalloc) y RSS máximo del proceso;
+  - costo de consolidate_data sobre los resultados del ciclo.
+
+El resultado es JSON (--output archivo) para comparar entre commits; con
+--baseline se imprime la variación respecto a un resultado anterior.
+
+Uso:
+    python benchmarks/bench_cycle.py [--engine sync|async] [--transport adapter|server]
+                                     [--streaming] [--cycles 30] [--repeat 50]
+                                     [--output bench.json]
+                                     [--baseline anterior.json] [--json]
+"""
+import argparse
+import functools
+import http.server
+import io
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+SOURCES = ('espn_mx', 'ligamx_oficial', 'foxsports', 'medio_tiempo')
+
+
+class FixtureAdapter(BaseAdapter):
+    """Adaptador de transporte de requests que responde con las páginas guardadas"""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages  # (host, path) -> bytes
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        parts = urlsplit(request.url)
+        body = self.pages.get((parts.netloc, parts.path))
+
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = 200 if body is not None else 404
+        response.reason = 'OK' if body is not None else 'Not Found'
+        body = body or b''
+        response.headers = requests.structures.CaseInsensitiveDict({
+            'Content-Type': 'text/html; charset=utf-8',
+            'Content-Length': str(len(body)),
+        })
+        response.encoding = 'utf-8'
+        response.raw = io.BytesIO(body)
+        return response
+
+    def close(self):
+        pass
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    handler = functools.partial(QuietHandler, directory=FIXTURES)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def read_fixture(source):
+    with open(os.path.join(FIXTURES, f'{source}.html'), 'rb') as f:
+        return f.read()
+
+
+def make_scraper(engine, transport, base_url=None, streaming=False, backend=None):
+    """Scraper con las fuentes apuntando a las páginas guardadas"""
+    scraper = tabla.AsyncLigaMXScraper() if engine == 'async' else tabla.LigaMXScraper()
+    if backend is not None:
+        scraper.parser = tabla.get_parser_backend(backend)
+    scraper.cache = None  # Cada ciclo descarga y parsea de nuevo
+    scraper.streaming = streaming
+    pages = {}
+    for source in SOURCES:
+        config = scraper.sources[source]
+        if transport == 'server':
+            config['url'] = f'{base_url}/{source}.html'
+        parts = urlsplit(config['url'])
+        pages[(parts.netloc, parts.path)] = read_fixture(source)
+        config['min_interval'] = 0  # Sin cortesía: no hay servidor remoto
+    scraper.configure_sources()
+
+    adapter = None
+    if transport == 'adapter':
+        adapter = FixtureAdapter(pages)
+        scraper.session.mount('http://', adapter)
+        scraper.session.mount('https://', adapter)
+    return scraper, adapter
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def time_cycles(scraper, cycles):
+    """Milisegundos por ciclo completo; el primer ciclo calienta conexiones y parsers"""
+    results = scraper.scrape_all_sources()
+    timings = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        results = scraper.scrape_all_sources()
+        timings.append((time.perf_counter() - started) * 1000)
+    return results, timings
+
+
+def parse_throughput(scraper, repeat):
+    """Páginas por segundo de parse_source sobre cada fixture, sin red"""
+    throughput = {}
+    for source in SOURCES:
+        content = read_fixture(source)
+        teams = scraper.parse_source(source, content)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            scraper.parse_source(source, content)
+        elapsed = time.perf_counter() - started
+        throughput[source] = {
+            'teams': len(teams or []),
+            'kib': len(content) // 1024,
+            'pages_per_s': round(repeat / elapsed, 1),
+        }
+    return throughput
+
+
+def consolidate_cost(scraper, results, repeat):
+    """Milisegundos por llamada a consolidate_data sobre los resultados del ciclo"""
+    scraper.consolidate_data(results)  # calentamiento: la primera llamada importa numpy
+    started = time.perf_counter()
+    for _ in range(repeat):
+        scraper.consolidate_data(results)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def peak_memory(scraper, source=None):
+    """Pico de memoria Python (tracemalloc) de un ciclo, medido aparte del tiempo
+
+    Con source mide sólo esa fuente, sin cadena de respaldo ni consolidación.
+    """
+    tracemalloc.start()
+    if source is None:
+        scraper.teams_data = scraper.consolidate_data(scraper.scrape_all_sources())
+    else:
+        scraper.scrape_source(source, fallback=False)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Variación relativa de las métricas principales respecto a un resultado anterior"""
+    def ratio(new, old):
+        return round(new / old - 1, 3) if old else None
+
+    deltas = {
+        'cycle_mean_ms': ratio(results['cycle_ms']['mean'], baseline['cycle_ms']['mean']),
+        'cycle_p95_ms': ratio(results['cycle_ms']['p95'], baseline['cycle_ms']['p95']),
+        'consolidate_ms': ratio(results['consolidate_ms'], baseline['consolidate_ms']),
+        'peak_kib': ratio(results['peak_kib'], baseline['peak_kib']),
+    }
+    for source, data in results['parse'].items():
+        old = baseline['parse'].get(source)
+        if old:
+            deltas[f'parse_{source}_pages_per_s'] = ratio(data['pages_per_s'], old['pages_per_s'])
+    return deltas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--engine', choices=('sync', 'async'), default='sync')
+    parser.add_argument('--transport', choices=('adapter', 'server'),
+                        help='adapter (por defecto en sync) o server (obligatorio en async)')
+    parser.add_argument('--streaming', action='store_true', help='Descarga en modo streaming')
+    parser.add_argument('--cycles', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=50,
+                        help='Repeticiones del parseo y de consolidate_data')
+    parser.add_argument('--output', help='Guarda el resultado JSON en este archivo')
+    parser.add_argument('--baseline', help='Resultado JSON anterior con el que comparar')
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    if args.engine == 'async' and tabla.aiohttp is None:
+        parser.error('el motor asíncrono requiere aiohttp')
+    transport = args.transport or ('server' if args.engine == 'async' else 'adapter')
+    if args.engine == 'async' and transport == 'adapter':
+        parser.error('el adaptador de transporte sólo aplica a requests (motor sync)')
+
+    server = start_server() if transport == 'server' else None
+    base_url = f'http://127.0.0.1:{server.server_port}' if server else None
+    scraper, adapter = make_scraper(args.engine, transport, base_url, args.streaming)
+    try:
+        results_cycle, timings = time_cycles(scraper, args.cycles)
+        results = {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'engine': args.engine,
+            'transport': transport,
+            'parser_backend': scraper.parser.name,
+            'fetch_mode': scraper.fetch_mode,
+            'streaming': scraper.streaming,
+            'sources_ok': sorted(results_cycle),
+            'cycles': args.cycles,
+            'cycle_ms': {
+                'mean': round(sum(timings) / len(timings), 3),
+                'p50': round(percentile(timings, 0.5), 3),
+                'p95': round(percentile(timings, 0.95), 3),
+                'min': round(min(timings), 3),
+            },
+            'parse': parse_throughput(scraper, args.repeat),
+            'consolidate_ms': round(consolidate_cost(scraper, results_cycle, args.repeat), 3),
+            'peak_kib': peak_memory(scraper) // 1024,
+            'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+        if adapter is not None:
+            results['adapter_requests'] = adapter.requests
+    finally:
+        if isinstance(scraper, tabla.AsyncLigaMXScraper):
+            scraper.shutdown()
+        if server is not None:
+            server.shutdown()
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            results['delta'] = compare(results, json.load(f))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        cycle = results['cycle_ms']
+        print(f"Motor: {results['engine']} ({results['transport']})  Backend: "
+              f"{results['parser_backend']}  Commit: {results['commit']}")
+        print(f"Fuentes con datos: {', '.join(results['sources_ok'])}")
+        print(f"Ciclo scrape_all_sources: media {cycle['mean']:.2f} ms  p50 {cycle['p50']:.2f}  "
+              f"p95 {cycle['p95']:.2f}  ({results['cycles']} ciclos)")
+        print(f"{'Fuente':<16} {'Equipos':>7} {'KiB':>6} {'Páginas/s':>10}")
+        print('-' * 42)
+        for source, data in results['parse'].items():
+            print(f"{source:<16} {data['teams']:>7} {data['kib']:>6} {data['pages_per_s']:>10.1f}")
+        print(f"consolidate_data: {results['consolidate_ms']:.3f} ms")
+        print(f"Pico de memoria del ciclo: {results['peak_kib']} KiB  "
+              f"RSS máximo: {results['max_rss_kib']} KiB")
+        for name, delta in results.get('delta', {}).items():
+            if delta is not None:
+                print(f"  Δ {name}: {delta:+.1%}")
+
+    # Sin todas las fuentes el ciclo medido no es comparable
+    if len(results['sources_ok']) != len(SOURCES):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark del historial (SnapshotStore) con una temporada sintética
+
+Simula una temporada con actualizaciones cada minuto: la tabla sólo cambia
+mientras hay partidos (jornadas de fin de semana), el resto del tiempo cada
+ciclo registra cero filas. Mide el tiempo de inserción, el tamaño de la base
+y la latencia de "tabla a la hora T" y de la trayectoria de puntos.
+
+Uso:
+    python benchmarks/bench_history.py [--days 180] [--queries 200] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+SEASON_START = 1704067200.0  # 2024-01-01 00:00 UTC
+
+
+def initial_table():
+    return [
+        tabla.TeamStanding(i, name, 0, 0, 0, 0, 0, 0, 'consenso')
+        for i, name in enumerate(tabla.DEFAULT_TEAM_ALIASES, 1)
+    ]
+
+
+def simulate_minute(table, rng, live):
+    """Aplica goles y resultados aleatorios a los equipos que están jugando"""
+    for standing in live:
+        if rng.random() < 0.02:  # gol en este minuto
+            standing.goal_diff += rng.choice((-1, 1))
+            standing.points = standing.wins * 3 + standing.draws + rng.choice((0, 1, 3))
+    table.sort(key=tabla.TeamStanding.sort_key)
+    for position, standing in enumerate(table, 1):
+        standing.position = position
+
+
+def fill_season(store, days, seed):
+    rng = random.Random(seed)
+    table = initial_table()
+    updates = rows = 0
+    started = time.perf_counter()
+    for day in range(days):
+        matchday = day % 7 in (5, 6)  # sábado y domingo
+        for minute in range(0, 1440):
+            ts = SEASON_START + day * 86400 + minute * 60
+            live = table[:9] if matchday and 17 * 60 <= minute < 23 * 60 else ()
+            if live:
+                simulate_minute(table, rng, live)
+            if minute == 0 and matchday and day % 7 == 5:
+                for standing in table:
+                    standing.games += 1
+            rows += store.record(table, ts, ('espn_mx', 'ligamx_oficial'))
+            updates += 1
+    return updates, rows, time.perf_counter() - started
+
+
+def time_queries(store, days, queries, seed):
+    rng = random.Random(seed)
+    teams = list(tabla.DEFAULT_TEAM_ALIASES)
+    end = SEASON_START + days * 86400
+
+    started = time.perf_counter()
+    for _ in range(queries):
+        table = store.table_as_of(rng.uniform(SEASON_START, end))
+    as_of_ms = (time.perf_counter() - started) / queries * 1000
+
+    started = time.perf_counter()
+    for _ in range(queries):
+        trajectory = store.trajectory(rng.choice(teams))
+    trajectory_ms = (time.perf_counter() - started) / queries * 1000
+    return len(table), len(trajectory), as_of_ms, trajectory_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'historial.db')
+        store = tabla.SnapshotStore(path)
+        updates, rows, insert_s = fill_season(store, args.days, args.seed)
+        teams, trajectory_len, as_of_ms, trajectory_ms = time_queries(
+            store, args.days, args.queries, args.seed
+        )
+        store.close()
+        results = {
+            'days': args.days,
+            'updates': updates,
+            'rows_stored': rows,
+            'db_kib': os.path.getsize(path) // 1024,
+            'record_us': round(insert_s / updates * 1e6, 2),
+            'table_as_of_ms': round(as_of_ms, 3),
+            'trajectory_ms': round(trajectory_ms, 3),
+            'teams': teams,
+            'trajectory_points': trajectory_len,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Temporada: {results['days']} días, {results['updates']} actualizaciones")
+    print(f"Filas guardadas: {results['rows_stored']} ({results['db_kib']} KiB)")
+    print(f"record():          {results['record_us']:>9.2f} µs por actualización")
+    print(f"table_as_of():     {results['table_as_of_ms']:>9.3f} ms ({results['teams']} equipos)")
+    print(f"trajectory():      {results['trajectory_ms']:>9.3f} ms "
+          f"({results['trajectory_points']} puntos)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Microbenchmark de la normalización de nombres de equipos
+
+Compara la implementación anterior (diccionario reconstruido en cada llamada
+y búsqueda lineal por subcadena) con TeamNameNormalizer en frío (sin memo) y
+en caliente (lru_cache), sobre los nombres tal como llegan de las fuentes.
+También comprueba una lista de variantes que deben resolverse al nombre
+canónico (incluidas algunas que sólo resuelve el índice por palabras) y otra
+de clubes distintos que deben quedar tal cual; sale con código 1 si alguna
+falla.
+
+Uso:
+    python benchmarks/bench_normalizer.py [--repeat 2000] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+# Nombres crudos como aparecen en las distintas páginas
+SAMPLE_NAMES = [
+    'América', 'AMEAmérica', 'Club América', 'Cruz Azul', 'CAZCruz Azul',
+    'Chivas', 'Guadalajara', 'Pumas UNAM', 'Tigres UANL', 'Rayados de Monterrey',
+    'Santos Laguna', 'Deportivo Toluca', 'Club León', 'Atlas FC', 'Necaxa',
+    'Puebla', 'C.F. Pachuca', 'Xolos de Tijuana', 'Mazatlán FC', 'Gallos Blancos',
+    'FC Juárez', 'Atl. San Luis', 'Atlético de San Luis', 'San Luis',
+]
+
+# Variantes reales que deben llegar al nombre canónico
+ACCEPTED = {
+    'Club Santos Laguna': 'Santos Laguna',
+    'Tigres de la UANL': 'Tigres UANL',
+    'Club Tijuana Xoloitzcuintles': 'Tijuana',
+    'Querétaro FC': 'Querétaro',
+    'Puebla FC': 'Puebla',
+    'Club Atlas': 'Atlas',
+    'Mazatlan F.C.': 'Mazatlán FC',
+    # Sin alias propio: sólo las resuelve el índice por palabras
+    'Club Deportivo Toluca FC': 'Toluca',
+    'Tigres U.A.N.L.': 'Tigres UANL',
+    'Club Necaxa FC': 'Necaxa',
+    'Gallos Blancos Querétaro': 'Querétaro',
+}
+
+# Otros clubes que comparten palabras con los de Liga MX: deben quedar tal cual
+REJECTED = [
+    'Leones Negros', 'Leones Negros UdeG', 'Pumas Tabasco', 'Atlético Morelia',
+    'Raya2 Expansión', 'Tapatío', 'Mineros de Zacatecas', 'Cancún FC',
+]
+
+
+def legacy_normalize(name):
+    """Implementación anterior, conservada solo como referencia"""
+    if not name:
+        return "Equipo Desconocido"
+    name = name.lower().strip()
+    name_mapping = {
+        'américa': 'Club América', 'america': 'Club América', 'cruz azul': 'Cruz Azul',
+        'chivas': 'Guadalajara', 'guadalajara': 'Guadalajara', 'pumas': 'Pumas UNAM',
+        'tigres': 'Tigres UANL', 'monterrey': 'Monterrey', 'santos': 'Santos Laguna',
+        'toluca': 'Toluca', 'león': 'León', 'leon': 'León', 'atlas': 'Atlas',
+        'necaxa': 'Necaxa', 'puebla': 'Puebla', 'pachuca': 'Pachuca', 'tijuana': 'Tijuana',
+        'mazatlán': 'Mazatlán FC', 'mazatlan': 'Mazatlán FC', 'querétaro': 'Querétaro',
+        'queretaro': 'Querétaro', 'juárez': 'Juárez', 'juarez': 'Juárez',
+        'atlético san luis': 'Atlético San Luis', 'atletico san luis': 'Atlético San Luis',
+        'san luis': 'Atlético San Luis',
+    }
+    for key, value in name_mapping.items():
+        if key in name:
+            return value
+    return name.title()
+
+
+def time_calls(func, repeat):
+    """Microsegundos por llamada sobre toda la muestra"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name in SAMPLE_NAMES:
+            func(name)
+    elapsed = time.perf_counter() - started
+    return round(elapsed / (repeat * len(SAMPLE_NAMES)) * 1e6, 3)
+
+
+def time_build(repeat=20):
+    """Milisegundos para leer el archivo de alias y compilar el índice"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        tabla.TeamNameNormalizer.from_file()
+    return round((time.perf_counter() - started) / repeat * 1000, 3)
+
+
+def regressions(normalizer):
+    """Variantes aceptadas o rechazadas que no se resuelven como se espera"""
+    failed = {}
+    for name, canonical in ACCEPTED.items():
+        if normalizer.normalize(name) != canonical:
+            failed[name] = {'expected': canonical, 'got': normalizer.normalize(name)}
+    for name in REJECTED:
+        if normalizer.normalize(name) != name:
+            failed[name] = {'expected': name, 'got': normalizer.normalize(name)}
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    normalizer = tabla.TeamNameNormalizer.from_file()
+    results = {
+        'names': len(SAMPLE_NAMES),
+        'legacy_us': time_calls(legacy_normalize, args.repeat),
+        'cold_us': time_calls(normalizer._normalize, args.repeat),
+        'warm_us': time_calls(normalizer.normalize, args.repeat),
+        'build_ms': time_build(),
+        'differences': {
+            name: {'legacy': legacy_normalize(name), 'new': normalizer.normalize(name)}
+            for name in SAMPLE_NAMES
+            if legacy_normalize(name) != normalizer.normalize(name)
+        },
+        'regressions': regressions(normalizer),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        report(results)
+
+    if results['regressions']:
+        sys.exit(1)
+
+
+def report(results):
+    print(f"Nombres de muestra: {results['names']}")
+    print(f"Construcción del índice: {results['build_ms']:.3f} ms")
+    print(f"{'Implementación':<20} {'µs/llamada':>11}")
+    print('-' * 32)
+    print(f"{'anterior':<20} {results['legacy_us']:>11.3f}")
+    print(f"{'índice sin memo':<20} {results['cold_us']:>11.3f}")
+    print(f"{'índice con memo':<20} {results['warm_us']:>11.3f}")
+    if results['differences']:
+        print("\nNombres resueltos distinto que antes:")
+        for name, diff in results['differences'].items():
+            print(f"  {name!r}: {diff['legacy']} -> {diff['new']}")
+    print(f"\nVariantes comprobadas: {len(ACCEPTED)} aceptadas, {len(REJECTED)} rechazadas")
+    for name, diff in results['regressions'].items():
+        print(f"  ❌ {name!r}: se esperaba {diff['expected']}, se obtuvo {diff['got']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark de backends de parseo sobre las páginas guardadas en fixtures/
+
+Mide el tiempo de parseo por fuente y el pico de memoria de cada backend
+(selectolax, lxml, bs4). El pico se mide en un subproceso limpio leyendo
+VmHWM de /proc (tras reiniciarlo con clear_refs) para incluir la memoria
+reservada por los parsers en C; fuera de Linux se usa tracemalloc.
+
+Uso:
+    python benchmarks/bench_parsers.py [--repeat 50] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import tabla
+from bench_cycle import make_scraper, read_fixture
+
+PARSERS = {
+    'espn_mx': 'parse_espn',
+    'ligamx_oficial': 'parse_ligamx_oficial',
+    'foxsports': 'parse_foxsports',
+    'medio_tiempo': 'parse_medio_tiempo',
+}
+
+
+def time_parse(backend, source, repeat):
+    """Tiempo medio y mínimo de parseo en milisegundos"""
+    scraper, _ = make_scraper('sync', 'adapter', backend=backend)
+    parse = getattr(scraper, PARSERS[source])
+    content = read_fixture(source)
+
+    teams = parse(content)  # Calentamiento (compilación de selectores)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(content)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return {
+        'teams': len(teams),
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'min_ms': round(min(samples), 3),
+        'bytes': len(content),
+    }
+
+
+def _proc_status(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def peak_memory_worker(backend, source):
+    """Pico de memoria (KiB) al parsear una vez en un proceso limpio"""
+    scraper, _ = make_scraper('sync', 'adapter', backend=backend)
+    parse = getattr(scraper, PARSERS[source])
+    content = read_fixture(source)
+
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')  # Reinicia VmHWM al RSS actual
+        before = _proc_status('VmRSS')
+        parse(content)
+        print(_proc_status('VmHWM') - before)
+    except OSError:
+        tracemalloc.start()
+        parse(content)
+        print(tracemalloc.get_traced_memory()[1] // 1024)
+
+
+def peak_memory(backend, source):
+    output = subprocess.run(
+        [sys.executable, __file__, '--memory-worker', backend, source],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return int(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    parser.add_argument('--memory-worker', nargs=2, metavar=('BACKEND', 'SOURCE'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.memory_worker:
+        peak_memory_worker(*args.memory_worker)
+        return
+
+    results = []
+    for source in PARSERS:
+        for backend in tabla.available_parser_backends():
+            result = time_parse(backend, source, args.repeat)
+            result.update({
+                'source': source,
+                'backend': backend,
+                'peak_rss_kib': peak_memory(backend, source),
+            })
+            results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'Fuente':<16} {'Backend':<11} {'Equipos':>7} {'Media ms':>9} {'Mín ms':>8} {'Pico KiB':>9}")
+    print('-' * 65)
+    for r in results:
+        print(f"{r['source']:<16} {r['backend']:<11} {r['teams']:>7} "
+              f"{r['mean_ms']:>9.2f} {r['min_ms']:>8.2f} {r['peak_rss_kib']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Escalado del parseo en procesos (ProcessParser) sobre un corpus de páginas guardadas
+
+El corpus son las páginas de benchmarks/fixtures/ repetidas --copies veces
+(como al reprocesar un archivo de temporadas o muchas competiciones a la
+vez). Compara, en páginas por segundo:
+  - un hilo con el backend en proceso (referencia);
+  - un pool de hilos del mismo tamaño (limitado por el GIL);
+  - ProcessParser con 1..N procesos, enviando el HTML por memoria compartida
+    y, aparte, serializado por la tubería (pickle) para ver el costo del envío.
+Comprueba además que las filas sean idénticas a las del parseo en un hilo.
+El arranque de los procesos se excluye calentando cada pool antes de medir.
+
+Uso:
+    python benchmarks/bench_process_parse.py [--copies 50] [--workers 1,2,4]
+                                             [--backend auto|selectolax|lxml|bs4] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+SOURCES = ('espn_mx', 'ligamx_oficial', 'foxsports', 'medio_tiempo')
+
+
+def load_corpus(copies, backend):
+    scraper = tabla.LigaMXScraper()
+    pages = []
+    for source in SOURCES:
+        with open(os.path.join(FIXTURES, f'{source}.html'), 'rb') as f:
+            content = f.read()
+        pages.append((content, scraper.source_specs[source].row_selectors))
+    return tabla.get_parser_backend(backend), pages * copies
+
+
+def rate(corpus, elapsed):
+    return round(len(corpus) / elapsed, 1)
+
+
+def run_inline(parser, corpus):
+    started = time.perf_counter()
+    rows = [[tuple(row) for row in parser.select_rows(content, selectors)]
+            for content, selectors in corpus]
+    return rows, time.perf_counter() - started
+
+
+def run_threads(parser, corpus, workers):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        started = time.perf_counter()
+        rows = list(executor.map(lambda page: parser.select_rows(*page), corpus))
+        elapsed = time.perf_counter() - started
+    return [[tuple(row) for row in page] for page in rows], elapsed
+
+
+def run_processes(backend, corpus, workers, shared):
+    # shm_threshold=0 envía todo por memoria compartida; infinito, todo por pickle
+    threshold = 0 if shared else float('inf')
+    parser = tabla.ProcessParser(backend, workers, shm_threshold=threshold)
+    try:
+        parser.select_many(corpus[:workers * 2])  # arranque y backend de cada worker
+        started = time.perf_counter()
+        rows = parser.select_many(corpus)
+        return rows, time.perf_counter() - started
+    finally:
+        parser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--copies', type=int, default=50)
+    parser.add_argument('--workers', default=None,
+                        help='Lista de tamaños de pool, p. ej. 1,2,4 (por defecto hasta os.cpu_count())')
+    parser.add_argument('--backend', default='auto', choices=['auto'] + list(tabla.PARSER_BACKENDS))
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        sizes = [int(size) for size in args.workers.split(',')]
+    else:
+        sizes = sorted({1, 2, 4, cpus} | {size for size in (8, 16) if size <= cpus})
+
+    backend, corpus = load_corpus(args.copies, args.backend)
+    run_inline(backend, corpus[:len(SOURCES)])  # calentamiento
+    reference, elapsed = run_inline(backend, corpus)
+    baseline = rate(corpus, elapsed)
+    results = {
+        'cpus': cpus,
+        'backend': backend.name,
+        'pages': len(corpus),
+        'mib': round(sum(len(content) for content, _ in corpus) / 2 ** 20, 1),
+        'inline_pages_per_s': baseline,
+        'runs': [],
+    }
+
+    for size in sizes:
+        for mode in ('threads', 'processes_shm', 'processes_pickle'):
+            if mode == 'threads':
+                rows, elapsed = run_threads(backend, corpus, size)
+            else:
+                rows, elapsed = run_processes(backend.name, corpus, size, mode == 'processes_shm')
+            pages_per_s = rate(corpus, elapsed)
+            results['runs'].append({
+                'mode': mode,
+                'workers': size,
+                'pages_per_s': pages_per_s,
+                'speedup': round(pages_per_s / baseline, 2),
+                'identical': rows == reference,
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"CPUs: {results['cpus']}  Backend: {results['backend']}  "
+              f"Corpus: {results['pages']} páginas ({results['mib']} MiB)")
+        print(f"Un hilo: {baseline:.1f} páginas/s")
+        print(f"{'Modo':<18} {'Workers':>7} {'Páginas/s':>10} {'Escala':>7} {'Igual':>6}")
+        print('-' * 52)
+        for run in results['runs']:
+            print(f"{run['mode']:<18} {run['workers']:>7} {run['pages_per_s']:>10.1f} "
+                  f"{run['speedup']:>6.2f}x {str(run['identical']):>6}")
+        if cpus == 1:
+            print("\nSólo hay un CPU: los procesos no pueden escalar en esta máquina.")
+
+    if not all(run['identical'] for run in results['runs']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
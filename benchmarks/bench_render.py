@@ -0,0 +1,221 @@
+"""Costo de dibujar la tabla en la terminal por actualización (TableRenderer)
+
+Sobre la tabla de demostración aplica --updates actualizaciones sintéticas en
+tres escenarios:
+  - sin_cambios: sólo cambia la hora de actualización;
+  - un_partido: un resultado nuevo (dos equipos, y las filas que se reordenan);
+  - jornada: una jornada completa (casi todas las filas).
+Para cada uno compara, en µs y bytes escritos por actualización:
+  - legacy: el display_table anterior (un print por línea, tabla completa);
+  - plano: TableRenderer sin TTY (tabla completa sólo si cambió alguna fila);
+  - vivo: TableRenderer en TTY (sólo las líneas cambiadas, un write).
+La salida va a un búfer en memoria, así que se mide el costo de construir y
+emitir el cuadro, no el de la terminal. Un emulador mínimo de terminal
+comprueba que la pantalla del modo vivo sea idéntica a la tabla completa
+después de cada actualización.
+
+Uso:
+    python benchmarks/bench_render.py [--updates 200] [--json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+NOTICE = '✅ DATOS REALES obtenidos de: espn_mx'
+STATUS = '⌛ 42s para la siguiente actualización'
+
+
+class Screen:
+    """Emulador mínimo: texto, \\r, \\n y las secuencias A, B, K y J que usa TableRenderer"""
+
+    TOKENS = re.compile(r'\x1b\[(\d*)([ABKJ])|(\r)|(\n)|([^\x1b\r\n]+)')
+
+    def __init__(self):
+        self.lines = ['']
+        self.row = 0
+        self.col = 0
+
+    def feed(self, text):
+        for count, command, cr, newline, chunk in self.TOKENS.findall(text):
+            if command:
+                count = int(count or 1)
+                if command == 'A':
+                    self.row = max(0, self.row - count)
+                elif command == 'B':
+                    self.row = min(len(self.lines) - 1, self.row + count)
+                else:
+                    self.lines[self.row] = self.lines[self.row][:self.col]
+                    if command == 'J':
+                        del self.lines[self.row + 1:]
+            elif cr:
+                self.col = 0
+            elif newline:
+                self.row += 1
+                self.col = 0
+                if self.row == len(self.lines):
+                    self.lines.append('')
+            else:
+                line = self.lines[self.row].ljust(self.col)
+                self.lines[self.row] = line[:self.col] + chunk + line[self.col + len(chunk):]
+                self.col += len(chunk)
+
+
+class TTYBuffer(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def legacy_display(scraper):
+    """display_table tal como era: un print por línea y la tabla completa cada vez"""
+    for line in scraper.table_lines():
+        print(line)
+    print(f"🕐 Última actualización: {scraper.last_update.strftime('%Y-%m-%d %H:%M:%S')}")
+
+
+def snapshot(teams_data):
+    return {
+        name: {**data, 'consensus': tabla.TeamStanding(*data['consensus'].as_tuple())}
+        for name, data in teams_data.items()
+    }
+
+
+def play(rng, home, away):
+    for team in (home, away):
+        team.games += 1
+    home_goals, away_goals = rng.randint(0, 3), rng.randint(0, 3)
+    home.goal_diff += home_goals - away_goals
+    away.goal_diff += away_goals - home_goals
+    if home_goals == away_goals:
+        home.draws += 1
+        away.draws += 1
+        home.points += 1
+        away.points += 1
+    else:
+        winner, loser = (home, away) if home_goals > away_goals else (away, home)
+        winner.wins += 1
+        winner.points += 3
+        loser.losses += 1
+
+
+def build_updates(teams_data, scenario, updates, seed):
+    """Estados sucesivos de teams_data con su hora de actualización"""
+    rng = random.Random(seed)
+    current = snapshot(teams_data)
+    stamp = datetime(2024, 3, 1, 20, 0, 0)
+    states = []
+    for _ in range(updates):
+        current = snapshot(current)
+        teams = [data['consensus'] for data in current.values()]
+        if scenario == 'un_partido':
+            play(rng, *rng.sample(teams, 2))
+        elif scenario == 'jornada':
+            rng.shuffle(teams)
+            for home, away in zip(teams[::2], teams[1::2]):
+                play(rng, home, away)
+        stamp += timedelta(minutes=1)
+        states.append((current, stamp))
+    return states
+
+
+def run(scraper, states, mode):
+    """µs y bytes por actualización al dibujar states con el modo dado"""
+    stream = TTYBuffer() if mode == 'vivo' else io.StringIO()
+    scraper.renderer = tabla.TableRenderer(stream, live=mode == 'vivo')
+    elapsed = 0.0
+    for teams_data, stamp in states:
+        scraper.teams_data = teams_data
+        scraper.last_update = stamp
+        if mode == 'legacy':
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(stream):
+                legacy_display(scraper)
+        else:
+            started = time.perf_counter()
+            scraper.display_table()
+        elapsed += time.perf_counter() - started
+    size = len(stream.getvalue().encode('utf-8'))
+    return elapsed / len(states) * 1e6, size / len(states)
+
+
+def verify_live(scraper, states):
+    """Tras cada actualización la pantalla debe ser la tabla completa más avisos y estado"""
+    stream = TTYBuffer()
+    renderer = scraper.renderer = tabla.TableRenderer(stream, live=True)
+    screen = Screen()
+    for index, (teams_data, stamp) in enumerate(states):
+        scraper.teams_data = teams_data
+        scraper.last_update = stamp
+        scraper.display_table()
+        if index == 0:
+            renderer.notice(NOTICE)
+        renderer.status(f"{STATUS} ({index})")
+        screen.feed(stream.getvalue())
+        stream.seek(0)
+        stream.truncate()
+        expected = scraper.table_lines() + [
+            f"🕐 Última actualización: {stamp.strftime('%Y-%m-%d %H:%M:%S')}",
+            NOTICE,
+            f"{STATUS} ({index})",
+        ]
+        if screen.lines != expected or screen.row != len(expected) - 1:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--updates', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    scraper = tabla.LigaMXScraper()
+    base = scraper.consolidate_data({'demo_data': scraper.scrape_simple_source()})
+
+    results = {'updates': args.updates, 'scenarios': {}}
+    identical = True
+    for scenario in ('sin_cambios', 'un_partido', 'jornada'):
+        states = build_updates(base, scenario, args.updates, args.seed)
+        run(scraper, states[:10], 'vivo')  # calentamiento
+        modes = {}
+        for mode in ('legacy', 'plano', 'vivo'):
+            us, size = run(scraper, states, mode)
+            modes[mode] = {'us_per_update': round(us, 1), 'bytes_per_update': round(size)}
+        modes['identical'] = verify_live(scraper, states)
+        identical = identical and modes['identical']
+        results['scenarios'][scenario] = modes
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"Actualizaciones por escenario: {results['updates']}")
+        print(f"{'Escenario':<12} {'Modo':<7} {'µs/act':>8} {'Bytes/act':>10}")
+        print('-' * 40)
+        for scenario, modes in results['scenarios'].items():
+            for mode in ('legacy', 'plano', 'vivo'):
+                data = modes[mode]
+                print(f"{scenario:<12} {mode:<7} {data['us_per_update']:>8.1f} "
+                      f"{data['bytes_per_update']:>10}")
+        print(f"Pantalla del modo vivo idéntica a la tabla completa: {identical}")
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
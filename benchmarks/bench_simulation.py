@@ -0,0 +1,104 @@
+"""Benchmark de la proyección Monte Carlo (SeasonSimulator)
+
+Juega con demo_results las primeras --played jornadas de un torneo de 18
+equipos, calcula la tabla con StandingsEngine y simula el resto (--simulations
+temporadas) con 1..N procesos. Mide segundos por corrida y comprueba que la
+misma semilla da exactamente la misma proyección con cualquier número de
+procesos.
+
+Uso:
+    python benchmarks/bench_simulation.py [--simulations 100000] [--played 8]
+                                          [--workers 1,2,4] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+
+def build_simulator(played_rounds, seed):
+    results = tabla.demo_results(tabla.TEAM_NORMALIZER.canonical, seed=seed)
+    played, remaining = [], []
+    for result in results:
+        round_number = int(result[0].split('-', 1)[0][1:])
+        if round_number <= played_rounds:
+            played.append(result)
+        else:
+            remaining.append(result[1:3])
+    engine = tabla.StandingsEngine()
+    engine.replay(played)
+    goals_for = {team: stats[4] for team, stats in engine.stats.items()}
+    return tabla.SeasonSimulator(engine.table(), remaining, goals_for=goals_for)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--simulations', type=int, default=100_000)
+    parser.add_argument('--played', type=int, default=8, help='Jornadas ya jugadas (de 17)')
+    parser.add_argument('--workers', default='1,2',
+                        help='Lista de números de procesos a probar')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    if tabla.np is None:
+        parser.error('la simulación requiere numpy')
+
+    simulator = build_simulator(args.played, args.seed)
+    simulator.run(1000, seed=args.seed)  # calentamiento
+
+    runs = []
+    reference = None
+    for workers in (int(w) for w in args.workers.split(',')):
+        started = time.perf_counter()
+        projection = simulator.run(args.simulations, seed=args.seed, workers=workers)
+        elapsed = time.perf_counter() - started
+        reference = reference or projection
+        runs.append({
+            'workers': workers,
+            'seconds': round(elapsed, 3),
+            'simulations_per_s': round(args.simulations / elapsed),
+            'identical': projection == reference,
+        })
+
+    leader = simulator.teams[0]
+    results = {
+        'cpus': os.cpu_count(),
+        'simulations': args.simulations,
+        'remaining_matches': len(simulator.fixtures),
+        'runs': runs,
+        'leader': leader,
+        'leader_liguilla': reference[leader]['liguilla'],
+        'liguilla_total': round(sum(team['liguilla'] for team in reference.values()), 6),
+        'play_in_total': round(sum(team['play_in'] for team in reference.values()), 6),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        print(f"CPUs: {results['cpus']}  Simulaciones: {results['simulations']}  "
+              f"Partidos pendientes: {results['remaining_matches']}")
+        print(f"{'Procesos':>8} {'Segundos':>9} {'Sim/s':>10} {'Igual':>6}")
+        print('-' * 36)
+        for run in runs:
+            print(f"{run['workers']:>8} {run['seconds']:>9.3f} {run['simulations_per_s']:>10} "
+                  f"{str(run['identical']):>6}")
+        print(f"Líder: {leader} ({results['leader_liguilla']:.1%} de liguilla directa)")
+        print(f"Suma de probabilidades: liguilla {results['liguilla_total']}, "
+              f"play-in {results['play_in_total']}")
+
+    if not all(run['identical'] for run in runs):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
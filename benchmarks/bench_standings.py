@@ -0,0 +1,121 @@
+"""Benchmark del motor de tabla calculada (StandingsEngine)
+
+Con temporadas sintéticas de todos contra todos (demo_results) mide:
+  - actualización incremental: µs por resultado nuevo con apply(), con y
+    sin leer la tabla, frente a recalcular la temporada con replay()
+    después de cada resultado (en una muestra de puntos de la temporada);
+  - reconstrucción masiva: ms por temporada con replay() en numpy y en
+    Python puro, repasando --seasons temporadas;
+y comprueba que los tres caminos producen la misma tabla.
+
+Uso:
+    python benchmarks/bench_standings.py [--seasons 200] [--teams 18] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+
+def season(teams, seed):
+    return tabla.demo_results(teams, seed=seed)
+
+
+def as_rows(engine):
+    return [standing.as_tuple() for standing in engine.table()]
+
+
+def time_incremental(results, read_table):
+    engine = tabla.StandingsEngine()
+    started = time.perf_counter()
+    for match_id, home, away, home_goals, away_goals in results:
+        engine.apply(home, away, home_goals, away_goals, match_id)
+        if read_table:
+            engine.table()
+    return engine, (time.perf_counter() - started) / len(results) * 1e6
+
+
+def time_recompute(results, use_numpy, samples=50):
+    """Recalcula en una muestra de puntos de la temporada (todos sería cuadrático)"""
+    engine = tabla.StandingsEngine(use_numpy=use_numpy)
+    step = max(1, len(results) // samples)
+    points = list(range(step, len(results), step)) + [len(results)]
+    started = time.perf_counter()
+    for played in points:
+        engine.replay(results[:played])
+        engine.table()
+    return engine, (time.perf_counter() - started) / len(points) * 1e6
+
+
+def time_bulk(seasons, use_numpy):
+    engine = tabla.StandingsEngine(use_numpy=use_numpy)
+    started = time.perf_counter()
+    tables = []
+    for results in seasons:
+        engine.replay(results)
+        tables.append(as_rows(engine))
+    return tables, (time.perf_counter() - started) / len(seasons) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=200)
+    parser.add_argument('--teams', type=int, default=18)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    canonical = list(tabla.TEAM_NORMALIZER.canonical)
+    teams = (canonical + [f'Equipo {i}' for i in range(args.teams)])[:args.teams]
+    results = season(teams, seed=1)
+
+    _, apply_us = time_incremental(results, read_table=False)
+    incremental, incremental_us = time_incremental(results, read_table=True)
+    recomputed, recompute_us = time_recompute(results, use_numpy=tabla.np is not None)
+    seasons = [season(teams, seed) for seed in range(args.seasons)]
+    python_tables, python_ms = time_bulk(seasons, use_numpy=False)
+
+    results_json = {
+        'teams': len(teams),
+        'matches_per_season': len(results),
+        'apply_us_per_result': round(apply_us, 2),
+        'incremental_us_per_result': round(incremental_us, 2),
+        'recompute_us_per_result': round(recompute_us, 2),
+        'incremental_speedup': round(recompute_us / incremental_us, 1),
+        'seasons': args.seasons,
+        'replay_python_ms': round(python_ms, 3),
+        'identical': as_rows(incremental) == as_rows(recomputed),
+    }
+    if tabla.np is not None:
+        numpy_tables, numpy_ms = time_bulk(seasons, use_numpy=True)
+        results_json['replay_numpy_ms'] = round(numpy_ms, 3)
+        results_json['identical'] = results_json['identical'] and numpy_tables == python_tables
+
+    if args.json:
+        print(json.dumps(results_json, indent=2))
+    else:
+        r = results_json
+        print(f"Equipos: {r['teams']}  Partidos por temporada: {r['matches_per_season']}")
+        print(f"Incremental (sólo apply):      {r['apply_us_per_result']:>9.2f} µs por resultado")
+        print(f"Incremental (apply + tabla):   {r['incremental_us_per_result']:>9.2f} µs por resultado")
+        print(f"Recalcular todo (replay):      {r['recompute_us_per_result']:>9.2f} µs por resultado "
+              f"({r['incremental_speedup']}x)")
+        print(f"Temporada completa, Python:    {r['replay_python_ms']:>9.3f} ms ({r['seasons']} temporadas)")
+        if 'replay_numpy_ms' in r:
+            print(f"Temporada completa, numpy:     {r['replay_numpy_ms']:>9.3f} ms")
+        print(f"Tablas idénticas: {r['identical']}")
+
+    if not results_json['identical']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
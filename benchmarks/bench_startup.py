@@ -0,0 +1,115 @@
+"""Tiempo de arranque del CLI de una sola ejecución (-X importtime)
+
+Lanza cada escenario --runs veces en un intérprete nuevo y reporta el mínimo
+del tiempo total de pared y del tiempo de importación según -X importtime
+(suma de las importaciones de primer nivel, incluido site), más los módulos
+pesados que llegaron a importarse:
+  - import_perezoso: `import tabla` con las importaciones diferidas;
+  - import_completo: `import tabla` más requests, bs4, urllib3, aiohttp y
+    numpy, lo que costaba antes cualquier arranque;
+  - once_json: `python -m tabla once --json` servido desde una tabla
+    guardada reciente (no importa la pila HTTP ni los parsers);
+  - once_json_script: lo mismo como `python tabla.py`, que compila el
+    archivo en cada arranque porque el script principal no usa __pycache__.
+Antes de medir se compila tabla.py para que los escenarios con import usen
+el bytecode en caché.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 7] [--json]
+"""
+import argparse
+import json
+import os
+import py_compile
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ('requests', 'urllib3', 'bs4', 'aiohttp', 'numpy', 'lxml', 'selectolax', 'orjson', 'asyncio')
+IMPORTTIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def write_table(directory):
+    """Tabla publicada mínima y reciente para el camino rápido de --json"""
+    path = os.path.join(directory, 'liga_mx_table.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'last_update': '2024-03-01T20:00:00', 'total_teams': 0, 'teams': {}}, f)
+    return path
+
+
+def scenarios(table):
+    once = ['once', '--json', '--output', table]
+    return {
+        'import_perezoso': ['-c', 'import tabla'],
+        'import_completo': ['-c', 'import tabla, requests, bs4, urllib3, aiohttp, numpy'],
+        'once_json': ['-m', 'tabla'] + once,
+        'once_json_script': [os.path.join(ROOT, 'tabla.py')] + once,
+    }
+
+
+def run(arguments):
+    """(ms de pared, ms de importaciones, módulos pesados importados)"""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=ROOT,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(arguments)} terminó con {completed.returncode}:\n"
+                           f"{completed.stderr[-2000:]}")
+
+    import_us = 0
+    heavy = set()
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if not match:
+            continue
+        cumulative, depth, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        if depth == 1:
+            import_us += cumulative
+        if module.partition('.')[0] in HEAVY:
+            heavy.add(module.partition('.')[0])
+    return wall, import_us / 1000, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    py_compile.compile(os.path.join(ROOT, 'tabla.py'), doraise=True)
+    results = {'python': sys.version.split()[0], 'runs': args.runs, 'scenarios': {}}
+    with tempfile.TemporaryDirectory() as directory:
+        table = write_table(directory)
+        baseline = min(run(['-c', 'pass'])[0] for _ in range(args.runs))
+        results['interpreter_ms'] = round(baseline, 1)
+        for name, arguments in scenarios(table).items():
+            samples = [run(arguments) for _ in range(args.runs)]
+            results['scenarios'][name] = {
+                'wall_ms': round(min(sample[0] for sample in samples), 1),
+                'import_ms': round(min(sample[1] for sample in samples), 1),
+                'heavy_modules': sorted(samples[-1][2]),
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"Python {results['python']}  Intérprete vacío: {results['interpreter_ms']} ms  "
+              f"(mínimo de {results['runs']} corridas)")
+        print(f"{'Escenario':<18} {'Pared ms':>9} {'Import ms':>10}  Módulos pesados")
+        print('-' * 70)
+        for name, data in results['scenarios'].items():
+            print(f"{name:<18} {data['wall_ms']:>9.1f} {data['import_ms']:>10.1f}  "
+                  f"{', '.join(data['heavy_modules']) or '-'}")
+
+    # El camino rápido no debe importar nada pesado
+    if results['scenarios']['once_json']['heavy_modules']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
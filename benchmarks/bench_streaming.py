@@ -0,0 +1,82 @@
+"""Verificación y benchmark del modo streaming contra las páginas guardadas
+
+Sirve benchmarks/fixtures/ desde un servidor HTTP local y, para cada fuente,
+descarga la página completa (modo normal) y en streaming. Comprueba que ambos
+modos extraen los mismos equipos y compara bytes leídos, tiempo y pico de
+memoria por ciclo.
+
+Uso:
+    python benchmarks/bench_streaming.py [--repeat 20] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_cycle import FIXTURES, SOURCES, make_scraper, peak_memory, start_server
+
+
+def run_cycle(scraper, source):
+    """Ejecuta un scraper sin cadena de respaldo y mide su tiempo en ms"""
+    started = time.perf_counter()
+    teams = scraper.scrape_source(source, fallback=False)
+    return teams, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    server = start_server()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    full, _ = make_scraper('sync', 'server', base_url, streaming=False)
+    streaming, _ = make_scraper('sync', 'server', base_url, streaming=True)
+
+    results = []
+    for source in SOURCES:
+        url = streaming.sources[source]['url']
+        page_bytes = os.path.getsize(os.path.join(FIXTURES, f'{source}.html'))
+
+        full_runs = [run_cycle(full, source) for _ in range(args.repeat)]
+        stream_runs = [run_cycle(streaming, source) for _ in range(args.repeat)]
+
+        full_teams = full_runs[0][0]
+        stream_teams = stream_runs[0][0]
+        results.append({
+            'source': source,
+            'teams': len(stream_teams or []),
+            'identical': full_teams == stream_teams,
+            'full_bytes': page_bytes,
+            'stream_bytes': streaming.stream_stats.get(url),
+            'full_ms': round(sum(r[1] for r in full_runs) / args.repeat, 3),
+            'stream_ms': round(sum(r[1] for r in stream_runs) / args.repeat, 3),
+            'full_peak_kib': peak_memory(full, source) // 1024,
+            'stream_peak_kib': peak_memory(streaming, source) // 1024,
+        })
+
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps({'parser_backend': full.parser.name, 'results': results}, indent=2))
+    else:
+        print(f"Backend del modo completo: {full.parser.name}")
+        print(f"{'Fuente':<16} {'Igual':<6} {'Bytes':>8} {'Stream':>8} "
+              f"{'ms':>7} {'ms st':>7} {'KiB':>6} {'KiB st':>7}")
+        print('-' * 72)
+        for r in results:
+            print(f"{r['source']:<16} {str(r['identical']):<6} {r['full_bytes']:>8} "
+                  f"{r['stream_bytes']:>8} {r['full_ms']:>7.2f} {r['stream_ms']:>7.2f} "
+                  f"{r['full_peak_kib']:>6} {r['stream_peak_kib']:>7}")
+
+    if not all(r['identical'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Tiempo hasta la primera tabla al arrancar: en frío frente a arranque en caliente
+
+En frío, un scraper nuevo necesita un ciclo completo scrape_all_sources antes
+de tener tabla; aquí el ciclo usa las páginas de benchmarks/fixtures/ (sin
+red ni esperas de cortesía), así que es una cota inferior de lo que tarda en
+producción. En caliente, warm_start() carga la última tabla real del JSON
+publicado o, si falta, del historial SQLite. Comprueba que las tres tablas
+coincidan.
+
+Uso:
+    python benchmarks/bench_warm_start.py [--repeat 20] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.WARNING)
+
+import tabla
+from bench_cycle import make_scraper
+
+
+def as_rows(scraper):
+    return sorted(data['consensus'].as_tuple()[1:8] for data in scraper.teams_data.values())
+
+
+def cold_start():
+    """ms desde crear el scraper hasta tener la tabla consolidada"""
+    started = time.perf_counter()
+    scraper, _ = make_scraper('sync', 'adapter')
+    results = scraper.scrape_all_sources()
+    scraper.teams_data = scraper.consolidate_data(results)
+    return scraper, (time.perf_counter() - started) * 1000
+
+
+def warm_start(output, history):
+    """ms desde crear el scraper hasta tener la tabla, y el origen usado"""
+    started = time.perf_counter()
+    scraper = tabla.LigaMXScraper()
+    scraper.publisher = tabla.JsonPublisher(output)
+    scraper.history = tabla.SnapshotStore(history) if history else None
+    origin = scraper.warm_start()
+    elapsed = (time.perf_counter() - started) * 1000
+    if scraper.history is not None:
+        scraper.history.close()
+    return scraper, origin, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'liga_mx_table.json')
+        history = os.path.join(directory, 'liga_mx_historial.db')
+
+        cold_times = []
+        for _ in range(args.repeat):
+            reference, elapsed = cold_start()
+            cold_times.append(elapsed)
+        reference.publisher = tabla.JsonPublisher(output)
+        reference.history = tabla.SnapshotStore(history)
+        reference.last_update = datetime.now()
+        reference.renderer = tabla.TableRenderer(open(os.devnull, 'w'), live=False)
+        reference.save_to_json()
+        reference.record_history(['espn_mx'])
+        reference.history.close()
+
+        runs = {}
+        identical = True
+        for name, paths in (('json', (output, history)),
+                            ('historial', (os.path.join(directory, 'no_existe.json'), history))):
+            times = []
+            for _ in range(args.repeat):
+                scraper, origin, elapsed = warm_start(*paths)
+                times.append(elapsed)
+            identical = identical and origin == name and as_rows(scraper) == as_rows(reference)
+            runs[name] = round(min(times), 2)
+
+    results = {
+        'cold_cycle_ms': round(min(cold_times), 2),
+        'warm_json_ms': runs['json'],
+        'warm_history_ms': runs['historial'],
+        'teams': len(reference.teams_data),
+        'identical': identical,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"En frío (ciclo completo sin red):   {results['cold_cycle_ms']:>8.2f} ms")
+        print(f"En caliente desde el JSON:          {results['warm_json_ms']:>8.2f} ms")
+        print(f"En caliente desde el historial:     {results['warm_history_ms']:>8.2f} ms")
+        print(f"Tablas idénticas ({results['teams']} equipos): {results['identical']}")
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Prueba de carga de la API de lectura (StandingsServer) contra una instancia local
+
+Arranca el servidor con la tabla de demostración y lanza, desde asyncio:
+  - N lectores keep-alive que piden /standings con If-None-Match (la mitad
+    sin ETag previo, así se mezclan respuestas 200 gzip y 304);
+  - M suscriptores SSE en /standings/events.
+Durante la prueba se publican tablas nuevas cada cierto tiempo y se mide la
+latencia hasta que cada suscriptor recibe el evento.
+
+Uso:
+    python benchmarks/load_api.py [--readers 1000] [--subscribers 1000]
+                                  [--duration 10] [--json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+
+def demo_payload(scraper, version):
+    """Tabla de demostración serializada con un campo que cambia por versión"""
+    scraper.teams_data = scraper.consolidate_data({'demo_data': scraper.scrape_simple_source()})
+    data = {'version': version, 'teams': scraper.serialize_teams()}
+    publisher = scraper.publisher
+    return publisher.dumps(data), publisher.hash_section(data)
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    etag = None
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        name = name.strip().lower()
+        if name == b'content-length':
+            length = int(value)
+        elif name == b'etag':
+            etag = value.strip().decode()
+    if length:
+        await reader.readexactly(length)
+    return status, etag, length
+
+
+async def reader_client(port, stop_at, stats, conditional):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    etag = None
+    try:
+        while time.monotonic() < stop_at:
+            extra = f'If-None-Match: {etag}\r\n' if etag and conditional else ''
+            writer.write((f'GET /standings HTTP/1.1\r\nHost: localhost\r\n'
+                          f'Accept-Encoding: gzip\r\n{extra}\r\n').encode())
+            started = time.perf_counter()
+            status, new_etag, length = await read_response(reader)
+            stats['latencies'].append(time.perf_counter() - started)
+            stats[status] = stats.get(status, 0) + 1
+            stats['bytes'] += length
+            etag = new_etag or etag
+    finally:
+        writer.close()
+
+
+async def subscriber_client(port, stop_at, published, delays, ready):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'GET /standings/events HTTP/1.1\r\nHost: localhost\r\n\r\n')
+    await reader.readuntil(b'\r\n\r\n')
+    ready.release()
+    try:
+        while time.monotonic() < stop_at:
+            try:
+                event = await asyncio.wait_for(reader.readuntil(b'\n\n'), stop_at - time.monotonic())
+            except asyncio.TimeoutError:
+                break
+            if event.startswith(b'id: '):
+                digest = event[4:event.index(b'\n')].decode()
+                if digest in published:
+                    delays.append(time.perf_counter() - published[digest])
+    finally:
+        writer.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args, server, scraper):
+    stop_at = time.monotonic() + args.duration
+    stats = {'latencies': [], 'bytes': 0}
+    published = {}
+    delays = []
+    ready = asyncio.Semaphore(0)
+
+    subscribers = [
+        asyncio.create_task(subscriber_client(server.port, stop_at, published, delays, ready))
+        for _ in range(args.subscribers)
+    ]
+    for _ in range(args.subscribers):
+        await ready.acquire()
+
+    readers = [
+        asyncio.create_task(reader_client(server.port, stop_at, stats, conditional=i % 2 == 0))
+        for i in range(args.readers)
+    ]
+
+    # Publicador en otro hilo, como lo haría el ciclo de scraping
+    def publisher():
+        version = 1
+        while time.monotonic() < stop_at - args.publish_every:
+            time.sleep(args.publish_every)
+            payload, digest = demo_payload(scraper, version)
+            published[digest] = time.perf_counter()
+            server.publish(payload, digest)
+            version += 1
+
+    thread = threading.Thread(target=publisher, daemon=True)
+    thread.start()
+    started = time.perf_counter()
+    await asyncio.gather(*readers, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    await asyncio.gather(*subscribers, return_exceptions=True)
+    thread.join()
+
+    latencies = stats.pop('latencies')
+    return {
+        'readers': args.readers,
+        'subscribers': args.subscribers,
+        'duration_s': round(elapsed, 2),
+        'requests': len(latencies),
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        'status_200': stats.get(200, 0),
+        'status_304': stats.get(304, 0),
+        'mib_sent': round(stats['bytes'] / 2 ** 20, 2),
+        'latency_p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+        'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'publishes': len(published),
+        'events_delivered': len(delays),
+        'push_p50_ms': round(percentile(delays, 0.5) * 1000, 2),
+        'push_p99_ms': round(percentile(delays, 0.99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=1000)
+    parser.add_argument('--subscribers', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--publish-every', type=float, default=1.0)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    # Cada cliente abre un socket y el servidor otro
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, 2 * (args.readers + args.subscribers) + 256)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    scraper = tabla.LigaMXScraper()
+    server = tabla.StandingsServer(port=0, keepalive=args.duration)
+    server.publish(*demo_payload(scraper, 0))
+    server.start()
+    try:
+        results = asyncio.run(run(args, server, scraper))
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Lectores: {results['readers']}  Suscriptores SSE: {results['subscribers']}  "
+          f"Duración: {results['duration_s']}s")
+    print(f"Peticiones: {results['requests']} ({results['requests_per_s']}/s)  "
+          f"200: {results['status_200']}  304: {results['status_304']}  "
+          f"{results['mib_sent']} MiB enviados")
+    print(f"Latencia p50/p99: {results['latency_p50_ms']} / {results['latency_p99_ms']} ms")
+    print(f"Publicaciones: {results['publishes']}  Eventos entregados: {results['events_delivered']}  "
+          f"push p50/p99: {results['push_p50_ms']} / {results['push_p99_ms']} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+"""Simulación de la política de sondeo adaptativa sobre una semana de snapshots
+
+Reproduce una semana con un reloj virtual: en cada sondeo la política recibe
+si la tabla cambió desde el sondeo anterior (según el historial) y decide el
+siguiente intervalo. Compara contra el sondeo fijo de 1 minuto: número de
+peticiones y retraso entre cada cambio real y el sondeo que lo detecta.
+
+Los snapshots salen de un historial grabado (--db, un liga_mx_historial.db)
+o, por defecto, se sintetizan a partir del calendario: goles durante cada
+partido, el resultado al final y una corrección de puntos a mitad de semana.
+
+Sale con código 1 si la política adaptativa no ahorra peticiones frente al
+sondeo fijo, deja cambios sin detectar o tarda más de live_interval en
+detectar un cambio dentro de una ventana de partido (max_interval fuera de
+ellas). test_polling_policy.py hace las mismas comprobaciones bajo pytest.
+
+Uso:
+    python benchmarks/sim_polling.py [--calendar calendario.json] [--db historial.db]
+                                     [--start 2024-01-08T00:00:00-06:00] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logging.disable(logging.INFO)
+
+import tabla
+
+WEEK = 7 * 86400
+
+
+def load_matches(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['matches']
+
+
+def synthesize_week(store, matches, week_start, seed):
+    """Graba en store los cambios de una jornada simulada; devuelve sus instantes"""
+    rng = random.Random(seed)
+    table = {
+        name: tabla.TeamStanding(i, name, 0, 0, 0, 0, 0, 0, 'consenso')
+        for i, name in enumerate(tabla.DEFAULT_TEAM_ALIASES, 1)
+    }
+    events = []
+    for match in matches:
+        kickoff = datetime.fromisoformat(match['kickoff']).timestamp()
+        score = [0, 0]
+        for _ in range(min(7, int(rng.expovariate(1 / 2.7)))):
+            minute = rng.uniform(0, 95)
+            minute += 15 if minute > 45 else 0  # medio tiempo
+            side = rng.randrange(2)
+            score[side] += 1
+            events.append((kickoff + minute * 60, 'goal', match, side))
+        events.append((kickoff + 112 * 60, 'final', match, tuple(score)))
+
+    # Corrección administrativa fuera de ventana (p. ej. una sanción)
+    events.append((week_start + 2.5 * 86400, 'correction', None, None))
+    events.sort(key=lambda event: event[0])
+
+    for ts, kind, match, detail in events:
+        if kind == 'goal':
+            scorer = table[match['home'] if detail == 0 else match['away']]
+            other = table[match['away'] if detail == 0 else match['home']]
+            scorer.goal_diff += 1
+            other.goal_diff -= 1
+        elif kind == 'final':
+            home, away = table[match['home']], table[match['away']]
+            home.games += 1
+            away.games += 1
+            if detail[0] == detail[1]:
+                home.draws += 1
+                away.draws += 1
+            else:
+                winner, loser = (home, away) if detail[0] > detail[1] else (away, home)
+                winner.wins += 1
+                loser.losses += 1
+            for standing in (home, away):
+                standing.points = standing.wins * 3 + standing.draws
+        else:
+            victim = rng.choice(list(table.values()))
+            victim.points -= 1
+        ordered = sorted(table.values(), key=tabla.TeamStanding.sort_key)
+        for position, standing in enumerate(ordered, 1):
+            standing.position = position
+        store.record(ordered, ts)
+    return [event[0] for event in events]
+
+
+def simulate(store, policy, week_start, fixed_interval=None):
+    """Sondeos virtuales durante una semana; devuelve (sondeos, [(cambio, retraso)])"""
+    change_times = [moment.timestamp() for moment, _ in
+                    store.updates(week_start, week_start + WEEK)]
+    polls = 0
+    delays = []
+    pending = 0  # índice del primer cambio aún no detectado
+    now = week_start
+    while now < week_start + WEEK:
+        polls += 1
+        detected = pending
+        while detected < len(change_times) and change_times[detected] <= now:
+            delays.append((change_times[detected], now - change_times[detected]))
+            detected += 1
+        changed = detected > pending
+        pending = detected
+
+        if fixed_interval:
+            interval = fixed_interval
+        else:
+            interval = policy.next_interval(datetime.fromtimestamp(now, timezone.utc), changed)
+        now += interval
+    return polls, delays
+
+
+def summarize(polls, delays, policy):
+    """Sondeos y retrasos de detección; el máximo se separa dentro y fuera de las ventanas"""
+    ordered = sorted(delay for _, delay in delays) or [0.0]
+    inside = [delay for moment, delay in delays
+              if policy.active_window(datetime.fromtimestamp(moment, timezone.utc))]
+    outside = [delay for moment, delay in delays
+               if not policy.active_window(datetime.fromtimestamp(moment, timezone.utc))]
+    return {
+        'polls': polls,
+        'changes_detected': len(delays),
+        'delay_mean_s': round(sum(ordered) / len(ordered), 1),
+        'delay_p95_s': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        'delay_max_s': round(ordered[-1], 1),
+        'window_delay_max_s': round(max(inside, default=0.0), 1),
+        'outside_delay_max_s': round(max(outside, default=0.0), 1),
+    }
+
+
+def run(calendar=tabla.CALENDAR_FILE, start='2024-01-08T00:00:00-06:00', seed=3, db=None):
+    """Simula la semana con la política adaptativa y con sondeo fijo de 60 s"""
+    week_start = datetime.fromisoformat(start).timestamp()
+    if db:
+        store = tabla.SnapshotStore(db)
+    else:
+        store = tabla.SnapshotStore(':memory:')
+        synthesize_week(store, load_matches(calendar), week_start, seed)
+
+    policy = tabla.PollingPolicy.from_file(calendar)
+    adaptive = summarize(*simulate(store, policy, week_start), policy)
+    adaptive['decisions'] = policy.decisions
+    fixed = summarize(*simulate(store, None, week_start, fixed_interval=60), policy)
+    results = {
+        'windows': len(policy.windows),
+        'changes': len(store.updates(week_start, week_start + WEEK)),
+        'live_interval_s': policy.live_interval,
+        'max_interval_s': policy.max_interval,
+        'adaptive': adaptive,
+        'fixed_60s': fixed,
+        'request_reduction': round(1 - adaptive['polls'] / fixed['polls'], 3),
+    }
+    store.close()
+    return results
+
+
+def check(results):
+    """Lista de fallos de la política adaptativa frente a los límites esperados"""
+    adaptive, fixed = results['adaptive'], results['fixed_60s']
+    failures = []
+    if adaptive['polls'] >= fixed['polls']:
+        failures.append(f"{adaptive['polls']} sondeos, no menos que los {fixed['polls']} del sondeo fijo")
+    if adaptive['changes_detected'] < results['changes']:
+        failures.append(f"sólo {adaptive['changes_detected']} de {results['changes']} cambios detectados")
+    if adaptive['window_delay_max_s'] > results['live_interval_s']:
+        failures.append(f"retraso de {adaptive['window_delay_max_s']}s dentro de una ventana "
+                        f"(límite {results['live_interval_s']}s)")
+    if adaptive['outside_delay_max_s'] > results['max_interval_s']:
+        failures.append(f"retraso de {adaptive['outside_delay_max_s']}s fuera de las ventanas "
+                        f"(límite {results['max_interval_s']}s)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calendar', default=tabla.CALENDAR_FILE)
+    parser.add_argument('--db', help='Historial grabado (SnapshotStore) en lugar de sintetizar')
+    parser.add_argument('--start', default='2024-01-08T00:00:00-06:00',
+                        help='Inicio de la semana a simular (ISO 8601)')
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    results = run(args.calendar, args.start, args.seed, args.db)
+    results['failures'] = check(results)
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        report(results)
+
+    if results['failures']:
+        sys.exit(1)
+
+
+def report(results):
+    adaptive, fixed = results['adaptive'], results['fixed_60s']
+    print(f"Ventanas de partido: {results['windows']}  Cambios en la semana: {results['changes']}")
+    print(f"{'Política':<12} {'Sondeos':>8} {'Detect.':>8} {'Media s':>8} {'p95 s':>7} {'Máx s':>7} "
+          f"{'Máx vent.':>9} {'Máx fuera':>9}")
+    print('-' * 76)
+    for name, r in (('adaptativa', adaptive), ('fija 60s', fixed)):
+        print(f"{name:<12} {r['polls']:>8} {r['changes_detected']:>8} {r['delay_mean_s']:>8} "
+              f"{r['delay_p95_s']:>7} {r['delay_max_s']:>7} {r['window_delay_max_s']:>9} "
+              f"{r['outside_delay_max_s']:>9}")
+    print(f"\nPeticiones ahorradas: {results['request_reduction']:.1%}")
+    print(f"Decisiones: {adaptive['decisions']}")
+    for failure in results['failures']:
+        print(f"❌ {failure}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Prueba del fan-out concurrente contra un servidor HTTP local
+
+Sirve las páginas de benchmarks/fixtures/ desde servidores http.server
+locales en 127.0.0.1, uno por fuente para que cada una sea un host distinto
+(el motor asíncrono abre una sola conexión por host). Una de las fuentes
+apunta a /lento/, que responde sólo después de --slow segundos, más que el
+límite del ciclo (--deadline). Con cada motor (sync con requests y, si
+aiohttp está instalado, async) comprueba que:
+  - el ciclo termina cerca del límite sin esperar a la fuente lenta;
+  - la fuente lenta queda fuera y las demás llegan completas;
+  - cada fuente trae lo mismo que parse_source sobre el archivo guardado;
+  - los dos motores devuelven las mismas tablas.
+Sale con código 1 si algo falla. También la recoge pytest:
+
+    python -m pytest -q benchmarks/test_fetch_server.py
+
+Uso:
+    python benchmarks/test_fetch_server.py [--deadline 1.5] [--slow 4] [--json]
+"""
+import argparse
+import http.server
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import tabla
+from bench_cycle import FIXTURES, SOURCES, QuietHandler, make_scraper, read_fixture
+
+# Después de bench_cycle, que deja pasar los avisos
+logging.disable(logging.WARNING)
+
+SLOW_SOURCE = 'foxsports'
+MARGIN = 1.0  # segundos de holgura sobre el límite del ciclo
+
+
+class SlowHandler(QuietHandler):
+    """Sirve los fixtures; bajo /lento/ espera server.slow_delay antes de responder"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES, **kwargs)
+
+    def do_GET(self):
+        if self.path.startswith('/lento/'):
+            time.sleep(self.server.slow_delay)
+            self.path = self.path[len('/lento'):]
+        super().do_GET()
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, slow_delay):
+        super().__init__(('127.0.0.1', 0), SlowHandler)
+        self.slow_delay = slow_delay
+        self.base_url = f'http://127.0.0.1:{self.server_port}'
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def handle_error(self, request, client_address):
+        pass  # el cliente corta la fuente lenta al vencer el límite
+
+
+def expected_rows():
+    """Filas de cada fuente parseadas directamente desde el archivo guardado"""
+    scraper = tabla.LigaMXScraper()
+    return {
+        source: [team.as_tuple() for team in scraper.parse_source(source, read_fixture(source))]
+        for source in SOURCES
+    }
+
+
+def run_engine(engine, servers, deadline):
+    """(resultados por fuente como tuplas, segundos del ciclo)"""
+    scraper, _ = make_scraper(engine, 'server', servers[SOURCES[0]].base_url)
+    for source, server in servers.items():
+        slow = '/lento' if source == SLOW_SOURCE else ''
+        scraper.sources[source]['url'] = f'{server.base_url}{slow}/{source}.html'
+    scraper.configure_sources()
+    scraper.fetch_mode = 'fanout'
+    scraper.fanout_strategy = 'all'
+    try:
+        started = time.perf_counter()
+        results = scraper.scrape_all_sources(deadline=deadline)
+        elapsed = time.perf_counter() - started
+    finally:
+        if isinstance(scraper, tabla.AsyncLigaMXScraper):
+            scraper.shutdown()
+    rows = {source: [team.as_tuple() for team in teams] for source, teams in results.items()}
+    return rows, elapsed
+
+
+def check(engines=None, deadline=1.5, slow=4.0):
+    """Resultado por motor y lista de fallos"""
+    if engines is None:
+        engines = ['sync'] + (['async'] if tabla.aiohttp is not None else [])
+    expected = expected_rows()
+    fast = sorted(set(SOURCES) - {SLOW_SOURCE})
+    servers = {source: FixtureServer(slow) for source in SOURCES}
+    report, failures, tables = {}, [], {}
+    try:
+        for engine in engines:
+            rows, elapsed = run_engine(engine, servers, deadline)
+            tables[engine] = rows
+            report[engine] = {'seconds': round(elapsed, 3), 'sources': sorted(rows)}
+            if sorted(rows) != fast:
+                failures.append(f"{engine}: fuentes {sorted(rows)}, se esperaba {fast}")
+            if elapsed > deadline + MARGIN:
+                failures.append(f"{engine}: el ciclo tardó {elapsed:.2f}s con límite de {deadline}s")
+            for source in fast:
+                if source in rows and rows[source] != expected[source]:
+                    failures.append(f"{engine}/{source}: filas distintas a las del archivo")
+    finally:
+        for server in servers.values():
+            server.shutdown()
+            server.server_close()
+    if len(tables) > 1 and len({json.dumps(rows, sort_keys=True) for rows in tables.values()}) > 1:
+        failures.append(f"los motores {', '.join(tables)} devolvieron tablas distintas")
+    return report, failures
+
+
+def test_fanout_sync():
+    _, failures = check(['sync'])
+    assert not failures, failures
+
+
+def test_fanout_async():
+    import pytest  # sólo bajo pytest; el script corre sin él
+    pytest.importorskip('aiohttp')
+    _, failures = check(['async'])
+    assert not failures, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--deadline', type=float, default=1.5, help='Límite del ciclo en segundos')
+    parser.add_argument('--slow', type=float, default=4.0, help='Demora de la fuente lenta')
+    parser.add_argument('--json', action='store_true', help='Imprime resultados en JSON')
+    args = parser.parse_args()
+
+    report, failures = check(deadline=args.deadline, slow=args.slow)
+    if args.json:
+        print(json.dumps({'deadline': args.deadline, 'slow_source': SLOW_SOURCE,
+                          'engines': report, 'failures': failures}, indent=2))
+    else:
+        print(f"Límite del ciclo: {args.deadline}s  Fuente lenta: {SLOW_SOURCE} ({args.slow}s)")
+        for engine, data in report.items():
+            print(f"{engine:<6} {data['seconds']:>6.2f}s  {', '.join(data['sources'])}")
+        for failure in failures:
+            print(f"❌ {failure}")
+        if not failures:
+            print("✅ Fan-out correcto en todos los motores")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Prueba de la política de sondeo adaptativa sobre una semana simulada
+
+Reutiliza sim_polling.py: la semana del calendario con goles, resultados y
+una corrección fuera de ventana. La política adaptativa debe hacer menos
+peticiones que el sondeo fijo de 60 s, detectar todos los cambios y no tardar
+más de live_interval dentro de una ventana de partido (max_interval fuera).
+
+    python -m pytest -q benchmarks/test_polling_policy.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import sim_polling
+
+
+def test_adaptive_policy_week():
+    results = sim_polling.run()
+    assert results['changes'] > 0
+    assert results['adaptive']['polls'] < results['fixed_60s']['polls']
+    assert not sim_polling.check(results), sim_polling.check(results)
+
+
+def test_window_delay_bounded_with_other_seeds():
+    for seed in (1, 7, 11):
+        results = sim_polling.run(seed=seed)
+        assert results['adaptive']['window_delay_max_s'] <= results['live_interval_s'], seed
+        assert not sim_polling.check(results), (seed, sim_polling.check(results))
@@ -1,36 +1,3362 @@
-import requests
 import time
 import random
-from bs4 import BeautifulSoup
 import json
-from urllib.parse import urljoin
-from datetime import datetime
+from urllib.parse import urljoin, urlparse, urlsplit, parse_qs
+from datetime import datetime, timedelta
 import threading
-from concurrent.futures import ThreadPoolExecutor
-import ssl
-import urllib3
 import logging
+import argparse
+import codecs
+import contextvars
+import re
+import hashlib
+import importlib
+import importlib.util
+import math
+import bisect
+import gzip
+import operator
+import os
+import queue
+import runpy
+import shutil
+import sys
+import tempfile
+import unicodedata
+from functools import partial, lru_cache
+from contextlib import contextmanager
+from collections import OrderedDict, deque
 
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+class _LazyModule:
+    """Módulo que se importa en el primer acceso a uno de sus atributos
+    
+    Una ejecución de una sola vez (cron, `once --json`) no paga al arrancar
+    por requests, bs4, aiohttp o numpy si el subcomando no llega a usarlos.
+    """
+    
+    def __init__(self, name):
+        self._lazy_name = name
+        self._lazy_module = None
+    
+    def __getattr__(self, attr):
+        module = self._lazy_module
+        if module is None:
+            module = self._lazy_module = importlib.import_module(self._lazy_name)
+        return getattr(module, attr)
+    
+    def __repr__(self):
+        state = 'importado' if self._lazy_module is not None else 'sin importar'
+        return f"<módulo perezoso {self._lazy_name} ({state})>"
+
+
+def _optional_module(name, *requires):
+    """_LazyModule si name y sus dependencias están instaladas, None si no
+    
+    find_spec sólo busca el paquete en sys.path, no lo importa.
+    """
+    for package in requires or (name.partition('.')[0],):
+        if importlib.util.find_spec(package) is None:
+            return None
+    return _LazyModule(name)
+
+
+# Pila HTTP, parseo, historial, hilos y multiprocesamiento: se importan al primer uso
+requests = _LazyModule('requests')
+urllib3 = _LazyModule('urllib3')
+bs4 = _LazyModule('bs4')
+asyncio = _LazyModule('asyncio')
+email_utils = _LazyModule('email.utils')
+sqlite3 = _LazyModule('sqlite3')
+concurrent_futures = _LazyModule('concurrent.futures')
+html_parser = _LazyModule('html.parser')
+multiprocessing = _LazyModule('multiprocessing')
+shared_memory = _LazyModule('multiprocessing.shared_memory')
+futures_process = _LazyModule('concurrent.futures.process')
+
+# El motor asíncrono es opcional
+aiohttp = _optional_module('aiohttp')
+
+# Backends de parseo en C opcionales; BeautifulSoup queda como respaldo
+selectolax = _optional_module('selectolax.lexbor')
+etree = _optional_module('lxml.etree')
+lxml_html = _optional_module('lxml.html')
+lxml_cssselect = _optional_module('lxml.cssselect', 'lxml', 'cssselect')
+
+# El consenso vectorizado es opcional
+np = _optional_module('numpy')
+
+# Serializador rápido opcional; json de la stdlib como respaldo
+orjson = _optional_module('orjson')
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class FetchedResponse:
+    """Respuesta HTTP ya descargada, independiente de la librería cliente"""
+    
+    def __init__(self, url, status_code, content, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = False
+
+
+class ResponseCache:
+    """Caché HTTP por URL con validadores ETag/Last-Modified y LRU acotado"""
+    
+    def __init__(self, max_entries=64, disk_path=None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        
+        self.hits = 0           # 304 o cuerpo idéntico al anterior
+        self.misses = 0         # cuerpo nuevo o URL sin entrada
+        self.not_modified = 0   # respuestas 304
+        self.parse_skips = 0    # parseos evitados por hash sin cambios
+        self.evictions = 0
+        
+        if disk_path:
+            self._open_disk(disk_path)
+    
+    def _open_disk(self, path):
+        """Abre el respaldo en disco (SQLite) que sobrevive reinicios"""
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+            "body_hash TEXT, content BLOB, stored_at REAL)"
+        )
+        self._db.commit()
+    
+    def _load_from_disk(self, url):
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT etag, last_modified, body_hash, content, stored_at FROM http_cache WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if not row:
+            return None
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'body_hash': row[2],
+            'content': row[3],
+            'stored_at': row[4],
+            'parsed': {},
+        }
+    
+    def _save_to_disk(self, url, entry):
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?)",
+            (url, entry['etag'], entry['last_modified'], entry['body_hash'],
+             entry['content'], entry['stored_at'])
+        )
+        self._db.commit()
+    
+    def _get(self, url):
+        """Busca la entrada en memoria y luego en disco (requiere el lock)"""
+        entry = self._entries.get(url)
+        if entry is None:
+            entry = self._load_from_disk(url)
+            if entry is None:
+                return None
+            self._put(url, entry)
+        self._entries.move_to_end(url)
+        return entry
+    
+    def _put(self, url, entry):
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    @staticmethod
+    def hash_body(content):
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+    
+    def conditional_headers(self, url):
+        """Headers If-None-Match / If-Modified-Since para una URL conocida"""
+        with self._lock:
+            entry = self._get(url)
+            headers = {}
+            if entry:
+                if entry['etag']:
+                    headers['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+    
+    def not_modified_response(self, url):
+        """Reconstruye la respuesta desde caché tras un 304"""
+        with self._lock:
+            entry = self._get(url)
+            if entry is None:
+                return None
+            self.hits += 1
+            self.not_modified += 1
+            response = FetchedResponse(url, 200, entry['content'])
+            response.from_cache = True
+            response.cache_key = url
+            response.body_hash = entry['body_hash']
+            return response
+    
+    def store(self, url, response):
+        """Registra una respuesta 200 y anota en ella su hash de cuerpo"""
+        content = response.content
+        body_hash = self.hash_body(content)
+        headers = response.headers
+        
+        with self._lock:
+            entry = self._get(url)
+            if entry is not None and entry['body_hash'] == body_hash:
+                self.hits += 1
+                validators = (entry['etag'], entry['last_modified'])
+                entry['etag'] = headers.get('ETag') or entry['etag']
+                entry['last_modified'] = headers.get('Last-Modified') or entry['last_modified']
+                if (entry['etag'], entry['last_modified']) != validators:
+                    # Sin esto, tras reiniciar se enviarían validadores viejos y no habría 304
+                    self._save_to_disk(url, entry)
+            else:
+                self.misses += 1
+                entry = {
+                    'etag': headers.get('ETag'),
+                    'last_modified': headers.get('Last-Modified'),
+                    'body_hash': body_hash,
+                    'content': content,
+                    'stored_at': time.time(),
+                    'parsed': {},
+                }
+                self._put(url, entry)
+                self._save_to_disk(url, entry)
+        
+        response.cache_key = url
+        response.body_hash = body_hash
+        return response
+    
+    def get_parsed(self, url, body_hash, parse_key):
+        """Resultado de parseo previo para el mismo cuerpo y la misma clave, o None"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or entry['body_hash'] != body_hash:
+                return None
+            parsed = entry['parsed'].get(parse_key)
+            if parsed is not None:
+                self.parse_skips += 1
+            return parsed
+    
+    def set_parsed(self, url, body_hash, parse_key, teams):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and entry['body_hash'] == body_hash:
+                entry['parsed'][parse_key] = teams
+    
+    def stats(self):
+        """Contadores de aciertos y fallos del caché"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'parse_skips': self.parse_skips,
+                'evictions': self.evictions,
+            }
+
+
+class BeautifulSoupParser:
+    """Backend de parseo con BeautifulSoup (respaldo sin dependencias nativas)"""
+    
+    name = 'bs4'
+    
+    def select_rows(self, content, selectors):
+        """Devuelve las filas del primer selector con resultados como listas de textos"""
+        soup = bs4.BeautifulSoup(content, 'html.parser')
+        
+        for selector in selectors:
+            if 'tr' in selector:
+                rows = soup.select(selector)
+            else:
+                table = soup.select_one(selector)
+                rows = table.find_all('tr')[1:] if table else []  # Skip header
+            if rows:
+                return [
+                    [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+                    for row in rows
+                ]
+        return []
+
+
+class LxmlParser:
+    """Backend en C con lxml y selectores CSS compilados a XPath una sola vez"""
+    
+    name = 'lxml'
+    
+    def __init__(self):
+        self._compiled = {}
+        self._cells = etree.XPath('./td | ./th')
+        self._rows = etree.XPath('.//tr')
+    
+    def _compile(self, selector):
+        compiled = self._compiled.get(selector)
+        if compiled is None:
+            compiled = lxml_cssselect.CSSSelector(selector, translator='html')
+            self._compiled[selector] = compiled
+        return compiled
+    
+    @staticmethod
+    def _text(cell):
+        # Mismo resultado que get_text(strip=True) de BeautifulSoup
+        return ''.join(part.strip() for part in cell.itertext())
+    
+    def select_rows(self, content, selectors):
+        """Devuelve las filas del primer selector con resultados como listas de textos"""
+        root = lxml_html.fromstring(content)
+        
+        for selector in selectors:
+            matches = self._compile(selector)(root)
+            if 'tr' in selector:
+                rows = matches
+            else:
+                rows = self._rows(matches[0])[1:] if matches else []  # Skip header
+            if rows:
+                return [[self._text(cell) for cell in self._cells(row)] for row in rows]
+        return []
+
+
+class SelectolaxParser:
+    """Backend en C con selectolax (motor lexbor), el más rápido disponible"""
+    
+    name = 'selectolax'
+    
+    def select_rows(self, content, selectors):
+        """Devuelve las filas del primer selector con resultados como listas de textos"""
+        tree = selectolax.LexborHTMLParser(content)
+        
+        for selector in selectors:
+            if 'tr' in selector:
+                rows = tree.css(selector)
+            else:
+                table = tree.css_first(selector)
+                rows = table.css('tr')[1:] if table else []  # Skip header
+            if rows:
+                return [
+                    [
+                        cell.text(deep=True, separator='', strip=True)
+                        for cell in row.iter()
+                        if cell.tag in ('td', 'th')
+                    ]
+                    for row in rows
+                ]
+        return []
+
+
+PARSER_BACKENDS = {
+    'selectolax': SelectolaxParser,
+    'lxml': LxmlParser,
+    'bs4': BeautifulSoupParser,
+}
+
+
+def available_parser_backends():
+    """Backends de parseo cuyas dependencias están instaladas"""
+    available = []
+    if selectolax is not None:
+        available.append('selectolax')
+    if lxml_html is not None and lxml_cssselect is not None:
+        available.append('lxml')
+    available.append('bs4')
+    return available
+
+
+def get_parser_backend(name='auto'):
+    """Instancia el backend pedido, o el más rápido disponible con 'auto'"""
+    available = available_parser_backends()
+    if name == 'auto':
+        name = available[0]
+    elif name not in available:
+        logger.warning(f"Backend de parseo '{name}' no disponible, usando {available[0]}")
+        name = available[0]
+    return PARSER_BACKENDS[name]()
+
+
+# Backend de cada proceso de ProcessParser, creado una vez por worker, y
+# bloques de memoria compartida ya abiertos (el proceso principal los reutiliza)
+_worker_parser = None
+_worker_blocks = {}
+
+
+def _init_parse_worker(backend):
+    global _worker_parser
+    _worker_parser = get_parser_backend(backend)
+
+
+def _parse_rows_worker(source, selectors):
+    """Worker de ProcessParser: filas como tuplas de textos
+
+    source es el HTML o (nombre, tamaño) de un bloque de memoria compartida.
+    """
+    if isinstance(source, tuple):
+        name, size = source
+        # Los workers comparten el resource_tracker del proceso principal,
+        # que es quien borra los bloques (unlink) en ProcessParser.close()
+        block = _worker_blocks.get(name)
+        if block is None:
+            block = _worker_blocks[name] = shared_memory.SharedMemory(name=name)
+        content = bytes(block.buf[:size])
+    else:
+        content = source
+    return [tuple(row) for row in _worker_parser.select_rows(content, selectors)]
+
+
+class ProcessParser:
+    """Etapa de parseo en un pool de procesos para el HTML (trabajo de CPU)
+    
+    El parseo retiene el GIL, así que con muchas competiciones o al
+    reprocesar páginas archivadas un núcleo queda saturado y el resto ocioso.
+    Los bytes de la página viajan al worker por memoria compartida (una
+    copia al bloque en lugar de serializarlos por la tubería; por debajo de
+    shm_threshold se envían directamente) y vuelven sólo las filas como
+    tuplas de textos; la extracción a TeamStanding sigue en el proceso
+    principal. Los workers crean su backend de parseo una vez.
+    
+    Los bloques se reutilizan entre páginas (crear y borrar uno por página
+    cuesta más que serializar ~100 KiB): hay tantos como páginas en vuelo y
+    cada worker abre cada bloque una sola vez.
+    """
+    
+    MIN_BLOCK = 256 * 1024
+    
+    def __init__(self, backend='auto', workers=None, shm_threshold=32768, start_method='spawn'):
+        self.backend = get_parser_backend(backend).name
+        self.workers = workers or os.cpu_count() or 1
+        self.shm_threshold = shm_threshold
+        self.executor = futures_process.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_parse_worker,
+            initargs=(self.backend,),
+        )
+        self.pages = 0
+        self.shared_bytes = 0
+        self._blocks = []  # todos los bloques creados
+        self._free = []  # bloques libres para la siguiente página
+        self._lock = threading.Lock()
+    
+    @property
+    def name(self):
+        return f'{self.backend}@{self.workers}p'
+    
+    def _acquire(self, size):
+        with self._lock:
+            for i, block in enumerate(self._free):
+                if block.size >= size:
+                    return self._free.pop(i)
+            block = shared_memory.SharedMemory(create=True, size=max(size, self.MIN_BLOCK))
+            self._blocks.append(block)
+            return block
+    
+    def _release(self, block):
+        with self._lock:
+            self._free.append(block)
+    
+    def submit(self, content, selectors):
+        """Encola el parseo de una página; su bloque compartido vuelve a la lista libre al terminar"""
+        block = None
+        source = content
+        if isinstance(content, (bytes, bytearray)) and len(content) >= self.shm_threshold:
+            block = self._acquire(len(content))
+            block.buf[:len(content)] = content
+            source = (block.name, len(content))
+        with self._lock:
+            self.pages += 1
+            self.shared_bytes += len(content) if block is not None else 0
+        
+        try:
+            future = self.executor.submit(_parse_rows_worker, source, list(selectors))
+        except Exception:
+            if block is not None:
+                self._release(block)
+            raise
+        if block is not None:
+            future.add_done_callback(lambda _: self._release(block))
+        return future
+    
+    def select_rows(self, content, selectors):
+        """Misma interfaz que los backends: bloquea el hilo que llama, no el GIL"""
+        return self.submit(content, selectors).result()
+    
+    def select_many(self, pages):
+        """Parsea [(content, selectors), ...] en paralelo y devuelve las filas en orden"""
+        futures = [self.submit(content, selectors) for content, selectors in pages]
+        return [future.result() for future in futures]
+    
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            for block in self._blocks:
+                block.close()
+                block.unlink()
+            self._blocks = []
+            self._free = []
+
+
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+def stream_decoder(content_type, first_chunk):
+    """Decoder incremental según el header Content-Type o el <meta charset> del primer bloque"""
+    encoding = None
+    if content_type and 'charset=' in content_type.lower():
+        encoding = content_type.lower().split('charset=')[-1].split(';')[0].strip(' "\'')
+    if not encoding:
+        match = META_CHARSET_RE.search(first_chunk)
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+class StandingsTableParser:
+    """Parser incremental que junta las filas de la tabla de posiciones y se
+    marca como terminado en cuanto esa tabla se cierra.
+    
+    El texto anterior al primer <table> (head, scripts, menús) se descarta sin
+    tokenizar, así que los hints deben estar en la propia tabla o en un
+    contenedor que aparezca después de ella. Envuelve un html.parser.HTMLParser
+    en lugar de heredar de él para que html.parser se importe al primer uso."""
+    
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'source', 'track', 'wbr'}
+    
+    def __init__(self, hints=(), min_rows=10):
+        self._parser = html_parser.HTMLParser(convert_charrefs=True)
+        self._parser.handle_starttag = self.handle_starttag
+        self._parser.handle_endtag = self.handle_endtag
+        self._parser.handle_data = self.handle_data
+        self.hints = set(hints)
+        self.min_rows = min_rows
+        self.done = False
+        self.rows = None
+        self._fallback_rows = None
+        self._hint_stack = []   # etiquetas abiertas con alguna clase de hints
+        self._tables = []       # pila de tablas abiertas (admite anidadas)
+        self._skip = 0          # dentro de <script>/<style>
+        self._started = False
+        self._pending = ''
+    
+    def feed(self, data):
+        if not self._started:
+            self._pending += data
+            index = self._pending.lower().find('<table')
+            if index < 0:
+                # Conservar la cola por si '<table' queda partido entre bloques
+                self._pending = self._pending[-5:]
+                return
+            data = self._pending[index:]
+            self._pending = ''
+            self._started = True
+        self._parser.feed(data)
+    
+    def close(self):
+        self._parser.close()
+    
+    def _matches(self, attrs):
+        classes = set((dict(attrs).get('class') or '').split())
+        return bool(self.hints & classes)
+    
+    def _close_cell(self, table):
+        if table['cell'] is not None:
+            text, is_header = table['cell']
+            table['row'].append((''.join(text), is_header))
+            table['cell'] = None
+    
+    def _close_row(self, table):
+        self._close_cell(table)
+        row = table['row']
+        table['row'] = None
+        # Se omiten filas de encabezado (thead o sólo <th>)
+        if row and table['section'] != 'thead' and not all(is_header for _, is_header in row):
+            table['rows'].append([text for text, _ in row])
+    
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag in ('script', 'style'):
+            self._skip += 1
+            return
+        if tag not in self.VOID_TAGS and self.hints and self._matches(attrs):
+            self._hint_stack.append(tag)
+        
+        if tag == 'table':
+            self._tables.append({
+                'match': not self.hints or bool(self._hint_stack),
+                'rows': [],
+                'row': None,
+                'cell': None,
+                'section': None,
+            })
+            return
+        if not self._tables:
+            return
+        
+        table = self._tables[-1]
+        if tag in ('thead', 'tbody', 'tfoot'):
+            if table['row'] is not None:
+                self._close_row(table)
+            table['section'] = tag
+        elif tag == 'tr':
+            if table['row'] is not None:
+                self._close_row(table)
+            table['row'] = []
+        elif tag in ('td', 'th') and table['row'] is not None:
+            self._close_cell(table)
+            table['cell'] = ([], tag == 'th')
+    
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag in ('script', 'style'):
+            self._skip = max(0, self._skip - 1)
+            return
+        if tag in self._hint_stack:
+            # Cierra también etiquetas anidadas sin cierre explícito
+            while self._hint_stack.pop() != tag:
+                pass
+        if not self._tables:
+            return
+        
+        table = self._tables[-1]
+        if tag in ('td', 'th'):
+            self._close_cell(table)
+        elif tag == 'tr':
+            if table['row'] is not None:
+                self._close_row(table)
+        elif tag == 'table':
+            if table['row'] is not None:
+                self._close_row(table)
+            self._tables.pop()
+            if len(table['rows']) >= self.min_rows:
+                if table['match']:
+                    self.rows = table['rows']
+                    self.done = True
+                elif self._fallback_rows is None:
+                    self._fallback_rows = table['rows']
+    
+    def handle_data(self, data):
+        if self.done or self._skip or not self._tables:
+            return
+        cell = self._tables[-1]['cell']
+        if cell is not None:
+            text = data.strip()
+            if text:
+                cell[0].append(text)
+    
+    def result(self):
+        """Filas de la tabla encontrada; si ninguna coincide con hints, la primera suficiente"""
+        return self.rows if self.rows is not None else self._fallback_rows
+
+
+class CancelEvent(threading.Event):
+    """threading.Event que además avisa a callbacks al activarse
+    
+    Así una espera asíncrona (AsyncLigaMXScraper._sleep) puede despertar con
+    un asyncio.Event en su loop cuando otro hilo cancela el ciclo.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._callbacks = []
+        self._callbacks_lock = threading.Lock()
+    
+    def add_callback(self, callback):
+        """Registra callback() para cuando se active; devuelve la función que lo quita"""
+        with self._callbacks_lock:
+            if not self.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+    
+    def _remove_callback(self, callback):
+        with self._callbacks_lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+    
+    def set(self):
+        with self._callbacks_lock:
+            super().set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+# Cancelación y límite (time.monotonic()) de las consultas en curso. Son
+# variables de contexto y no threading.local: run_coroutine_threadsafe copia el
+# contexto del hilo que llama, así el motor asíncrono las ve en su loop de fondo
+fetch_cancel = contextvars.ContextVar('fetch_cancel', default=None)
+fetch_deadline = contextvars.ContextVar('fetch_deadline', default=None)
+
+
+@contextmanager
+def fetch_scope(cancel_event=None, deadline=None):
+    """Fija la cancelación y el límite de las consultas hechas dentro del bloque"""
+    cancel_token = fetch_cancel.set(cancel_event)
+    deadline_token = fetch_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        fetch_deadline.reset(deadline_token)
+        fetch_cancel.reset(cancel_token)
+
+
+class HostRateScheduler:
+    """Planificador AIMD por host: envía de inmediato si el host está sano y
+    se aleja ante 429/403, Retry-After, errores o latencia alta"""
+    
+    def __init__(self, min_interval=1.0, max_interval=300.0, latency_target=5.0,
+                 decrease_step=0.5, backoff_factor=2.0, jitter=0.1):
+        self.defaults = {
+            'min_interval': min_interval,
+            'max_interval': max_interval,
+            'latency_target': latency_target,
+        }
+        self.decrease_step = decrease_step
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self._hosts = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+    
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = dict(self.defaults)
+            state.update({
+                'interval': state['min_interval'],
+                'next_allowed': 0.0,
+                'requests': 0,
+                'waits': 0,
+                'total_wait': 0.0,
+                'max_wait': 0.0,
+                'last_wait': 0.0,
+                'throttled': 0,
+                'errors': 0,
+                'retry_after': 0,
+                'over_budget': 0,
+                'last_latency': None,
+            })
+            self._hosts[host] = state
+        return state
+    
+    def configure(self, url_or_host, **limits):
+        """Fija límites de cortesía (min_interval, max_interval, latency_target) para un host"""
+        host = self.host_of(url_or_host) if '/' in url_or_host else url_or_host
+        with self._lock:
+            state = self._state(host)
+            for key in ('min_interval', 'max_interval', 'latency_target'):
+                if limits.get(key) is not None:
+                    state[key] = float(limits[key])
+            if state['requests'] == 0:
+                state['interval'] = state['min_interval']
+            state['interval'] = min(max(state['interval'], state['min_interval']), state['max_interval'])
+    
+    def reserve(self, url, max_wait=None):
+        """Reserva el siguiente turno del host y devuelve los segundos a esperar
+        
+        Si el turno queda a más de max_wait segundos no se reserva nada y
+        devuelve None: el intento falla en lugar de dormir más allá del ciclo.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(self.host_of(url))
+            start = max(now, state['next_allowed'])
+            if max_wait is not None and start - now > max_wait:
+                state['over_budget'] += 1
+                return None
+            spacing = state['interval']
+            if spacing and self.jitter:
+                spacing *= 1 + random.uniform(0, self.jitter)
+            state['next_allowed'] = start + spacing
+            
+            wait = start - now
+            state['requests'] += 1
+            state['last_wait'] = wait
+            if wait > 0:
+                state['waits'] += 1
+                state['total_wait'] += wait
+                state['max_wait'] = max(state['max_wait'], wait)
+            return wait
+    
+    def record(self, url, status=None, latency=None, retry_after=None):
+        """Ajusta el intervalo del host según el resultado de la petición"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(self.host_of(url))
+            state['last_latency'] = latency
+            
+            if status is None or status in (403, 429) or status >= 500:
+                # Disminución multiplicativa de la tasa
+                if status is None:
+                    state['errors'] += 1
+                else:
+                    state['throttled'] += 1
+                interval = max(state['interval'], 1.0) * self.backoff_factor
+                delay = self.parse_retry_after(retry_after)
+                if delay is not None:
+                    # Un Retry-After enorme no debe dejar al host fuera de la rejilla de sondeo
+                    delay = min(delay, state['max_interval'])
+                    state['retry_after'] += 1
+                    interval = max(interval, delay)
+                state['interval'] = min(interval, state['max_interval'])
+                # El siguiente turno ya espera el intervalo nuevo, no el anterior
+                state['next_allowed'] = max(state['next_allowed'], now + state['interval'])
+            elif latency is not None and latency > state['latency_target']:
+                # Host lento: espaciar un poco sin llegar a castigarlo
+                state['interval'] = min(max(state['interval'], 1.0) * 1.5, state['max_interval'])
+            else:
+                # Aumento aditivo de la tasa
+                state['interval'] = max(state['interval'] - self.decrease_step, state['min_interval'])
+    
+    @staticmethod
+    def parse_retry_after(value):
+        """Interpreta Retry-After en segundos o como fecha HTTP"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            when = email_utils.parsedate_to_datetime(value)
+            return max(0.0, when.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    
+    def metrics(self):
+        """Decisiones de espera por host"""
+        with self._lock:
+            return {
+                host: {
+                    'interval': round(state['interval'], 3),
+                    'min_interval': state['min_interval'],
+                    'requests': state['requests'],
+                    'waits': state['waits'],
+                    'total_wait': round(state['total_wait'], 3),
+                    'max_wait': round(state['max_wait'], 3),
+                    'last_wait': round(state['last_wait'], 3),
+                    'throttled': state['throttled'],
+                    'errors': state['errors'],
+                    'retry_after': state['retry_after'],
+                    'over_budget': state['over_budget'],
+                    'last_latency': state['last_latency'],
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+class TeamStanding:
+    """Fila de la tabla de posiciones con campos enteros validados al extraerla"""
+    
+    __slots__ = ('position', 'team', 'points', 'games', 'wins', 'draws',
+                 'losses', 'goal_diff', 'source')
+    
+    INT_FIELDS = ('points', 'games', 'wins', 'draws', 'losses', 'goal_diff')
+    
+    def __init__(self, position, team, points, games, wins, draws, losses, goal_diff, source):
+        self.position = position
+        self.team = team
+        self.points = points
+        self.games = games
+        self.wins = wins
+        self.draws = draws
+        self.losses = losses
+        self.goal_diff = goal_diff
+        self.source = source
+    
+    @staticmethod
+    def parse_int(value):
+        """Convierte textos como '25', '+8', '−3' o '' en enteros"""
+        if isinstance(value, int):
+            return value
+        text = value.strip().replace('\u2212', '-').replace('+', '')
+        if text in ('', '-', '\u2013'):
+            return 0
+        return int(text)
+    
+    @classmethod
+    def from_values(cls, position, values, source):
+        """Crea el registro desde los textos de una fila; ValueError si no son válidos"""
+        parse_int = cls.parse_int
+        standing = cls(
+            int(position),
+            values['team'],
+            parse_int(values.get('points', 0)),
+            parse_int(values.get('games', 0)),
+            parse_int(values.get('wins', 0)),
+            parse_int(values.get('draws', 0)),
+            parse_int(values.get('losses', 0)),
+            parse_int(values.get('goal_diff', 0)),
+            source,
+        )
+        if min(standing.points, standing.games, standing.wins, standing.draws, standing.losses) < 0:
+            raise ValueError(f"Valores negativos en la fila de {standing.team}")
+        return standing
+    
+    def sort_key(self):
+        """Clave de orden ascendente: más puntos, mejor diferencia, posición reportada"""
+        return (-self.points, -self.goal_diff, self.position)
+    
+    def as_tuple(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+    
+    def to_dict(self):
+        """Forma JSON histórica (valores como texto)"""
+        return {
+            'position': str(self.position),
+            'team': self.team,
+            'points': str(self.points),
+            'games': str(self.games),
+            'wins': str(self.wins),
+            'draws': str(self.draws),
+            'losses': str(self.losses),
+            'goal_diff': str(self.goal_diff),
+            'source': self.source,
+        }
+    
+    def __eq__(self, other):
+        if not isinstance(other, TeamStanding):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+    
+    def __repr__(self):
+        return (f"TeamStanding({self.position}, {self.team!r}, pts={self.points}, "
+                f"pj={self.games}, dg={self.goal_diff}, source={self.source!r})")
+
+
+class SourceSpec:
+    """Especificación compilada de una fuente declarada en self.sources"""
+    
+    FIELDS = ('team', 'points', 'games', 'wins', 'draws', 'losses', 'goal_diff')
+    
+    __slots__ = ('name', 'url', 'label', 'priority', 'fallback', 'row_selectors',
+                 'stream_hints', 'min_cells', 'max_rows', 'weight', 'fields',
+                 'indices', 'width', 'parse_key', '_take')
+    
+    def __init__(self, name, config, max_rows=18):
+        self.name = name
+        self.url = config['url']
+        self.label = config.get('label', name)
+        self.priority = config.get('priority', 100)
+        self.fallback = config.get('fallback')
+        self.row_selectors = tuple(config['row_selectors'])
+        self.stream_hints = tuple(config.get('stream_hints', ()))
+        self.min_cells = config.get('min_cells', 3)
+        self.max_rows = config.get('max_rows', max_rows)
+        self.weight = config.get('weight', 1.0)
+        
+        # Columnas en el orden canónico de los campos, sin importar cómo se declararon
+        columns = config['columns']
+        unknown = set(columns) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Campos desconocidos en la fuente {name}: {', '.join(sorted(unknown))}")
+        self.fields = tuple(field for field in self.FIELDS if field in columns)
+        self.indices = tuple(columns[field] for field in self.fields)
+        self.width = max(self.indices) + 1
+        self._take = operator.itemgetter(*self.indices)
+        # Identidad de lo que produce el parseo; dos specs con la misma URL no comparten memo
+        self.parse_key = (name, self.label, self.row_selectors, self.fields, self.indices,
+                          self.min_cells, self.max_rows)
+    
+    def extract(self, cells):
+        """Valores de los campos de una fila en una sola pasada sobre las celdas"""
+        if len(cells) >= self.width:
+            return self._take(cells)
+        size = len(cells)
+        return tuple(cells[i] if i < size else '0' for i in self.indices)
+
+
+class ConsensusEngine:
+    """Reconcilia las tablas de todas las fuentes de un ciclo campo por campo
+    
+    Cada campo de cada equipo se decide por mediana ponderada con el peso de
+    confiabilidad de la fuente: si un valor reúne más de la mitad del peso es
+    el de la mayoría, y si no gana el valor central. Los campos que una
+    fuente no publica no votan. Con numpy el voto se hace sobre la matriz
+    equipos × fuentes × campos de una sola vez; sin numpy, equipo por equipo.
+    """
+    
+    FIELDS = ('position',) + TeamStanding.INT_FIELDS
+    
+    def __init__(self, use_numpy=None):
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+    
+    def build_matrix(self, results, weights, fields, normalize):
+        """Valores y pesos por equipo/fuente/campo; peso 0 donde no hay dato"""
+        sources = list(results)
+        teams = {}
+        for s, source in enumerate(sources):
+            available = fields.get(source, self.FIELDS)
+            weight = weights.get(source, 1.0)
+            for standing in results[source]:
+                name = normalize(standing.team)
+                entry = teams.setdefault(name, {'sources': {}, 'cells': {}})
+                entry['sources'][source] = standing
+                entry['cells'][s] = [
+                    (getattr(standing, field), weight if field in available or field == 'position' else 0.0)
+                    for field in self.FIELDS
+                ]
+        
+        empty = [(0, 0.0)] * len(self.FIELDS)
+        values, votes = [], []
+        for entry in teams.values():
+            rows = [entry['cells'].get(s, empty) for s in range(len(sources))]
+            values.append([[cell[0] for cell in row] for row in rows])
+            votes.append([[cell[1] for cell in row] for row in rows])
+        return sources, teams, values, votes
+    
+    def vote_numpy(self, values, votes):
+        values = np.asarray(values, dtype=np.int64)    # equipos × fuentes × campos
+        votes = np.asarray(votes, dtype=np.float64)
+        
+        order = np.argsort(values, axis=1, kind='stable')
+        sorted_values = np.take_along_axis(values, order, axis=1)
+        cumulative = np.cumsum(np.take_along_axis(votes, order, axis=1), axis=1)
+        total = cumulative[:, -1:, :]
+        # Primer valor que alcanza la mitad del peso total
+        median_at = np.argmax(cumulative * 2 >= total, axis=1)
+        consensus = np.take_along_axis(sorted_values, median_at[:, None, :], axis=1)[:, 0, :]
+        consensus = np.where(total[:, 0, :] > 0, consensus, 0)
+        
+        present = votes > 0
+        high = np.where(present, values, np.iinfo(np.int64).min).max(axis=1)
+        low = np.where(present, values, np.iinfo(np.int64).max).min(axis=1)
+        conflicted = (present.sum(axis=1) > 1) & (high != low)
+        return consensus.tolist(), conflicted.tolist()
+    
+    def vote_python(self, values, votes):
+        consensus, conflicted = [], []
+        for team_values, team_votes in zip(values, votes):
+            team_consensus, team_conflicts = [], []
+            for f in range(len(self.FIELDS)):
+                cells = sorted(
+                    (row[f], row_votes[f])
+                    for row, row_votes in zip(team_values, team_votes)
+                    if row_votes[f] > 0
+                )
+                total = sum(weight for _, weight in cells)
+                chosen, cumulative = 0, 0.0
+                for value, weight in cells:
+                    cumulative += weight
+                    if cumulative * 2 >= total:
+                        chosen = value
+                        break
+                team_consensus.append(chosen)
+                team_conflicts.append(len(cells) > 1 and cells[0][0] != cells[-1][0])
+            consensus.append(team_consensus)
+            conflicted.append(team_conflicts)
+        return consensus, conflicted
+    
+    def consolidate(self, results, weights, fields, normalize):
+        """Devuelve (consolidado por equipo, lista de discrepancias)"""
+        sources, teams, values, votes = self.build_matrix(results, weights, fields, normalize)
+        if not teams:
+            return {}, []
+        
+        vote = self.vote_numpy if self.use_numpy and np is not None else self.vote_python
+        consensus, conflicted = vote(values, votes)
+        
+        consolidated = {}
+        conflicts = []
+        for t, (name, entry) in enumerate(teams.items()):
+            contributors = entry['sources']
+            # Con una sola fuente se conserva su etiqueta ('ESPN MX', 'Demo Data')
+            label = next(iter(contributors.values())).source if len(contributors) == 1 else 'consenso'
+            record = TeamStanding(consensus[t][0], name, *consensus[t][1:], label)
+            
+            team_conflicts = {}
+            # La posición reportada varía con el criterio de desempate; no es discrepancia
+            for f, field in enumerate(self.FIELDS[1:], 1):
+                if not conflicted[t][f]:
+                    continue
+                reported = {
+                    source: values[t][s][f]
+                    for s, source in enumerate(sources)
+                    if votes[t][s][f] > 0
+                }
+                team_conflicts[field] = reported
+                conflicts.append({
+                    'team': name,
+                    'field': field,
+                    'values': reported,
+                    'consensus': consensus[t][f],
+                })
+            
+            consolidated[name] = {
+                'name': name,
+                'sources': contributors,
+                'consensus': record,
+                'conflicts': team_conflicts,
+            }
+        return consolidated, conflicts
+
+
+class MetricsRegistry:
+    """Contadores, histogramas y spans en memoria para medir el camino caliente
+    
+    Los histogramas usan cubetas fijas en segundos (como Prometheus), así
+    observar es O(log n) sin guardar muestras. Los collectors devuelven
+    indicadores de estado (name, value, labels) que se leen al exportar.
+    Se exporta en formato de texto de Prometheus o como JSON.
+    """
+    
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    
+    def __init__(self, prefix='ligamx'):
+        self.prefix = prefix
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._dump_stop = None
+    
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+    
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        index = bisect.bisect_left(self.BUCKETS, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.BUCKETS) + 1), 0, 0.0]
+            histogram[0][index] += 1
+            histogram[1] += 1
+            histogram[2] += value
+    
+    @contextmanager
+    def span(self, name, **labels):
+        """Mide el bloque y lo registra en el histograma <name>_seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f'{name}_seconds', time.perf_counter() - started, **labels)
+    
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+    
+    def _gauges(self):
+        gauges = []
+        for collector in self._collectors:
+            try:
+                gauges.extend(collector())
+            except Exception as e:
+                logger.error(f"Error leyendo métricas: {e}")
+        return gauges
+    
+    def quantile(self, buckets, count, q):
+        """Cota superior de la cubeta que contiene el cuantil q"""
+        if not count:
+            return None
+        target = q * count
+        cumulative = 0
+        for bound, hits in zip(self.BUCKETS, buckets):
+            cumulative += hits
+            if cumulative >= target:
+                return bound
+        return float('inf')
+    
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(h[0]), h[1], h[2]) for key, h in self._histograms.items()}
+        return {
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            'histograms': [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': count,
+                    'sum': round(total, 6),
+                    'p50': self.quantile(buckets, count, 0.5),
+                    'p95': self.quantile(buckets, count, 0.95),
+                    'buckets': dict(zip(map(str, self.BUCKETS + ('+Inf',)), buckets)),
+                }
+                for (name, labels), (buckets, count, total) in sorted(histograms.items())
+            ],
+            'gauges': [
+                {'name': name, 'labels': labels, 'value': value}
+                for name, value, labels in self._gauges()
+            ],
+        }
+    
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        body = ','.join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                        for key, value in pairs)
+        return '{' + body + '}'
+    
+    def render_prometheus(self):
+        """Exposición en formato de texto de Prometheus (0.0.4)"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(h[0]), h[1], h[2]) for key, h in self._histograms.items()}
+        
+        lines = []
+        typed = set()
+        for (name, labels), value in sorted(counters.items()):
+            metric = f'{self.prefix}_{name}'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} counter')
+                typed.add(metric)
+            lines.append(f'{metric}{self._labels(labels)} {value}')
+        
+        for (name, labels), (buckets, count, total) in sorted(histograms.items()):
+            metric = f'{self.prefix}_{name}'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} histogram')
+                typed.add(metric)
+            cumulative = 0
+            for bound, hits in zip(self.BUCKETS + ('+Inf',), buckets):
+                cumulative += hits
+                lines.append(f'{metric}_bucket{self._labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{metric}_sum{self._labels(labels)} {total}')
+            lines.append(f'{metric}_count{self._labels(labels)} {count}')
+        
+        # Prometheus exige las muestras de una métrica juntas
+        for name, value, labels in sorted(self._gauges(), key=lambda gauge: gauge[0]):
+            metric = f'{self.prefix}_{name}'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} gauge')
+                typed.add(metric)
+            lines.append(f'{metric}{self._labels(sorted(labels.items()))} {value}')
+        return '\n'.join(lines) + '\n'
+    
+    def dump_json(self, path):
+        payload = json.dumps(self.snapshot(), ensure_ascii=False, indent=2).encode('utf-8')
+        JsonPublisher.write_atomic(path, payload)
+    
+    def start_dump(self, path, interval=60.0):
+        """Vuelca snapshot() a un archivo JSON cada interval segundos en un hilo de fondo"""
+        self.stop_dump()
+        stop = self._dump_stop = threading.Event()
+        
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.dump_json(path)
+                except OSError as e:
+                    logger.error(f"Error volcando métricas a {path}: {e}")
+        
+        threading.Thread(target=run, name='metrics-dump', daemon=True).start()
+    
+    def stop_dump(self):
+        if self._dump_stop is not None:
+            self._dump_stop.set()
+            self._dump_stop = None
+
+
+class JsonPublisher:
+    """Etapa de salida: escribe la tabla sólo si cambió y de forma atómica
+    
+    Compara un hash de la sección de datos (sin la marca de tiempo) con el de
+    la última publicación y, si coincide, no reescribe el archivo: sólo
+    renueva su mtime, que así registra la última verificación (la edad que
+    usan el arranque en caliente y `once --json`). La escritura va a
+    un temporal en el mismo directorio que luego reemplaza al destino, así un
+    lector nunca ve un archivo a medias. Con patch_path escribe además un
+    JSON Patch (RFC 6902) con las filas que cambiaron respecto a la versión
+    anterior, envuelto con los hashes de origen y destino. Los listeners
+    reciben (payload, digest) tras cada escritura.
+    """
+    
+    def __init__(self, path='liga_mx_table.json', compact=False, patch_path=None, key='teams'):
+        self.path = path
+        self.compact = compact
+        self.patch_path = patch_path
+        self.key = key
+        self.digest = None
+        self.previous = None
+        self.payload = None  # bytes de la última publicación
+        self.listeners = []
+        self.writes = 0
+        self.skips = 0
+    
+    def dumps(self, data, compact=None):
+        """Serializa a bytes UTF-8 con orjson si está instalado"""
+        compact = self.compact if compact is None else compact
+        if orjson is not None:
+            return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+        if compact:
+            text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        else:
+            text = json.dumps(data, ensure_ascii=False, indent=2)
+        return text.encode('utf-8')
+    
+    def hash_section(self, section):
+        canonical = json.dumps(section, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def load_previous(self):
+        """Recupera la última publicación del disco tras un reinicio"""
+        try:
+            with open(self.path, 'rb') as f:
+                payload = f.read()
+            section = json.loads(payload).get(self.key)
+        except (OSError, ValueError, AttributeError):
+            return
+        if isinstance(section, dict):
+            self.previous = section
+            self.digest = self.hash_section(section)
+            self.payload = payload
+    
+    @staticmethod
+    def pointer(*parts):
+        """JSON Pointer (RFC 6901) con ~ y / escapados"""
+        return ''.join('/' + str(part).replace('~', '~0').replace('/', '~1') for part in parts)
+    
+    def diff(self, old, new):
+        """Operaciones JSON Patch por fila entre dos versiones de la sección"""
+        old = old or {}
+        operations = []
+        for name in old:
+            if name not in new:
+                operations.append({'op': 'remove', 'path': self.pointer(self.key, name)})
+        for name, row in new.items():
+            if name not in old:
+                operations.append({'op': 'add', 'path': self.pointer(self.key, name), 'value': row})
+            elif old[name] != row:
+                operations.append({'op': 'replace', 'path': self.pointer(self.key, name), 'value': row})
+        return operations
+    
+    def touch(self):
+        """Renueva el mtime del archivo publicado: la tabla se confirmó sin cambios"""
+        try:
+            os.utime(self.path)
+        except OSError:
+            pass
+    
+    def verified_at(self):
+        """Época de la última verificación de la tabla publicada (mtime) o None"""
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+    
+    @staticmethod
+    def write_atomic(path, payload):
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def publish(self, data):
+        """Escribe data si su sección cambió; devuelve True si escribió"""
+        if self.digest is None:
+            self.load_previous()
+        
+        section = data.get(self.key, {})
+        digest = self.hash_section(section)
+        if digest == self.digest:
+            self.skips += 1
+            self.touch()
+            return False
+        
+        if self.patch_path:
+            patch = {
+                'from': self.digest,
+                'to': digest,
+                'last_update': data.get('last_update'),
+                'operations': self.diff(self.previous, section),
+            }
+            self.write_atomic(self.patch_path, self.dumps(patch, compact=True))
+        
+        payload = self.dumps(data)
+        self.write_atomic(self.path, payload)
+        self.digest = digest
+        self.previous = section
+        self.payload = payload
+        self.writes += 1
+        
+        for listener in self.listeners:
+            try:
+                listener(payload, digest)
+            except Exception as e:
+                logger.error(f"Error notificando la publicación: {e}")
+        return True
+
+
+class SnapshotStore:
+    """Historial de la tabla en SQLite: sólo guarda las filas que cambian
+    
+    Cada actualización compara la fila de cada equipo con la última guardada
+    y añade únicamente las distintas, con clave primaria (team, ts). Así
+    "tabla a la hora T" son 18 búsquedas por índice (la última fila de cada
+    equipo con ts <= T) y la trayectoria de un equipo es un rango del mismo
+    índice, aunque haya actualizaciones cada minuto durante toda la temporada.
+    La base se abre al primer uso.
+    """
+    
+    FIELDS = ('position', 'points', 'games', 'wins', 'draws', 'losses', 'goal_diff', 'source')
+    
+    def __init__(self, path='liga_mx_historial.db'):
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+        self._last = {}  # equipo -> última fila guardada
+    
+    def _connect(self):
+        if self._db is not None:
+            return self._db
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS teams (team TEXT PRIMARY KEY);"
+            "CREATE TABLE IF NOT EXISTS updates ("
+            "ts REAL PRIMARY KEY, changed INTEGER, sources TEXT);"
+            "CREATE TABLE IF NOT EXISTS standings ("
+            "team TEXT NOT NULL, ts REAL NOT NULL, position INTEGER, points INTEGER, "
+            "games INTEGER, wins INTEGER, draws INTEGER, losses INTEGER, "
+            "goal_diff INTEGER, source TEXT, PRIMARY KEY (team, ts)) WITHOUT ROWID;"
+        )
+        self._db.commit()
+        
+        # Última fila conocida de cada equipo, para comparar sin consultar
+        for row in self._latest_rows(float('inf')):
+            self._last[row[0]] = tuple(row[2:])
+        return self._db
+    
+    @staticmethod
+    def to_epoch(moment):
+        if moment is None:
+            return time.time()
+        if isinstance(moment, datetime):
+            return moment.timestamp()
+        return float(moment)
+    
+    def _latest_rows(self, ts):
+        # CROSS JOIN fija el orden: una búsqueda por índice para cada equipo
+        return self._db.execute(
+            "SELECT s.team, s.ts, s.position, s.points, s.games, s.wins, s.draws, "
+            "s.losses, s.goal_diff, s.source FROM teams t CROSS JOIN standings s "
+            "ON s.team = t.team AND s.ts = ("
+            "SELECT ts FROM standings WHERE team = t.team AND ts <= ? "
+            "ORDER BY ts DESC LIMIT 1)",
+            (ts,)
+        ).fetchall()
+    
+    def record(self, standings, moment=None, sources=()):
+        """Guarda las filas (TeamStanding) que cambiaron; devuelve cuántas"""
+        ts = self.to_epoch(moment)
+        with self._lock:
+            db = self._connect()
+            changed = []
+            for standing in standings:
+                row = tuple(getattr(standing, field) for field in self.FIELDS)
+                if self._last.get(standing.team) != row:
+                    changed.append((standing.team, ts) + row)
+            
+            if not changed:
+                return 0
+            
+            with db:
+                db.executemany("INSERT OR IGNORE INTO teams VALUES (?)",
+                               [(row[0],) for row in changed])
+                db.executemany(
+                    "INSERT OR REPLACE INTO standings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    changed
+                )
+                db.execute("INSERT OR REPLACE INTO updates VALUES (?, ?, ?)",
+                           (ts, len(changed), ','.join(sources)))
+            for row in changed:
+                self._last[row[0]] = row[2:]
+            return len(changed)
+    
+    def table_as_of(self, moment=None):
+        """Tabla vigente en el instante dado, como TeamStanding ordenados"""
+        ts = self.to_epoch(moment)
+        with self._lock:
+            self._connect()
+            rows = self._latest_rows(ts)
+        table = [TeamStanding(row[2], row[0], *row[3:]) for row in rows]
+        table.sort(key=TeamStanding.sort_key)
+        return table
+    
+    def last_update(self):
+        """Instante (datetime) de la última actualización guardada, o None"""
+        with self._lock:
+            self._connect()
+            row = self._db.execute("SELECT MAX(ts) FROM updates").fetchone()
+        return datetime.fromtimestamp(row[0]) if row[0] is not None else None
+    
+    def trajectory(self, team, field='points', start=None, end=None):
+        """Lista de (datetime, valor) con cada cambio del campo para un equipo"""
+        if field not in self.FIELDS:
+            raise ValueError(f"Campo desconocido: {field}")
+        start = 0.0 if start is None else self.to_epoch(start)
+        end = float('inf') if end is None else self.to_epoch(end)
+        with self._lock:
+            self._connect()
+            # Valor vigente al inicio del rango y luego cada fila dentro de él
+            rows = self._db.execute(
+                f"SELECT ts, {field} FROM ("
+                f"SELECT ts, {field} FROM standings WHERE team = ? AND ts <= ? "
+                f"ORDER BY ts DESC LIMIT 1) "
+                f"UNION SELECT ts, {field} FROM standings WHERE team = ? AND ts > ? AND ts <= ? "
+                f"ORDER BY ts",
+                (team, start, team, start, end)
+            ).fetchall()
+        
+        points = []
+        for ts, value in rows:
+            # Otras columnas también generan filas; sólo interesan los cambios del campo
+            if not points or points[-1][1] != value:
+                points.append((datetime.fromtimestamp(ts), value))
+        return points
+    
+    def updates(self, start=None, end=None):
+        """Instantes en que cambió la tabla, con el número de filas cambiadas"""
+        start = 0.0 if start is None else self.to_epoch(start)
+        end = float('inf') if end is None else self.to_epoch(end)
+        with self._lock:
+            self._connect()
+            rows = self._db.execute(
+                "SELECT ts, changed FROM updates WHERE ts >= ? AND ts <= ? ORDER BY ts",
+                (start, end)
+            ).fetchall()
+        return [(datetime.fromtimestamp(ts), changed) for ts, changed in rows]
+    
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+                self._last = {}
+
+
+class StandingsServer:
+    """API HTTP de sólo lectura que sirve la última tabla desde memoria
+    
+    Corre en su propio hilo y event loop, así miles de lectores no compiten
+    con el hilo de scraping. Cada publicación se prepara una sola vez (JSON,
+    versión gzip y evento SSE) y las peticiones sólo copian esos bytes.
+    
+    Rutas:
+        GET /standings         tabla completa; ETag/If-None-Match y gzip
+        GET /standings/poll    long-poll: espera a que cambie el ETag dado
+        GET /standings/events  Server-Sent Events con cada tabla nueva
+        GET /health            estado y contadores
+        GET /metrics           métricas en formato Prometheus (si se pasó metrics)
+    
+    Las respuestas de la tabla llevan Age (segundos desde la última
+    confirmación por una fuente real, ver set_freshness) y X-Stale: true
+    mientras se sirve una tabla que no se pudo refrescar.
+    """
+    
+    STATUS = {200: 'OK', 304: 'Not Modified', 404: 'Not Found',
+              405: 'Method Not Allowed', 503: 'Service Unavailable'}
+    
+    def __init__(self, host='127.0.0.1', port=8080, poll_timeout=30.0, keepalive=15.0, metrics=None):
+        self.host = host
+        self.port = port
+        self.metrics = metrics
+        self.poll_timeout = poll_timeout
+        self.keepalive = keepalive  # segundos entre comentarios SSE para mantener la conexión
+        self.loop = None
+        self._thread = None
+        self._server = None
+        self._snapshot = None
+        self._changed = None  # future que se resuelve en la próxima publicación
+        self._connections = set()
+        self.verified = None  # época de la última confirmación de la tabla servida
+        self.stale = False
+        
+        self.requests = 0
+        self.not_modified = 0
+        self.subscribers = 0
+        self.publishes = 0
+    
+    @staticmethod
+    def build_snapshot(payload, digest):
+        """Bytes listos para servir: cuerpo, gzip y evento SSE"""
+        etag = f'"{digest}"'
+        data = b''.join(b'data: ' + line + b'\n' for line in payload.splitlines())
+        return {
+            'etag': etag,
+            'body': payload,
+            'gzip': gzip.compress(payload, compresslevel=6),
+            'event': f'id: {digest}\nevent: standings\n'.encode() + data + b'\n',
+        }
+    
+    def publish(self, payload, digest):
+        """Sustituye la tabla servida; seguro desde cualquier hilo"""
+        snapshot = self.build_snapshot(payload, digest)
+        if self.loop is None:
+            self._snapshot = snapshot
+        else:
+            self.loop.call_soon_threadsafe(self._swap, snapshot)
+    
+    def set_freshness(self, verified, stale=False):
+        """Edad y marca de tabla vieja de lo que se sirve; seguro desde cualquier hilo"""
+        self.verified = verified
+        self.stale = stale
+    
+    def freshness_headers(self):
+        if self.verified is None:
+            return []
+        age = max(0, int(time.time() - self.verified))
+        return [('Age', str(age)), ('X-Stale', 'true' if self.stale else 'false')]
+    
+    def _swap(self, snapshot):
+        self._snapshot = snapshot
+        self.publishes += 1
+        changed, self._changed = self._changed, self.loop.create_future()
+        changed.set_result(snapshot)
+    
+    def start(self):
+        """Arranca el servidor en un hilo de fondo y espera a que escuche"""
+        ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+        
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self._changed = self.loop.create_future()
+            self._server = self.loop.run_until_complete(asyncio.start_server(
+                self._handle, self.host, self.port, backlog=4096
+            ))
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+        
+        self._thread = threading.Thread(target=run, name='standings-api', daemon=True)
+        self._thread.start()
+        ready.wait()
+        logger.info(f"🌐 API de posiciones en http://{self.host}:{self.port}/standings")
+        return self
+    
+    def stop(self):
+        if self.loop is None:
+            return
+        
+        async def close():
+            self._server.close()
+            self._changed.cancel()  # despierta a los suscriptores SSE y long-poll
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self.loop.close()
+        self.loop = None
+    
+    async def _handle(self, reader, writer):
+        """Atiende una conexión keep-alive hasta que el cliente la cierre"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                
+                self.requests += 1
+                keep_alive = await self._route(method, target, headers, writer)
+                if not keep_alive or headers.get('connection', '').lower() == 'close' \
+                        or version == 'HTTP/1.0':
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+    
+    def _write(self, writer, status, headers=(), body=b'', head_only=False):
+        lines = [f'HTTP/1.1 {status} {self.STATUS[status]}']
+        lines.extend(f'{name}: {value}' for name, value in headers)
+        lines.append(f'Content-Length: {len(body)}')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if body and not head_only:
+            writer.write(body)
+    
+    def _matches(self, headers, query):
+        etag = headers.get('if-none-match') or query.get('etag', [None])[0]
+        if not etag or self._snapshot is None:
+            return False
+        current = self._snapshot['etag']
+        return etag == '*' or current in etag or f'"{etag}"' == current
+    
+    def _write_standings(self, writer, headers, head_only=False):
+        snapshot = self._snapshot
+        common = [('ETag', snapshot['etag']), ('Cache-Control', 'no-cache'),
+                  ('Vary', 'Accept-Encoding')] + self.freshness_headers()
+        if 'gzip' in headers.get('accept-encoding', ''):
+            self._write(writer, 200, common + [('Content-Type', 'application/json; charset=utf-8'),
+                                               ('Content-Encoding', 'gzip')],
+                        snapshot['gzip'], head_only)
+        else:
+            self._write(writer, 200, common + [('Content-Type', 'application/json; charset=utf-8')],
+                        snapshot['body'], head_only)
+    
+    async def _route(self, method, target, headers, writer):
+        """Responde una petición; devuelve False si la conexión debe cerrarse"""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        path = url.path.rstrip('/') or '/'
+        
+        if method not in ('GET', 'HEAD'):
+            self._write(writer, 405, [('Allow', 'GET, HEAD')])
+        elif path == '/health':
+            body = json.dumps({
+                'ready': self._snapshot is not None,
+                'etag': self._snapshot['etag'] if self._snapshot else None,
+                'stale': self.stale,
+                'age_seconds': int(time.time() - self.verified) if self.verified else None,
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'subscribers': self.subscribers,
+                'publishes': self.publishes,
+            }).encode()
+            self._write(writer, 200, [('Content-Type', 'application/json')], body, method == 'HEAD')
+        elif path == '/metrics' and self.metrics is not None:
+            body = self.metrics.render_prometheus().encode()
+            self._write(writer, 200, [('Content-Type', 'text/plain; version=0.0.4')], body,
+                        method == 'HEAD')
+        elif path not in ('/', '/standings', '/standings/poll', '/standings/events'):
+            self._write(writer, 404)
+        elif path == '/standings/events':
+            await self._stream_events(headers, writer)
+            return False
+        elif self._snapshot is None:
+            self._write(writer, 503, [('Retry-After', '5')])
+        else:
+            if path == '/standings/poll' and self._matches(headers, query):
+                # Sin cambios todavía: esperar la siguiente publicación o el tiempo límite
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._changed), self.poll_timeout)
+                except (asyncio.TimeoutError, asyncio.CancelledError):
+                    pass
+            
+            if self._matches(headers, query):
+                self.not_modified += 1
+                self._write(writer, 304, [('ETag', self._snapshot['etag'])] + self.freshness_headers())
+            else:
+                self._write_standings(writer, headers, method == 'HEAD')
+        
+        await writer.drain()
+        return True
+    
+    async def _stream_events(self, headers, writer):
+        """Envía la tabla actual y luego una por publicación hasta que el cliente se vaya"""
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                     b'Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n')
+        self.subscribers += 1
+        try:
+            snapshot = self._snapshot
+            if snapshot and headers.get('last-event-id') != snapshot['etag'].strip('"'):
+                writer.write(snapshot['event'])
+            await writer.drain()
+            
+            while True:
+                try:
+                    snapshot = await asyncio.wait_for(asyncio.shield(self._changed), self.keepalive)
+                    writer.write(snapshot['event'])
+                except asyncio.TimeoutError:
+                    writer.write(b': keepalive\n\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers -= 1
+
+
+TEAM_ALIASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'team_aliases.json')
+
+# Alias mínimos por si falta el archivo de datos; team_aliases.json los amplía
+DEFAULT_TEAM_ALIASES = {
+    'Club América': ['América'],
+    'Cruz Azul': ['Cruz Azul'],
+    'Guadalajara': ['Chivas', 'Guadalajara'],
+    'Pumas UNAM': ['Pumas'],
+    'Tigres UANL': ['Tigres'],
+    'Monterrey': ['Monterrey'],
+    'Santos Laguna': ['Santos'],
+    'Toluca': ['Toluca'],
+    'León': ['León'],
+    'Atlas': ['Atlas'],
+    'Necaxa': ['Necaxa'],
+    'Puebla': ['Puebla'],
+    'Pachuca': ['Pachuca'],
+    'Tijuana': ['Tijuana'],
+    'Mazatlán FC': ['Mazatlán'],
+    'Querétaro': ['Querétaro'],
+    'Juárez': ['Juárez'],
+    'Atlético San Luis': ['Atlético San Luis', 'San Luis'],
+}
+
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+# Palabras que identifican a otro club de la misma familia (filiales, fuerzas
+# básicas): con una de ellas fuera del alias no se acepta la coincidencia por
+# palabras ('Pumas Tabasco' no es 'Pumas UNAM')
+FUZZY_STOP_TOKENS = frozenset({
+    'tabasco', 'premier', 'reserva', 'reservas', 'sub', 'u17', 'u19', 'u20', 'u21', 'u23',
+})
+
+
+def fold_text(text):
+    """Minúsculas sin acentos ni puntuación: 'Atl. San Luís' -> 'atl san luis'"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(NON_ALNUM_RE.sub(' ', text).split())
+
+
+class TeamNameNormalizer:
+    """Normalizador de nombres de equipos compilado una sola vez
+    
+    Busca primero el alias exacto (ya sin acentos ni puntuación), luego la
+    abreviatura en mayúsculas pegada a un alias completo ('AMEAmérica') y por
+    último la secuencia de palabras completas de alias más larga dentro del
+    nombre ('Club Santos Laguna', 'Tigres de la UANL'). Sólo cuentan palabras
+    enteras, así que 'Leones Negros' no es 'León'; los alias de menos de
+    min_tokens palabras no entran en esa búsqueda y una palabra de
+    stop_tokens fuera del alias la anula ('Pumas Tabasco'). Un nombre
+    desconocido se devuelve tal cual. Los resultados se memorizan por nombre
+    crudo.
+    """
+    
+    def __init__(self, aliases, cache_size=1024, min_tokens=1, stop_tokens=FUZZY_STOP_TOKENS):
+        self.canonical = list(aliases)
+        self.stop_tokens = frozenset(stop_tokens)
+        self.exact = {}
+        for canonical, names in aliases.items():
+            for alias in (canonical, *names):
+                key = fold_text(alias)
+                if key:
+                    self.exact[key] = canonical
+        
+        # Índice por primera palabra, con los alias más largos primero
+        self.token_index = {}
+        for key, canonical in self.exact.items():
+            tokens = tuple(key.split())
+            if len(tokens) >= min_tokens:
+                self.token_index.setdefault(tokens[0], []).append((tokens, canonical))
+        for entries in self.token_index.values():
+            entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+    
+    @classmethod
+    def from_file(cls, path=TEAM_ALIASES_FILE, **kwargs):
+        """Combina los alias por defecto con los de un archivo JSON {canónico: [alias]}"""
+        aliases = {canonical: list(names) for canonical, names in DEFAULT_TEAM_ALIASES.items()}
+        try:
+            with open(path, encoding='utf-8') as f:
+                loaded = json.load(f)
+        except FileNotFoundError:
+            loaded = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ No se pudo leer {path}: {e}; se usan los alias por defecto")
+            loaded = {}
+        for canonical, names in loaded.items():
+            aliases.setdefault(canonical, []).extend(names)
+        return cls(aliases, **kwargs)
+    
+    def match(self, key):
+        """Nombre canónico para un texto ya plegado, o None"""
+        return self.exact.get(key)
+    
+    def match_tokens(self, key):
+        """Nombre canónico del alias de más palabras contenido en key, o None"""
+        tokens = key.split()
+        best, best_span = None, None
+        for i, token in enumerate(tokens):
+            for alias_tokens, alias_canonical in self.token_index.get(token, ()):
+                size = len(alias_tokens)
+                if best_span is not None and size <= best_span[1] - best_span[0]:
+                    break
+                if tuple(tokens[i:i + size]) == alias_tokens:
+                    best, best_span = alias_canonical, (i, i + size)
+                    break
+        if best is None:
+            return None
+        rest = tokens[:best_span[0]] + tokens[best_span[1]:]
+        if self.stop_tokens.intersection(rest):
+            return None
+        return best
+    
+    def match_abbreviated(self, name):
+        """Nombre canónico para 'AMEAmérica': abreviatura de 2 a 4 mayúsculas y un alias exacto"""
+        for size in range(2, min(4, len(name) - 1) + 1):
+            prefix = name[:size]
+            if not (prefix.isalpha() and prefix.isupper()):
+                break
+            canonical = self.match(fold_text(name[size:]))
+            if canonical:
+                return canonical
+        return None
+    
+    def _normalize(self, name):
+        if not name:
+            return "Equipo Desconocido"
+        name = name.strip()
+        key = fold_text(name)
+        return self.match(key) or self.match_abbreviated(name) or self.match_tokens(key) or name
+    
+    def cache_info(self):
+        return self.normalize.cache_info()
+
+
+TEAM_NORMALIZER = TeamNameNormalizer.from_file()
+
+
+class SourceHealth:
+    """Disyuntor (cerrado / abierto / semiabierto) y salud reciente de una fuente
+    
+    Tras failure_threshold fallos seguidos el circuito se abre y la fuente se
+    omite sin costo durante cooldown segundos; luego pasa a semiabierto y deja
+    pasar una sola prueba de un intento. Si la prueba falla vuelve a abrirse
+    con el doble de espera (hasta max_cooldown); si sale bien se cierra.
+    
+    score() combina, sobre las últimas window consultas, la tasa de éxito, la
+    proporción de tablas válidas y el p95 de latencia, y ordena las fuentes.
+    """
+    
+    def __init__(self, name, failure_threshold=3, cooldown=60.0, max_cooldown=1800.0,
+                 window=20, latency_target=5.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.latency_target = latency_target
+        self.samples = deque(maxlen=window)  # (respondió, latencia, tabla válida)
+        self._lock = threading.Lock()
+        
+        self.state = 'closed'
+        self.failures = 0  # fallos consecutivos
+        self.cooldown = cooldown
+        self.opened_at = None
+        self.probing = False
+        self.trips = 0
+        self.skipped = 0
+    
+    def allow(self):
+        """True si se puede consultar ahora; en semiabierto reserva la única prueba"""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    self.skipped += 1
+                    return False
+                self.state = 'half_open'
+                self.probing = False
+            if self.probing:
+                self.skipped += 1
+                return False
+            self.probing = True
+            return True
+    
+    def retries(self, default=3):
+        """La prueba en semiabierto es de un solo intento"""
+        return 1 if self.state == 'half_open' else default
+    
+    def release(self):
+        """Libera la prueba sin contarla (consulta cancelada)"""
+        with self._lock:
+            self.probing = False
+    
+    def retry_in(self):
+        if self.state != 'open':
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+    
+    def record(self, ok, latency=None, valid=False):
+        with self._lock:
+            self.samples.append((ok, latency, valid))
+            self.probing = False
+            if ok and valid:
+                if self.state != 'closed':
+                    logger.info(f"✅ {self.name}: circuito cerrado de nuevo")
+                self.state = 'closed'
+                self.failures = 0
+                self.cooldown = self.base_cooldown
+                return
+            
+            self.failures += 1
+            if self.state == 'half_open':
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._trip()
+            elif self.state == 'closed' and self.failures >= self.failure_threshold:
+                self._trip()
+    
+    def _trip(self):
+        self.state = 'open'
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        logger.warning(f"⛔ {self.name}: circuito abierto por {self.cooldown:.0f}s "
+                       f"tras {self.failures} fallos")
+    
+    def latency_p95(self):
+        latencies = sorted(latency for ok, latency, _ in self.samples if ok and latency is not None)
+        if not latencies:
+            return None
+        return latencies[int(0.95 * (len(latencies) - 1))]
+    
+    def score(self):
+        """0..1: éxito × validez × factor de latencia; 0.5 sin historial"""
+        with self._lock:
+            samples = list(self.samples)
+        if not samples:
+            return 0.5
+        responded = sum(1 for ok, _, _ in samples if ok)
+        if not responded:
+            return 0.0
+        valid = sum(1 for ok, _, is_valid in samples if ok and is_valid)
+        p95 = self.latency_p95() or 0.0
+        return (responded / len(samples)) * (valid / responded) / (1 + p95 / self.latency_target)
+    
+    def metrics(self):
+        return {
+            'state': self.state,
+            'score': round(self.score(), 3),
+            'failures': self.failures,
+            'trips': self.trips,
+            'skipped': self.skipped,
+            'retry_in': round(self.retry_in(), 1),
+            'latency_p95': self.latency_p95(),
+        }
+
+
+CALENDAR_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calendario.json')
+
+
+class PollingPolicy:
+    """Intervalo de sondeo adaptativo según el calendario y los cambios recientes
+    
+    - Dentro de una ventana de partido (desde window_lead antes del inicio
+      hasta match_duration después) se sondea cada live_interval.
+    - Si el último ciclo trajo cambios se vuelve a base_interval.
+    - Con la tabla estable el intervalo se multiplica por backoff en cada
+      ciclo hasta max_interval, pero nunca se duerme más allá del inicio de
+      la siguiente ventana.
+    Las decisiones quedan en metrics().
+    """
+    
+    def __init__(self, fixtures=(), live_interval=15.0, base_interval=60.0, max_interval=3600.0,
+                 backoff=2.0, window_lead=timedelta(minutes=15),
+                 match_duration=timedelta(minutes=120)):
+        self.live_interval = live_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.window_lead = window_lead
+        self.match_duration = match_duration
+        self.windows = self.build_windows(fixtures)
+        self._starts = [start for start, _ in self.windows]
+        
+        self.interval = base_interval
+        self.reason = 'inicio'
+        self.stable_cycles = 0
+        self.decisions = {}
+        self.changes_seen = 0
+    
+    @classmethod
+    def from_file(cls, path=CALENDAR_FILE, **kwargs):
+        """Carga los partidos de un JSON {"matches": [{"home", "away", "kickoff"}]}"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                matches = json.load(f).get('matches', [])
+        except FileNotFoundError:
+            matches = []
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"⚠️ No se pudo leer el calendario {path}: {e}")
+            matches = []
+        
+        fixtures = []
+        for match in matches:
+            try:
+                fixtures.append(cls.as_aware(datetime.fromisoformat(match['kickoff'])))
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"⚠️ Partido sin hora de inicio válida: {match}")
+        return cls(fixtures, **kwargs)
+    
+    @staticmethod
+    def as_aware(moment):
+        """Las horas sin zona se interpretan en la hora local"""
+        return moment if moment.tzinfo else moment.astimezone()
+    
+    def build_windows(self, kickoffs):
+        """Ventanas (inicio, fin) ordenadas, fusionando las que se solapan"""
+        windows = []
+        for kickoff in sorted(self.as_aware(k) for k in kickoffs):
+            start, end = kickoff - self.window_lead, kickoff + self.match_duration
+            if windows and start <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+            else:
+                windows.append((start, end))
+        return windows
+    
+    def active_window(self, now):
+        i = bisect.bisect_right(self._starts, now) - 1
+        if i >= 0 and now <= self.windows[i][1]:
+            return self.windows[i]
+        return None
+    
+    def next_window_start(self, now):
+        i = bisect.bisect_right(self._starts, now)
+        return self._starts[i] if i < len(self._starts) else None
+    
+    def next_interval(self, now=None, changed=False):
+        """Segundos hasta el próximo sondeo tras un ciclo (changed: la tabla cambió)"""
+        now = self.as_aware(now or datetime.now())
+        if changed:
+            self.changes_seen += 1
+        
+        if self.active_window(now):
+            interval, reason = self.live_interval, 'partido'
+            self.stable_cycles = 0
+        elif changed:
+            interval, reason = self.base_interval, 'cambios'
+            self.stable_cycles = 0
+        else:
+            self.stable_cycles += 1
+            interval = min(self.max_interval, self.base_interval * self.backoff ** self.stable_cycles)
+            reason = 'estable'
+            upcoming = self.next_window_start(now)
+            if upcoming is not None:
+                until = (upcoming - now).total_seconds()
+                if until < interval:
+                    interval, reason = max(self.live_interval, until), 'ventana próxima'
+        
+        self.interval = interval
+        self.reason = reason
+        self.decisions[reason] = self.decisions.get(reason, 0) + 1
+        return interval
+    
+    def metrics(self):
+        upcoming = self.next_window_start(self.as_aware(datetime.now()))
+        return {
+            'interval': self.interval,
+            'reason': self.reason,
+            'stable_cycles': self.stable_cycles,
+            'changes_seen': self.changes_seen,
+            'decisions': dict(self.decisions),
+            'windows': len(self.windows),
+            'next_window': upcoming.isoformat() if upcoming else None,
+        }
+
+
+class StalenessPolicy:
+    """Qué servir cuando no se puede refrescar: la última tabla real o la demostración
+    
+    La edad es el tiempo desde la última vez que una fuente real confirmó la
+    tabla (en este proceso, o el mtime del JSON publicado tras un reinicio).
+    Mientras no pase de max_staleness se sigue sirviendo la última tabla
+    real, marcada como vieja; después, o si nunca hubo datos reales, se usan
+    los datos de demostración (demo_fallback=True) o no se publica nada.
+    max_staleness=None no caduca nunca; 0 reproduce el comportamiento
+    anterior (demostración en cuanto fallan todas las fuentes).
+    """
+    
+    def __init__(self, max_staleness=86400.0, demo_fallback=True):
+        self.max_staleness = max_staleness
+        self.demo_fallback = demo_fallback
+    
+    def usable(self, age):
+        """La tabla real con esta edad (segundos, None si no hay) todavía puede servirse"""
+        if age is None:
+            return False
+        return self.max_staleness is None or age <= self.max_staleness
+    
+    def fallback(self, age):
+        """'last' (conservar la última tabla real), 'demo' o None (no publicar nada)"""
+        if self.usable(age):
+            return 'last'
+        return 'demo' if self.demo_fallback else None
+
+
+def format_age(seconds):
+    """Edad legible: '45 s', '12 min', '3 h 05 min', '2 d 4 h'"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes = seconds // 60
+    if minutes < 60:
+        return f"{minutes} min"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours} h {minutes:02d} min"
+    days, hours = divmod(hours, 24)
+    return f"{days} d {hours} h"
+
+
+class StandingsEngine:
+    """Tabla de posiciones calculada a partir de los resultados de los partidos
+    
+    Por equipo guarda [PJ, G, E, P, GF, GC, GF de visitante]; los puntos son
+    3·G + E. Un resultado nuevo (o corregido: mismo match_id) sólo toca a los
+    dos equipos del partido: se restan los goles anteriores, se suman los
+    nuevos y se reubican en una lista ordenada por (puntos, DG, GF) con
+    bisect, sin recalcular la temporada. replay() reconstruye todo de golpe
+    con numpy (bincount por equipo) para repasar temporadas completas.
+    
+    Desempates de Liga MX tras los puntos: diferencia de goles, goles a
+    favor, marcadores particulares entre los empatados (puntos, diferencia y
+    goles en sus partidos entre sí), goles como visitante y, en lugar del
+    cociente, fair play y sorteo (datos que aquí no existen), el nombre.
+    Los particulares se resuelven sólo dentro de cada grupo empatado al
+    leer la tabla.
+    """
+    
+    FIELDS = ('games', 'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'away_goals')
+    
+    def __init__(self, normalize=None, use_numpy=None):
+        self.normalize = normalize or TEAM_NORMALIZER.normalize
+        self.use_numpy = np is not None if use_numpy is None else use_numpy and np is not None
+        self.reset()
+    
+    def reset(self):
+        self.stats = {}  # equipo -> [PJ, G, E, P, GF, GC, GF visitante]
+        self.matches = {}  # match_id -> (local, visitante, goles local, goles visitante)
+        self.team_matches = {}  # equipo -> match_ids, para los particulares
+        self._order = []  # claves (-pts, -dg, -gf, equipo) ordenadas
+        self._table = None
+    
+    @classmethod
+    def from_file(cls, path=CALENDAR_FILE, **kwargs):
+        """Resultados de un JSON {"matches": [{"home", "away", "home_goals", "away_goals"}]}
+        
+        Es el formato del calendario: los partidos sin marcador aún no se jugaron.
+        """
+        engine = cls(**kwargs)
+        try:
+            with open(path, encoding='utf-8') as f:
+                matches = json.load(f).get('matches', [])
+        except FileNotFoundError:
+            matches = []
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"⚠️ No se pudieron leer los resultados de {path}: {e}")
+            matches = []
+        
+        played = [
+            (match.get('id'), match['home'], match['away'], match['home_goals'], match['away_goals'])
+            for match in matches
+            if match.get('home_goals') is not None and match.get('away_goals') is not None
+        ]
+        engine.replay(played)
+        return engine
+    
+    @staticmethod
+    def match_key(home, away):
+        # Liga MX juega una vuelta por torneo: local y visitante identifican el partido
+        return f'{home}|{away}'
+    
+    def _key(self, team):
+        games, wins, draws, losses, goals_for, goals_against, away_goals = self.stats[team]
+        return (-(3 * wins + draws), goals_against - goals_for, -goals_for, team)
+    
+    def _accumulate(self, home, away, home_goals, away_goals, sign):
+        home_stats = self.stats.setdefault(home, [0] * len(self.FIELDS))
+        away_stats = self.stats.setdefault(away, [0] * len(self.FIELDS))
+        outcome = (home_goals > away_goals) - (home_goals < away_goals)
+        for stats, scored, conceded, result in ((home_stats, home_goals, away_goals, outcome),
+                                                 (away_stats, away_goals, home_goals, -outcome)):
+            stats[0] += sign
+            stats[1 + (1 - result)] += sign  # G, E o P según el resultado
+            stats[4] += sign * scored
+            stats[5] += sign * conceded
+        away_stats[6] += sign * away_goals
+    
+    def apply(self, home, away, home_goals, away_goals, match_id=None):
+        """Registra o corrige un resultado; devuelve los equipos afectados"""
+        home, away = self.normalize(home), self.normalize(away)
+        home_goals, away_goals = int(home_goals), int(away_goals)
+        match_id = match_id or self.match_key(home, away)
+        result = (home, away, home_goals, away_goals)
+        previous = self.matches.get(match_id)
+        if previous == result:
+            return set()
+        
+        affected = {home, away} | (set(previous[:2]) if previous else set())
+        self._unindex(affected)
+        if previous:
+            self._accumulate(*previous, -1)
+            for team in previous[:2]:
+                self.team_matches[team].discard(match_id)
+        self._accumulate(*result, 1)
+        self.matches[match_id] = result
+        for team in (home, away):
+            self.team_matches.setdefault(team, set()).add(match_id)
+        self._index(affected)
+        return affected
+    
+    def remove(self, match_id):
+        """Anula un resultado (p. ej. un partido que se repetirá)"""
+        previous = self.matches.pop(match_id, None)
+        if previous is None:
+            return set()
+        affected = set(previous[:2])
+        self._unindex(affected)
+        self._accumulate(*previous, -1)
+        for team in affected:
+            self.team_matches[team].discard(match_id)
+        self._index(affected)
+        return affected
+    
+    def _unindex(self, teams):
+        for team in teams:
+            if team in self.stats:
+                key = self._key(team)
+                del self._order[bisect.bisect_left(self._order, key)]
+        self._table = None
+    
+    def _index(self, teams):
+        for team in teams:
+            bisect.insort(self._order, self._key(team))
+    
+    def replay(self, matches):
+        """Reconstruye la tabla con todos los resultados [(match_id, local, visitante, gl, gv)]"""
+        self.reset()
+        for match_id, home, away, home_goals, away_goals in matches:
+            home, away = self.normalize(home), self.normalize(away)
+            match_id = match_id or self.match_key(home, away)
+            self.matches[match_id] = (home, away, int(home_goals), int(away_goals))
+        
+        if self.use_numpy and self.matches:
+            self._replay_numpy()
+        else:
+            for result in self.matches.values():
+                self._accumulate(*result, 1)
+        
+        for match_id, (home, away, _, _) in self.matches.items():
+            self.team_matches.setdefault(home, set()).add(match_id)
+            self.team_matches.setdefault(away, set()).add(match_id)
+        self._order = sorted(self._key(team) for team in self.stats)
+        self._table = None
+    
+    def _replay_numpy(self):
+        results = list(self.matches.values())
+        teams = sorted({team for result in results for team in result[:2]})
+        index = {team: i for i, team in enumerate(teams)}
+        home = np.fromiter((index[r[0]] for r in results), dtype=np.intp, count=len(results))
+        away = np.fromiter((index[r[1]] for r in results), dtype=np.intp, count=len(results))
+        home_goals = np.fromiter((r[2] for r in results), dtype=np.int64, count=len(results))
+        away_goals = np.fromiter((r[3] for r in results), dtype=np.int64, count=len(results))
+        
+        size = len(teams)
+        
+        def per_team(weights_home, weights_away):
+            return (np.bincount(home, weights_home, size) + np.bincount(away, weights_away, size))
+        
+        home_win = home_goals > away_goals
+        away_win = home_goals < away_goals
+        draw = ~(home_win | away_win)
+        columns = np.stack([
+            per_team(None, None),
+            per_team(home_win, away_win),
+            per_team(draw, draw),
+            per_team(away_win, home_win),
+            per_team(home_goals, away_goals),
+            per_team(away_goals, home_goals),
+            np.bincount(away, away_goals, size),
+        ], axis=1).astype(np.int64)
+        self.stats = {team: row for team, row in zip(teams, columns.tolist())}
+    
+    def head_to_head(self, group):
+        """Mini tabla (puntos, DG, GF) con sólo los partidos entre los equipos del grupo"""
+        members = set(group)
+        table = {team: [0, 0, 0] for team in group}
+        seen = set()
+        for team in group:
+            for match_id in self.team_matches.get(team, ()):
+                home, away, home_goals, away_goals = self.matches[match_id]
+                if match_id in seen or home not in members or away not in members:
+                    continue
+                seen.add(match_id)
+                for side, scored, conceded in ((home, home_goals, away_goals),
+                                               (away, away_goals, home_goals)):
+                    table[side][0] += 3 if scored > conceded else scored == conceded
+                    table[side][1] += scored - conceded
+                    table[side][2] += scored
+        return table
+    
+    def ranking(self):
+        """Equipos en orden de la tabla aplicando los desempates de Liga MX"""
+        ordered = []
+        i = 0
+        while i < len(self._order):
+            j = i + 1
+            while j < len(self._order) and self._order[j][:3] == self._order[i][:3]:
+                j += 1
+            group = [key[3] for key in self._order[i:j]]
+            if len(group) > 1:
+                mini = self.head_to_head(group)
+                group.sort(key=lambda team: (-mini[team][0], -mini[team][1], -mini[team][2],
+                                             -self.stats[team][6], team))
+            ordered.extend(group)
+            i = j
+        return ordered
+    
+    def table(self, source='calculada'):
+        """Filas TeamStanding de la tabla calculada (se memorizan hasta el siguiente resultado)"""
+        if self._table is None or self._table[0] != source:
+            rows = []
+            for position, team in enumerate(self.ranking(), 1):
+                games, wins, draws, losses, goals_for, goals_against, _ = self.stats[team]
+                rows.append(TeamStanding(position, team, 3 * wins + draws, games, wins, draws,
+                                         losses, goals_for - goals_against, source))
+            self._table = (source, rows)
+        return list(self._table[1])
+    
+    def validate(self, standings, fields=('position',) + TeamStanding.INT_FIELDS):
+        """Compara filas scrapeadas (TeamStanding) con la tabla calculada
+        
+        Devuelve las discrepancias [{team, field, computed, scraped}]; un equipo
+        que no está en los resultados se reporta con field='team'.
+        """
+        computed = {standing.team: standing for standing in self.table()}
+        discrepancies = []
+        for standing in standings:
+            team = self.normalize(standing.team)
+            mine = computed.get(team)
+            if mine is None:
+                discrepancies.append({'team': team, 'field': 'team', 'computed': None,
+                                      'scraped': standing.team})
+                continue
+            for field in fields:
+                value, scraped = getattr(mine, field), getattr(standing, field)
+                if value != scraped:
+                    discrepancies.append({'team': team, 'field': field, 'computed': value,
+                                          'scraped': scraped})
+        return discrepancies
+
+
+def demo_results(teams, rounds=None, seed=2024):
+    """Resultados sintéticos reproducibles: todos contra todos por el método del círculo
+    
+    rounds limita las jornadas (por defecto una vuelta completa); los goles
+    siguen una Poisson con ventaja de local y la misma semilla da la misma
+    temporada. Devuelve [(match_id, local, visitante, gl, gv)].
+    """
+    rng = random.Random(seed)
+    
+    def goals(mean):
+        # Poisson por inversión: suficiente para datos de demostración
+        limit, k, p = math.exp(-mean), 0, rng.random()
+        while p > limit:
+            k += 1
+            p *= rng.random()
+        return k
+    
+    slots = list(teams) + ([None] if len(teams) % 2 else [])
+    total = len(slots) - 1 if rounds is None else rounds
+    results = []
+    for round_number in range(1, total + 1):
+        half = len(slots) // 2
+        for i in range(half):
+            home, away = slots[i], slots[-1 - i]
+            if home is None or away is None:
+                continue
+            if round_number % 2 == 0:
+                home, away = away, home
+            results.append((f'J{round_number}-{home}-{away}', home, away, goals(1.5), goals(1.1)))
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return results
+
+
+def _poisson_goals(rng, means, simulations, max_goals=12):
+    """Goles Poisson por inversión de la CDF sobre uniformes float32
+    
+    Varias veces más rápido que rng.poisson; la cola por encima de max_goals
+    (probabilidad < 1e-3 aun con medias de 4 goles) se acumula en max_goals.
+    """
+    pmf = np.exp(-means)
+    cdf = [pmf.copy()]
+    for k in range(1, max_goals):
+        pmf = pmf * means / k
+        cdf.append(cdf[-1] + pmf)
+    uniform = rng.random((simulations, len(means)), dtype=np.float32)
+    goals = np.zeros(uniform.shape, dtype=np.int8)
+    for threshold in np.asarray(cdf, dtype=np.float32):
+        goals += uniform > threshold
+    return goals
+
+
+def _simulate_chunk(base, home, away, lambda_home, lambda_away, simulations, seed):
+    """Worker de SeasonSimulator: simula un bloque de temporadas con su propia semilla
+    
+    base es (puntos, DG, GF) por equipo; devuelve la matriz equipo×posición
+    con los conteos del bloque y la suma de puntos finales por equipo.
+    """
+    rng = np.random.default_rng(seed)
+    teams = base.shape[1]
+    matches = len(home)
+    home_goals = _poisson_goals(rng, lambda_home, simulations)
+    away_goals = _poisson_goals(rng, lambda_away, simulations)
+    
+    # Incidencia partido→equipo: las sumas por equipo son productos de
+    # matrices en float32 (exactos para estos enteros)
+    home_of = np.zeros((matches, teams), dtype=np.float32)
+    away_of = np.zeros((matches, teams), dtype=np.float32)
+    home_of[np.arange(matches), home] = 1
+    away_of[np.arange(matches), away] = 1
+    
+    home_win = home_goals > away_goals
+    away_win = home_goals < away_goals
+    draw = (~(home_win | away_win)).astype(np.float32)
+    home_points = 3 * home_win.astype(np.float32) + draw
+    away_points = 3 * away_win.astype(np.float32) + draw
+    margin = (home_goals - away_goals).astype(np.float32)
+    points = base[0] + (home_points @ home_of + away_points @ away_of).astype(np.float64)
+    goal_diff = base[1] + (margin @ home_of - margin @ away_of).astype(np.float64)
+    goals_for = base[2] + (home_goals.astype(np.float32) @ home_of
+                           + away_goals.astype(np.float32) @ away_of).astype(np.float64)
+    
+    # Orden: puntos, DG, GF y, como sorteo, una fracción aleatoria
+    key = points * 1e7 + (goal_diff + 5000) * 1e3 + goals_for + rng.random((simulations, teams))
+    order = np.argsort(-key, axis=1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(teams)[None, :], axis=1)
+    counts = np.bincount((np.arange(teams)[None, :] * teams + ranks).ravel(), minlength=teams * teams)
+    return counts.reshape(teams, teams), points.sum(axis=0)
+
+
+class SeasonSimulator:
+    """Proyección Monte Carlo de la tabla final y de las probabilidades de liguilla
+    
+    Parte de la tabla actual (TeamStanding) y de los partidos pendientes y
+    simula el resto del torneo miles de veces. Los goles de cada partido son
+    Poisson con ventaja de local; la fuerza de cada equipo es su diferencia
+    de goles por partido encogida hacia cero con prior_games partidos
+    ficticios (un modelo simple, suficiente para ordenar probabilidades).
+    
+    Todo va vectorizado en numpy sobre las simulaciones; se reparten en
+    bloques de chunk_size con semillas derivadas de SeedSequence(seed), así
+    el resultado sólo depende de seed y no del número de procesos.
+    
+    Liga MX: posiciones 1-6 van directo a liguilla, 7-10 al play-in.
+    """
+    
+    HOME_GOALS = 1.5
+    AWAY_GOALS = 1.1
+    
+    def __init__(self, standings, fixtures, goals_for=None, strength=0.35, prior_games=3,
+                 liguilla=6, play_in=(7, 10), normalize=None):
+        if np is None:
+            raise RuntimeError("numpy no está instalado: pip install numpy")
+        normalize = normalize or TEAM_NORMALIZER.normalize
+        self.teams = [standing.team for standing in sorted(standings, key=TeamStanding.sort_key)]
+        self.liguilla = liguilla
+        self.play_in = play_in
+        index = {team: i for i, team in enumerate(self.teams)}
+        by_team = {standing.team: standing for standing in standings}
+        goals_for = goals_for or {}
+        self.base = np.array([
+            [by_team[team].points for team in self.teams],
+            [by_team[team].goal_diff for team in self.teams],
+            [goals_for.get(team, 0) for team in self.teams],
+        ], dtype=np.int64)
+        
+        self.fixtures = []
+        for home, away in fixtures:
+            home, away = normalize(home), normalize(away)
+            if home in index and away in index:
+                self.fixtures.append((home, away))
+            else:
+                logger.warning(f"⚠️ Partido pendiente con equipo fuera de la tabla: {home} - {away}")
+        self.home = np.array([index[home] for home, _ in self.fixtures], dtype=np.intp)
+        self.away = np.array([index[away] for _, away in self.fixtures], dtype=np.intp)
+        
+        games = np.array([by_team[team].games for team in self.teams], dtype=np.float64)
+        rating = self.base[1] / (games + prior_games)
+        edge = strength * (rating[self.home] - rating[self.away])
+        self.lambda_home = self.HOME_GOALS * np.exp(edge)
+        self.lambda_away = self.AWAY_GOALS * np.exp(-edge)
+    
+    @staticmethod
+    def remaining_fixtures(path=CALENDAR_FILE):
+        """Partidos sin marcador del archivo de calendario: [(local, visitante)]"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                matches = json.load(f).get('matches', [])
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"⚠️ No se pudo leer el calendario {path}: {e}")
+            return []
+        return [
+            (match['home'], match['away'])
+            for match in matches
+            if match.get('home_goals') is None or match.get('away_goals') is None
+        ]
+    
+    def run(self, simulations=100_000, seed=None, workers=1, chunk_size=25_000):
+        """Simula y devuelve {equipo: {positions, liguilla, play_in, eliminated, expected_points}}"""
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy  # con esta semilla se repite la proyección
+        sizes = [chunk_size] * (simulations // chunk_size)
+        if simulations % chunk_size:
+            sizes.append(simulations % chunk_size)
+        jobs = [
+            (self.base, self.home, self.away, self.lambda_home, self.lambda_away, size, child)
+            for size, child in zip(sizes, sequence.spawn(len(sizes)))
+        ]
+        
+        if workers and workers > 1 and len(jobs) > 1:
+            with futures_process.ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                chunks = list(executor.map(_simulate_chunk, *zip(*jobs)))
+        else:
+            chunks = [_simulate_chunk(*job) for job in jobs]
+        
+        counts = sum(chunk[0] for chunk in chunks)
+        points = sum(chunk[1] for chunk in chunks)
+        distribution = counts / simulations
+        first, last = self.play_in
+        projection = {}
+        for i, team in enumerate(self.teams):
+            row = distribution[i]
+            projection[team] = {
+                'positions': [round(float(p), 5) for p in row],
+                'liguilla': round(float(row[:self.liguilla].sum()), 5),
+                'play_in': round(float(row[first - 1:last].sum()), 5),
+                'eliminated': round(float(row[last:].sum()), 5),
+                'expected_points': round(float(points[i]) / simulations, 2),
+            }
+        return projection
+
+
+class RefreshPipeline:
+    """Refresco continuo por etapas: reloj → descarga → parseo → consolidación → publicación
+    
+    El reloj dispara sobre una rejilla fija inicio + k·intervalo (el jitter se
+    suma a cada tick sin acumularse), así un ciclo lento no corre los
+    siguientes. Cada fuente se descarga en su propio hilo y no se relanza
+    mientras su ciclo anterior siga en curso; el parseo va a un pool aparte y
+    la consolidación se rehace con cada fuente que llega, usando el último
+    resultado vigente (max_age) de las demás. Una fuente lenta no retrasa la
+    publicación de las otras. La publicación (pantalla, JSON, historial) corre
+    en su propio hilo y sólo atiende la consolidación más reciente.
+    
+    Con una PollingPolicy el intervalo se recalcula en cada tick y la rejilla
+    vuelve a empezar desde ese tick cuando cambia.
+    """
+    
+    def __init__(self, scraper, interval=60.0, jitter=0.05, parse_workers=2, max_age=None,
+                 display=True, policy=None):
+        self.scraper = scraper
+        self.interval = interval
+        self.jitter = jitter  # fracción del intervalo, ± aleatorio por tick
+        self.parse_workers = parse_workers
+        self._max_age = max_age
+        self.display = display
+        self.policy = policy
+        self._changed = False  # la tabla publicada cambió desde el último tick
+        self.on_publish = []  # callbacks(results) tras cada publicación
+        
+        self.cycle = 0
+        self.next_tick = None  # time.monotonic() del próximo ciclo
+        self.skipped = 0       # descargas omitidas porque la anterior seguía en curso
+        self.missed_ticks = 0  # ticks perdidos (p. ej. tras suspender el equipo)
+        self.publishes = 0
+        
+        self.specs = []
+        self._stop = CancelEvent()
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._pending = {}  # ciclo -> fuentes sin respuesta
+        self._latest = {}   # fuente -> (monotonic, equipos)
+        self._results = queue.Queue()
+        self._publish = queue.Queue()
+        self._threads = []
+        self._fetch_pool = None
+        self._parse_pool = None
+    
+    @property
+    def max_age(self):
+        """Antigüedad máxima del último resultado de una fuente para seguir votando"""
+        return 3 * self.interval if self._max_age is None else self._max_age
+    
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+    
+    def seconds_to_next_tick(self):
+        if self.next_tick is None:
+            return 0.0
+        return max(0.0, self.next_tick - time.monotonic())
+    
+    def start(self):
+        self.specs = sorted(self.scraper.source_specs.values(), key=lambda spec: spec.priority)
+        self._fetch_pool = concurrent_futures.ThreadPoolExecutor(
+            max_workers=max(1, len(self.specs)), thread_name_prefix='fetch')
+        self._parse_pool = concurrent_futures.ThreadPoolExecutor(
+            max_workers=self.parse_workers, thread_name_prefix='parse')
+        for target, name in ((self._run_clock, 'clock'),
+                             (self._run_consolidate, 'consolidate'),
+                             (self._run_publish, 'publish')):
+            thread = threading.Thread(target=target, name=f'pipeline-{name}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+    
+    def stop(self, timeout=10):
+        """Detiene el reloj, cancela las esperas en curso y vacía las etapas"""
+        self._stop.set()
+        self._threads[0].join(timeout)
+        self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._parse_pool.shutdown(wait=True, cancel_futures=True)
+        self._results.put(None)
+        self._threads[1].join(timeout)
+        self._publish.put(None)
+        self._threads[2].join(timeout)
+    
+    def _run_clock(self):
+        origin = time.monotonic()
+        k = 0
+        while not self._stop.is_set():
+            fired = time.monotonic()
+            try:
+                self._launch_cycle()
+            except Exception as e:
+                logger.error(f"Error lanzando el ciclo: {e}")
+            
+            k += 1
+            if self.policy is not None:
+                changed, self._changed = self._changed, False
+                interval = self.policy.next_interval(changed=changed)
+                if interval != self.interval:
+                    logger.info(f"⏱️ Próximo sondeo en {interval:.0f}s ({self.policy.reason})")
+                    self.interval = interval
+                    origin, k = fired, 1
+            
+            now = time.monotonic()
+            due = origin + k * self.interval
+            if due < now:
+                # Ticks ya vencidos: se saltan en lugar de encadenar ciclos seguidos
+                missed = int((now - due) // self.interval) + 1
+                self.missed_ticks += missed
+                k += missed
+                due = origin + k * self.interval
+            offset = random.uniform(-self.jitter, self.jitter) * self.interval if self.jitter else 0
+            self.next_tick = max(now, due + offset)
+            if self._stop.wait(self.next_tick - now):
+                break
+    
+    def _launch_cycle(self):
+        self.cycle += 1
+        cycle = self.cycle
+        self.scraper.renderer.status(
+            f"🔄 ACTUALIZANDO DATOS EN TIEMPO REAL - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        launched = []
+        with self._lock:
+            for spec in sorted(self.specs, key=self.scraper.source_rank):
+                if spec.name in self._in_flight:
+                    self.skipped += 1
+                    logger.warning(f"⏭️ {spec.label} sigue en curso, se omite en el ciclo {cycle}")
+                    continue
+                if not self.scraper.health[spec.name].allow():
+                    continue  # circuito abierto: no cuesta nada este ciclo
+                self._in_flight.add(spec.name)
+                launched.append(spec)
+            if launched:
+                self._pending[cycle] = {spec.name for spec in launched}
+            idle = not launched and not self._in_flight
+        
+        if idle:
+            # Todos los circuitos abiertos: ninguna fuente responderá a este ciclo,
+            # así que la consolidación pasa directo a la tabla vieja o al respaldo
+            self._results.put((cycle, None, None))
+        for spec in launched:
+            self._fetch_pool.submit(self._fetch, cycle, spec)
+    
+    def _fetch(self, cycle, spec):
+        scraper = self.scraper
+        started = time.monotonic()
+        try:
+            # stop() corta las esperas del planificador, que no pasan del tick siguiente
+            with fetch_scope(self._stop, started + self.interval):
+                fetched = scraper.fetch_source(spec, scraper.health[spec.name].retries())
+        except Exception as e:
+            if not self._stop.is_set():  # al detener, las descargas canceladas no son errores
+                logger.error(f"❌ Error descargando {spec.label}: {e}")
+            fetched = None
+        
+        if fetched is None or self._stop.is_set():
+            self._finish(cycle, spec, None, started)
+            return
+        try:
+            self._parse_pool.submit(self._parse, cycle, spec, fetched, started)
+        except RuntimeError:  # pool cerrado durante stop()
+            self._finish(cycle, spec, None, started)
+    
+    def _parse(self, cycle, spec, fetched, started):
+        try:
+            teams = self.scraper.parse_fetched(spec, fetched)
+        except Exception as e:
+            logger.error(f"❌ Error parseando {spec.label}: {e}")
+            teams = None
+        self._finish(cycle, spec, teams, started)
+    
+    def _finish(self, cycle, spec, teams, started):
+        health = self.scraper.health[spec.name]
+        if self._stop.is_set():
+            health.release()
+        else:
+            health.record(teams is not None, time.monotonic() - started,
+                          self.scraper.is_valid_result(teams))
+        with self._lock:
+            self._in_flight.discard(spec.name)
+        self._results.put((cycle, spec, teams))
+    
+    def _run_consolidate(self):
+        scraper = self.scraper
+        while True:
+            item = self._results.get()
+            if item is None:
+                break
+            cycle, spec, teams = item
+            name = spec.name if spec is not None else f'ciclo {cycle}'
+            try:
+                now = time.monotonic()
+                pending = self._pending.get(cycle, set())
+                if spec is not None:
+                    pending.discard(spec.name)
+                if not pending:
+                    self._pending.pop(cycle, None)
+                
+                changed = False
+                if spec is None:
+                    pass  # ciclo sin descargas (circuitos abiertos)
+                elif scraper.is_valid_result(teams):
+                    logger.info(f"✅ {spec.name}: {len(teams)} equipos obtenidos")
+                    previous = self._latest.get(spec.name)
+                    # Un resultado anterior ya vencido había salido de la tabla publicada
+                    changed = (previous is None or previous[1] != teams
+                               or now - previous[0] > self.max_age)
+                    self._latest[spec.name] = (now, teams)
+                    scraper.set_freshness('fresh', time.time())
+                    if not changed:
+                        scraper.publisher.touch()  # tabla confirmada sin cambios
+                else:
+                    logger.warning(f"⚠️ {spec.name}: datos insuficientes o vacíos")
+                
+                fresh = {
+                    s.name: self._latest[s.name][1]
+                    for s in self.specs
+                    if s.name in self._latest and now - self._latest[s.name][0] <= self.max_age
+                }
+                if fresh and changed:
+                    self._publish.put((fresh, scraper.consolidate_data(fresh)))
+                elif not fresh and not pending:
+                    results = scraper.fallback_results()
+                    if results:
+                        self._publish.put((results, scraper.consolidate_data(results)))
+                    elif self.display and scraper.teams_data:
+                        scraper.display_table()  # muestra la marca de tabla vieja
+            except Exception as e:
+                logger.error(f"Error consolidando {name}: {e}")
+    
+    def _run_publish(self):
+        while True:
+            item = self._publish.get()
+            if item is None:
+                break
+            # Si se acumularon consolidaciones, sólo vale la más reciente
+            stop = False
+            while True:
+                try:
+                    newer = self._publish.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    stop = True
+                    break
+                item = newer
+            try:
+                self._publish_one(*item)
+            except Exception as e:
+                logger.error(f"Error publicando: {e}")
+            if stop:
+                break
+    
+    def _publish_one(self, results, consolidated):
+        scraper = self.scraper
+        scraper.teams_data = consolidated
+        scraper.last_update = datetime.now()
+        real = any(source != 'demo_data' for source in results)
+        
+        if self.display:
+            scraper.display_table()
+        if scraper.save_to_json():
+            self._changed = True
+        if real:
+            scraper.record_history(list(results))
+            scraper.renderer.notice(f"✅ DATOS REALES obtenidos de: {', '.join(results)}")
+        else:
+            scraper.renderer.notice("⚠️  Usando datos de demostración (fuentes reales no disponibles)")
+        
+        self.publishes += 1
+        for callback in self.on_publish:
+            callback(results)
+
+
+COMPETITIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'competiciones.json')
+
+
+class CompetitionRunner:
+    """Varias competiciones (ligas, femenil, torneos pasados) con recursos compartidos
+    
+    Cada competición es una entrada de configuración que ajusta un LigaMXScraper:
+    título, max_rows, archivos de salida, sus alias de equipos en 'aliases' y,
+    en 'sources', qué fuentes usar y qué claves (url, selectores...) cambian
+    respecto a las de Liga MX. Todas comparten una sesión de requests (un solo
+    pool de conexiones), un HostRateScheduler (la cortesía por host es global:
+    ESPN recibe el mismo espaciado aunque lo consulten cinco tablas) y un
+    ThreadPoolExecutor acotado. En cada ciclo las fuentes de todas las competiciones se encolan
+    en ese pool como tareas planas, sin pools anidados ni un hilo por tabla.
+    
+    Uso:
+        runner = CompetitionRunner.from_file(max_workers=8)
+        runner.run_forever(interval=60)
+    """
+    
+    def __init__(self, competitions, max_workers=8, deadline=45.0, display=False,
+                 parse_processes=0):
+        self.deadline = deadline
+        self.display = display
+        self.executor = concurrent_futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                              thread_name_prefix='competicion')
+        self.scrapers = {}
+        self._stop = threading.Event()
+        
+        # El primer scraper crea la sesión y el planificador; el resto los reutiliza
+        shared = {}
+        for name, config in competitions.items():
+            if not config.get('enabled', True):
+                continue
+            scraper = LigaMXScraper(pool_size=max_workers, **shared)
+            shared = {'session': scraper.session, 'scheduler': scraper.scheduler}
+            self.apply_config(scraper, name, config)
+            # Varias tablas comparten la terminal: sin redibujado en su lugar
+            scraper.renderer = TableRenderer(live=False)
+            self.scrapers[name] = scraper
+        self.session = shared.get('session')
+        self.scheduler = shared.get('scheduler')
+        
+        # Con parse_processes > 0 todas las competiciones parsean en un mismo pool de procesos
+        self.process_parser = None
+        if parse_processes and self.scrapers:
+            first = next(iter(self.scrapers.values()))
+            self.process_parser = ProcessParser(first.parser.name, parse_processes)
+            for scraper in self.scrapers.values():
+                scraper.process_parser = self.process_parser
+    
+    @classmethod
+    def from_file(cls, path=COMPETITIONS_FILE, **kwargs):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+    
+    @staticmethod
+    def apply_config(scraper, name, config):
+        """Ajusta un scraper a la entrada de configuración de una competición"""
+        scraper.competition = name
+        scraper.title = config.get('title', scraper.title)
+        scraper.max_rows = config.get('max_rows', scraper.max_rows)
+        overrides = config.get('sources')
+        if overrides is not None:
+            # Sólo las fuentes listadas; una fuente nueva debe declararse completa
+            scraper.sources = {
+                source: {**scraper.sources.get(source, {}), **(changes or {})}
+                for source, changes in overrides.items()
+            }
+        scraper.configure_sources()
+        scraper.normalizer = CompetitionRunner.build_normalizer(config.get('aliases'))
+        scraper.publisher = JsonPublisher(config.get('output', f'{name}_table.json'))
+        history = config.get('history', f'{name}_historial.db')
+        scraper.history = SnapshotStore(history) if history else None
+    
+    @staticmethod
+    def build_normalizer(aliases):
+        """TeamNameNormalizer de una competición
+        
+        aliases es un dict {canónico: [alias]} o la ruta de un archivo de alias
+        como team_aliases.json (relativa a este módulo). Sin aliases los nombres
+        pasan tal cual: los alias de Liga MX convertirían 'Leones Negros' de la
+        Expansión en 'León'.
+        """
+        if isinstance(aliases, str):
+            return TeamNameNormalizer.from_file(os.path.join(os.path.dirname(TEAM_ALIASES_FILE), aliases))
+        return TeamNameNormalizer(aliases or {})
+    
+    def run_once(self):
+        """Un ciclo de todas las competiciones; devuelve {competición: fuentes usadas}"""
+        cancel_event = CancelEvent()
+        ends = time.monotonic() + self.deadline
+        futures = {}
+        priorities = {}
+        for competition, scraper in self.scrapers.items():
+            scrapers = scraper.get_scrapers()
+            priorities[competition] = {name: i for i, (name, _) in enumerate(scrapers)}
+            for source, func in scrapers:
+                future = self.executor.submit(scraper._run_fanout_worker, source, func,
+                                              cancel_event, ends)
+                futures[future] = (competition, source)
+        
+        valid = {competition: {} for competition in self.scrapers}
+        started = time.monotonic()
+        try:
+            for future in concurrent_futures.as_completed(futures, timeout=self.deadline):
+                competition, source = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Error en {competition}/{source}: {e}")
+                    continue
+                if self.scrapers[competition].is_valid_result(result):
+                    valid[competition][source] = result
+                else:
+                    logger.warning(f"⚠️ {competition}/{source}: datos insuficientes o vacíos")
+        except concurrent_futures.TimeoutError:
+            pending = [f'{c}/{s}' for future, (c, s) in futures.items() if not future.done()]
+            logger.warning(f"⏱️ Límite de {self.deadline}s alcanzado, ignorando: {', '.join(pending)}")
+        finally:
+            cancel_event.set()
+            for future in futures:
+                future.cancel()
+        logger.info(f"⏱️ {len(futures)} consultas de {len(self.scrapers)} competiciones "
+                    f"en {time.monotonic() - started:.2f}s")
+        
+        summary = {}
+        for competition, scraper in self.scrapers.items():
+            results = scraper.select_fanout_results(
+                valid[competition], priorities[competition], scraper.fanout_strategy
+            )
+            if not results:
+                # Los datos de demostración son de Liga MX: mejor conservar la tabla anterior
+                logger.warning(f"⚠️ {scraper.title}: sin fuentes válidas, se conserva la tabla anterior")
+                continue
+            self.publish(scraper, results)
+            summary[competition] = list(results)
+        return summary
+    
+    def publish(self, scraper, results):
+        scraper.teams_data = scraper.consolidate_data(results)
+        scraper.last_update = datetime.now()
+        if self.display:
+            scraper.display_table()
+        scraper.save_to_json()
+        scraper.record_history(list(results))
+    
+    def run_forever(self, interval=60.0):
+        """Repite run_once sobre una rejilla fija de interval segundos hasta stop()"""
+        due = time.monotonic()
+        while not self._stop.is_set():
+            summary = self.run_once()
+            logger.info(f"✅ Competiciones actualizadas: {', '.join(summary) or 'ninguna'}")
+            due += interval
+            now = time.monotonic()
+            if due < now:
+                due = now  # ciclo más largo que el intervalo: no acumular atraso
+            self._stop.wait(due - now)
+    
+    def stop(self):
+        self._stop.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.process_parser is not None:
+            self.process_parser.close()
+        for scraper in self.scrapers.values():
+            if scraper.history is not None:
+                scraper.history.close()
+        if self.session is not None:
+            self.session.close()
+
+
+class _NoticeHandler(logging.Handler):
+    """Handler de logging que escribe en la línea de avisos de TableRenderer"""
+    
+    def __init__(self, renderer, level):
+        super().__init__(level)
+        self.renderer = renderer
+        self.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+    
+    def emit(self, record):
+        try:
+            self.renderer.notice(self.format(record).splitlines()[0])
+        except Exception:
+            self.handleError(record)
+
+
+class TableRenderer:
+    """Salida de la tabla en la terminal con redibujado sólo de las líneas cambiadas
+    
+    En una TTY (modo vivo) la tabla se dibuja una vez y luego cada
+    actualización compara las líneas con las del cuadro anterior y reescribe
+    sólo las distintas con movimientos relativos del cursor ANSI, todo en un
+    único write. Debajo quedan una línea de avisos y una línea de estado (la
+    cuenta regresiva) que se reescriben en su lugar; el cursor descansa al
+    final de la de estado. Mientras dura capture_logs() los logs de consola
+    van a la línea de avisos para no desplazar el cuadro.
+    
+    Sin TTY (archivo, tubería) se escribe texto plano: el cuadro completo
+    sólo cuando cambió alguna fila y, si no, una sola línea con la hora.
+    """
+    
+    def __init__(self, stream=None, live=None):
+        self.stream = stream or sys.stdout
+        if live is None:
+            live = (getattr(self.stream, 'isatty', lambda: False)()
+                    and os.environ.get('TERM') != 'dumb')
+        self.live = live
+        self._frame = []  # líneas dibujadas del cuadro (incluye la hora)
+        self._rows = None  # cuadro sin la hora, para el modo plano
+        self._notice = ''
+        self._status = ''
+        self._lock = threading.RLock()
+        self.bytes_written = 0
+    
+    def _write(self, text):
+        self.stream.write(text)
+        self.stream.flush()
+        self.bytes_written += len(text)
+        return len(text)
+    
+    def _fit(self, lines):
+        """Recorta las líneas al ancho de la terminal: una línea partida desalinea el cursor"""
+        width = shutil.get_terminal_size((120, 40)).columns - 1
+        return [line if len(line) <= width else line[:width] for line in lines]
+    
+    def render(self, lines, footer=''):
+        """Dibuja el cuadro; devuelve los caracteres escritos"""
+        with self._lock:
+            if not self.live:
+                return self._render_plain(lines, footer)
+            
+            frame = self._fit(list(lines) + [footer])
+            previous = self._frame
+            buffer = []
+            if len(frame) != len(previous):
+                if previous:
+                    # Del renglón de estado al inicio del cuadro anterior y borrar hasta el final
+                    buffer.append(f'\r\x1b[{len(previous) + 1}A\x1b[J')
+                else:
+                    buffer.append('\r\x1b[K')  # estado escrito antes del primer cuadro
+                buffer.append('\n'.join(frame))
+                buffer.append(f'\n{self._notice}\x1b[K\n{self._status}\x1b[K')
+            else:
+                # La línea i está a len(frame) + 1 - i renglones del de estado
+                distance = len(frame) + 1
+                for i, (old, new) in enumerate(zip(previous, frame)):
+                    if old != new:
+                        up = distance - i
+                        buffer.append(f'\x1b[{up}A\r{new}\x1b[K\x1b[{up}B')
+                if buffer:
+                    buffer.append(f'\r{self._status}\x1b[K')
+            self._frame = frame
+            return self._write(''.join(buffer)) if buffer else 0
+    
+    def _render_plain(self, lines, footer):
+        lines = list(lines)
+        if lines != self._rows:
+            self._rows = lines
+            return self._write('\n'.join(lines + [footer]) + '\n')
+        return self._write(f'{footer} (sin cambios)\n') if footer else 0
+    
+    def notice(self, text):
+        """Mensaje de un ciclo (fuentes usadas, archivo guardado, avisos)"""
+        with self._lock:
+            if not self.live:
+                return self._write(f'{text}\n')
+            if not self._frame:
+                # Aún sin cuadro: el aviso queda como línea normal sobre la de estado
+                return self._write(f'\r{text}\x1b[K\n{self._status}')
+            self._notice = text
+            return self._write(f'\x1b[1A\r{text}\x1b[K\x1b[1B\r{self._status}\x1b[K')
+    
+    def status(self, text):
+        """Línea de estado: en modo vivo se reescribe en su lugar, en texto plano es una línea"""
+        with self._lock:
+            if not self.live:
+                return self._write(f'{text}\n')
+            self._status = text
+            return self._write(f'\r{text}\x1b[K')
+    
+    def close(self):
+        """Deja el cursor en una línea nueva al terminar el modo vivo"""
+        with self._lock:
+            if self.live and (self._frame or self._status):
+                self._write('\n')
+            self._frame = []
+            self._status = ''
+    
+    @contextmanager
+    def capture_logs(self, level=logging.WARNING):
+        """En modo vivo, los logs de consola (TTY) se muestran en la línea de avisos"""
+        if not self.live:
+            yield
+            return
+        root = logging.getLogger()
+        console = [
+            handler for handler in root.handlers
+            if type(handler) is logging.StreamHandler
+            and getattr(handler.stream, 'isatty', lambda: False)()
+        ]
+        capture = _NoticeHandler(self, level)
+        for handler in console:
+            root.removeHandler(handler)
+        root.addHandler(capture)
+        try:
+            yield
+        finally:
+            root.removeHandler(capture)
+            for handler in console:
+                root.addHandler(handler)
+
+
 class LigaMXScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.setup_session()
+    def __init__(self, session=None, scheduler=None, pool_size=10):
+        # session y scheduler se inyectan para compartirlos entre competiciones;
+        # sin session, la propia se crea (e importa requests) en el primer uso
+        self._session = session
+        self._pool_size = pool_size
+        
+        # Competición que representa este scraper (ver CompetitionRunner)
+        self.competition = 'liga_mx'
+        self.title = 'TABLA GENERAL LIGA MX - TORNEO CLAUSURA 2024'
+        self.max_rows = 18
+        # Alias de equipos de la competición (ver CompetitionRunner.apply_config)
+        self.normalizer = TEAM_NORMALIZER
         
-        # Fuentes alternativas más confiables
+        # Fuentes declarativas: URL, selectores de filas y mapa columna→campo.
+        # priority ordena el fan-out, weight es la confiabilidad en el consenso,
+        # fallback encadena el modo serial y min_interval/max_interval son los
+        # límites de cortesía por host.
+        # Una fuente sin 'columns' sólo se declara (no se scrapea).
         self.sources = {
-            'ligamx_oficial': 'https://www.ligamx.net/cancha/stats',
-            'espn_mx': 'https://www.espn.com.mx/futbol/posiciones/_/liga/mex.1',
-            'foxsports': 'https://www.foxsports.com.mx/futbol/liga-mx/tabla-de-posiciones',
-            'medio_tiempo': 'https://www.mediotiempo.com/futbol/liga-mx/tabla-posiciones',
-            'transfermarkt': 'https://www.transfermarkt.com/liga-mx-clausura/tabelle/wettbewerb/MEXC',
+            'espn_mx': {
+                'url': 'https://www.espn.com.mx/futbol/posiciones/_/liga/mex.1',
+                'label': 'ESPN MX',
+                'priority': 1,
+                'weight': 1.0,
+                'fallback': 'ligamx_oficial',
+                'row_selectors': [
+                    'table.Table--align-right',
+                    'table.Table',
+                    '.Table__TBODY tr',
+                    'tbody tr',
+                    '.standings-table tbody tr',
+                    'table tbody tr',
+                ],
+                'stream_hints': ['Table--align-right', 'Table'],
+                'min_cells': 6,
+                'columns': {'team': 1, 'points': 2, 'games': 3, 'wins': 4,
+                            'draws': 5, 'losses': 6, 'goal_diff': 7},
+                'min_interval': 1.0,
+                'max_interval': 300.0,
+            },
+            'ligamx_oficial': {
+                'url': 'https://www.ligamx.net/cancha/stats',
+                'label': 'Liga MX Oficial',
+                'priority': 2,
+                'weight': 1.5,  # Fuente oficial: pesa más en el consenso
+                'fallback': 'medio_tiempo',
+                'row_selectors': [
+                    '.tabla-general tbody tr',
+                    '.standings tbody tr',
+                    'table tbody tr',
+                    '.table-stats tbody tr',
+                ],
+                'stream_hints': ['tabla-general', 'standings'],
+                'min_cells': 4,
+                'columns': {'team': 1, 'points': 2, 'games': 3, 'wins': 4,
+                            'draws': 5, 'losses': 6, 'goal_diff': 7},
+                'min_interval': 2.0,
+                'max_interval': 300.0,
+            },
+            'foxsports': {
+                'url': 'https://www.foxsports.com.mx/futbol/liga-mx/tabla-de-posiciones',
+                'label': 'Fox Sports MX',
+                'priority': 3,
+                'weight': 0.8,
+                'fallback': None,
+                'row_selectors': ['table tbody tr, .standings-table tr, .tabla tr'],
+                'min_cells': 3,
+                'columns': {'team': 1, 'points': 2, 'games': 3, 'wins': 4,
+                            'draws': 5, 'losses': 6, 'goal_diff': 7},
+                'min_interval': 2.0,
+                'max_interval': 300.0,
+            },
+            'medio_tiempo': {
+                'url': 'https://www.mediotiempo.com/futbol/liga-mx/tabla-posiciones',
+                'label': 'Medio Tiempo',
+                'priority': 4,
+                'weight': 0.8,
+                'fallback': 'demo',
+                'row_selectors': ['table tbody tr, .tabla-posiciones tr, .standings tr'],
+                'min_cells': 3,
+                # Medio Tiempo no publica diferencia de goles
+                'columns': {'team': 1, 'points': 2, 'games': 3, 'wins': 4,
+                            'draws': 5, 'losses': 6},
+                'min_interval': 2.0,
+                'max_interval': 300.0,
+            },
+            'transfermarkt': {
+                'url': 'https://www.transfermarkt.com/liga-mx-clausura/tabelle/wettbewerb/MEXC',
+                'min_interval': 5.0,
+                'max_interval': 600.0,
+            },
         }
+        self.source_specs = {}
         
         # User Agents más actualizados y diversos
         self.user_agents = [
@@ -52,17 +3378,118 @@ class LigaMXScraper:
         
         self.teams_data = {}
         self.last_update = None
+        self.consensus = ConsensusEngine()
+        self.conflicts = []  # discrepancias entre fuentes del último ciclo
+        # Tabla calculada desde resultados (load_results) para validar el consenso
+        self.engine = None
+        self.engine_discrepancies = []
+        # Proyección Monte Carlo (project_standings): equipo -> probabilidades
+        self.projection = None
+        
+        # Frescura: última confirmación por una fuente real (época) y tabla
+        # servida sin poder refrescarla (arranque en caliente, fuentes caídas)
+        self.staleness = StalenessPolicy()
+        self.verified_at = None
+        self.stale = False
+        
+        # Salida: sólo reescribe liga_mx_table.json cuando cambia la tabla.
+        # compact=True o patch_path='liga_mx_table.patch.json' se activan aquí
+        self.publisher = JsonPublisher('liga_mx_table.json')
+        # Historial de filas cambiadas por actualización (None lo desactiva)
+        self.history = SnapshotStore('liga_mx_historial.db')
+        self.api = None  # StandingsServer tras serve_api()
+        # Salida en terminal: en una TTY sólo se redibujan las filas que cambian
+        self.renderer = TableRenderer()
+        self.pipeline = None  # RefreshPipeline de run_continuous_scraping
+        
+        # Métricas del camino caliente: /metrics en la API o metrics.start_dump(path)
+        self.metrics = MetricsRegistry()
+        self.metrics.add_collector(self.collect_metrics)
+        
+        # Modo de obtención: 'fanout' consulta todas las fuentes en paralelo,
+        # 'serial' conserva la cadena de respaldo original
+        self.fetch_mode = 'fanout'
+        self.fanout_strategy = 'all'  # 'all' (consenso), 'first' o 'best'
+        self.cycle_deadline = 45  # segundos máximos por ciclo en modo fanout
+        
+        # Modo streaming: descarga por bloques y corta al cerrar la tabla
+        self.streaming = False
+        self.stream_chunk_size = 16384
+        self.stream_stats = {}  # url -> bytes leídos en la última descarga
+        
+        # Backend de parseo: 'auto' elige el más rápido instalado
+        self.parser_backend = 'auto'
+        self._parser = None  # se elige en el primer parseo (ver parser)
+        # ProcessParser opcional (enable_process_parsing); None parsea en el hilo
+        self.process_parser = None
         
-    def setup_session(self):
+        # Planificador de tasa por host (reemplaza las esperas aleatorias fijas)
+        self.scheduler = scheduler or HostRateScheduler()
+        self.configure_sources()
+        
+        # Caché HTTP: peticiones condicionales y parseo evitado si no hay cambios
+        self.cache = ResponseCache(max_entries=64, disk_path=None)
+        
+    @property
+    def session(self):
+        """Sesión de requests, creada al primer uso: el motor asíncrono y `once --json` no la necesitan"""
+        if self._session is None:
+            self._session = requests.Session()
+            self.setup_session(self._pool_size)
+        return self._session
+    
+    @session.setter
+    def session(self, session):
+        self._session = session
+    
+    @property
+    def parser(self):
+        """Backend de parseo de parser_backend, instanciado (e importado) al primer uso"""
+        if self._parser is None:
+            self._parser = get_parser_backend(self.parser_backend)
+        return self._parser
+    
+    @parser.setter
+    def parser(self, backend):
+        self._parser = backend
+    
+    def configure_sources(self):
+        """Compila las especificaciones de self.sources; llamar tras modificarlas"""
+        self.source_specs = {
+            name: SourceSpec(name, config, self.max_rows)
+            for name, config in self.sources.items()
+            if 'columns' in config
+        }
+        # El estado de los disyuntores sobrevive a una reconfiguración
+        previous = getattr(self, 'health', {})
+        self.health = {
+            name: previous.get(name) or SourceHealth(self.sources[name].get('label', name))
+            for name in self.source_specs
+        }
+        self.configure_scheduler()
+    
+    def configure_scheduler(self):
+        """Aplica los límites de cortesía de self.sources al planificador"""
+        for config in self.sources.values():
+            self.scheduler.configure(
+                config['url'],
+                min_interval=config.get('min_interval'),
+                max_interval=config.get('max_interval'),
+                latency_target=config.get('latency_target'),
+            )
+    
+    def setup_session(self, pool_size=10):
         """Configura la sesión con headers realistas y configuraciones avanzadas"""
         # Configurar SSL context más permisivo
         self.session.verify = False
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
-        # Configurar timeout y reintento
+        # Configurar timeout y reintento; los 429/Retry-After los gestiona el
+        # planificador por host en lugar de urllib3
         adapter = requests.adapters.HTTPAdapter(
-            max_retries=3,
-            pool_connections=10,
-            pool_maxsize=10
+            max_retries=urllib3.util.Retry(total=3, respect_retry_after_header=False),
+            pool_connections=pool_size,
+            pool_maxsize=pool_size
         )
         self.session.mount('http://', adapter)
         self.session.mount('https://', adapter)
@@ -99,345 +3526,522 @@ class LigaMXScraper:
             
         return headers
     
+    def wait_budget(self):
+        """Segundos que una petición puede esperar su turno: lo que le queda al ciclo en curso"""
+        deadline = fetch_deadline.get()
+        if deadline is None:
+            return self.cycle_deadline
+        return max(0.0, deadline - time.monotonic())
+    
+    def log_over_budget(self, url):
+        logger.warning(f"⏭️ {urlparse(url).netloc} no admite peticiones antes del límite del ciclo; "
+                       f"se abandona {url}")
+    
+    def _sleep(self, seconds):
+        """Espera interrumpible; devuelve True si el ciclo fue cancelado"""
+        cancel_event = fetch_cancel.get()
+        if cancel_event is None:
+            time.sleep(seconds)
+            return False
+        return cancel_event.wait(seconds)
+    
     def make_request(self, url, retries=3):
-        """Request mejorada con técnicas anti-detección avanzadas"""
+        """Request mejorada con técnicas anti-detección y tasa adaptativa por host"""
         for attempt in range(retries):
             try:
-                # Delay más inteligente
-                if attempt > 0:
-                    delay = random.uniform(3, 8) * (attempt + 1)
-                else:
-                    delay = random.uniform(2, 5)
-                
-                logger.info(f"Esperando {delay:.2f}s antes del intento {attempt + 1}")
-                time.sleep(delay)
+                # El planificador decide la espera según la salud del host
+                delay = self.scheduler.reserve(url, self.wait_budget())
+                if delay is None:
+                    self.log_over_budget(url)
+                    return None
+                if delay > 0:
+                    logger.info(f"Esperando {delay:.2f}s antes del intento {attempt + 1}")
+                    self.metrics.observe('scheduler_wait_seconds', delay, host=urlparse(url).netloc)
+                    if self._sleep(delay):
+                        return None
                 
                 # Headers frescos para cada intento
                 headers = self.get_random_headers()
+                if self.cache is not None:
+                    headers.update(self.cache.conditional_headers(url))
                 
-                # Configuración de request más robusta
+                # Configuración de request más robusta; stream=True separa
+                # el tiempo hasta los headers (TTFB) de la descarga del cuerpo
+                started = time.monotonic()
                 response = self.session.get(
                     url,
                     headers=headers,
                     timeout=(10, 30),  # (connect timeout, read timeout)
                     allow_redirects=True,
-                    stream=False
+                    stream=True
                 )
+                ttfb = time.monotonic() - started
+                body = response.content
+                latency = time.monotonic() - started
+                self.observe_http(url, response.status_code, ttfb, latency - ttfb, len(body), attempt)
+                self.scheduler.record(url, response.status_code, latency, response.headers.get('Retry-After'))
                 
                 logger.info(f"Response status: {response.status_code} para {url}")
                 
                 if response.status_code == 200:
-                    return response
+                    return self.cache.store(url, response) if self.cache is not None else response
+                elif response.status_code == 304 and self.cache is not None:
+                    cached = self.cache.not_modified_response(url)
+                    if cached is not None:
+                        return cached
                 elif response.status_code == 403:
                     logger.warning(f"Acceso prohibido (403) - {url}")
-                    time.sleep(random.uniform(10, 20))
                 elif response.status_code == 429:
-                    wait_time = random.uniform(15, 30)
-                    logger.warning(f"Rate limited (429), esperando {wait_time:.2f}s")
-                    time.sleep(wait_time)
+                    logger.warning(f"Rate limited (429) - {url}")
                 elif response.status_code in [404, 500, 502, 503]:
                     logger.warning(f"Error del servidor ({response.status_code}) - {url}")
                     
             except requests.exceptions.Timeout:
+                self.scheduler.record(url)
+                self.observe_http(url, 'timeout', attempt=attempt)
                 logger.warning(f"Timeout en intento {attempt + 1}")
             except requests.exceptions.ConnectionError:
+                self.scheduler.record(url)
+                self.observe_http(url, 'connection_error', attempt=attempt)
                 logger.warning(f"Error de conexión en intento {attempt + 1}")
             except Exception as e:
+                self.scheduler.record(url)
+                self.observe_http(url, 'error', attempt=attempt)
                 logger.error(f"Error en intento {attempt + 1}: {e}")
                 
-            if attempt < retries - 1:
-                time.sleep(random.uniform(5, 10))
+        return None
+    
+    def parse_response(self, response, parser, parse_key=None):
+        """Parsea la respuesta, reutilizando el resultado si el cuerpo no cambió
+        
+        parse_key identifica qué produce el parser (fuente, selectores, columnas
+        y backend); el memo sólo se reutiliza con el mismo cuerpo y la misma clave.
+        """
+        url = getattr(response, 'cache_key', None)
+        body_hash = getattr(response, 'body_hash', None)
+        
+        if self.cache is None or url is None:
+            return parser(response.content)
+        
+        parse_key = parse_key or parser.__name__
+        teams = self.cache.get_parsed(url, body_hash, parse_key)
+        if teams is not None:
+            logger.info(f"♻️ Sin cambios en {url}, se omite el parseo")
+        else:
+            teams = parser(response.content)
+            self.cache.set_parsed(url, body_hash, parse_key, teams)
+        
+        # Los TeamStanding no se modifican; basta una lista nueva
+        return list(teams)
+    
+    def fetch_table_rows(self, url, hints=(), retries=3):
+        """Descarga en streaming sólo hasta cerrar la tabla de posiciones y corta la conexión"""
+        for attempt in range(retries):
+            try:
+                delay = self.scheduler.reserve(url, self.wait_budget())
+                if delay is None:
+                    self.log_over_budget(url)
+                    return None
+                if delay > 0:
+                    logger.info(f"Esperando {delay:.2f}s antes del intento {attempt + 1}")
+                    if self._sleep(delay):
+                        return None
+                
+                started = time.monotonic()
+                response = self.session.get(
+                    url,
+                    headers=self.get_random_headers(),
+                    timeout=(10, 30),
+                    allow_redirects=True,
+                    stream=True
+                )
+                latency = time.monotonic() - started
+                self.scheduler.record(url, response.status_code, latency, response.headers.get('Retry-After'))
+                
+                if response.status_code != 200:
+                    logger.warning(f"Response status: {response.status_code} para {url}")
+                    self.observe_http(url, response.status_code, latency, attempt=attempt)
+                    response.close()
+                    continue
+                
+                table_parser = StandingsTableParser(hints=hints)
+                decoder = None
+                received = 0
+                try:
+                    for chunk in response.iter_content(chunk_size=self.stream_chunk_size):
+                        if decoder is None:
+                            decoder = stream_decoder(response.headers.get('Content-Type'), chunk)
+                        received += len(chunk)
+                        table_parser.feed(decoder.decode(chunk))
+                        if table_parser.done:
+                            break
+                    else:
+                        if decoder is not None:
+                            table_parser.feed(decoder.decode(b'', final=True))
+                        table_parser.close()
+                finally:
+                    # Cerrar sin consumir el resto descarta la conexión
+                    response.close()
                 
+                download = time.monotonic() - started - latency
+                self.observe_http(url, response.status_code, latency, download, received, attempt)
+                rows = table_parser.result() or []
+                self.stream_stats[url] = received
+                logger.info(f"📉 Streaming {url}: {received} bytes leídos, {len(rows)} filas")
+                return rows
+                
+            except requests.exceptions.RequestException as e:
+                self.scheduler.record(url)
+                self.observe_http(url, 'error', attempt=attempt)
+                logger.warning(f"Error de red en streaming (intento {attempt + 1}): {e}")
+        
         return None
     
+    def fetch_teams(self, spec, retries=3):
+        """Descarga y parsea una fuente; None si la descarga falla"""
+        return self.parse_fetched(spec, self.fetch_source(spec, retries))
+    
+    def fetch_source(self, spec, retries=3):
+        """Etapa de descarga: la respuesta completa, o las filas ya cortadas en streaming"""
+        if self.streaming:
+            return self.fetch_table_rows(spec.url, spec.stream_hints, retries)
+        return self.make_request(spec.url, retries) or None
+    
+    def parse_fetched(self, spec, fetched):
+        """Etapa de parseo sobre lo devuelto por fetch_source"""
+        if fetched is None:
+            return None
+        if self.streaming:
+            return self.extract_teams(spec, fetched)
+        backend = (self.process_parser or self.parser).name
+        return self.parse_response(fetched, partial(self.parse_source, spec.name),
+                                   (spec.parse_key, backend))
+    
     def scrape_simple_source(self):
-        """Scraper simple para fuente de respaldo usando datos estáticos de ejemplo"""
-        try:
-            # Simulamos datos para testing
-            teams_data = [
-                {'position': '1', 'team': 'Club América', 'points': '25', 'games': '12', 'wins': '8', 'draws': '1', 'losses': '3'},
-                {'position': '2', 'team': 'Cruz Azul', 'points': '23', 'games': '12', 'wins': '7', 'draws': '2', 'losses': '3'},
-                {'position': '3', 'team': 'Monterrey', 'points': '22', 'games': '12', 'wins': '7', 'draws': '1', 'losses': '4'},
-                {'position': '4', 'team': 'Guadalajara', 'points': '21', 'games': '12', 'wins': '6', 'draws': '3', 'losses': '3'},
-                {'position': '5', 'team': 'Tigres UANL', 'points': '20', 'games': '12', 'wins': '6', 'draws': '2', 'losses': '4'},
-                {'position': '6', 'team': 'Pumas UNAM', 'points': '19', 'games': '12', 'wins': '6', 'draws': '1', 'losses': '5'},
-                {'position': '7', 'team': 'Santos Laguna', 'points': '18', 'games': '12', 'wins': '5', 'draws': '3', 'losses': '4'},
-                {'position': '8', 'team': 'Toluca', 'points': '17', 'games': '12', 'wins': '5', 'draws': '2', 'losses': '5'},
-                {'position': '9', 'team': 'León', 'points': '16', 'games': '12', 'wins': '5', 'draws': '1', 'losses': '6'},
-                {'position': '10', 'team': 'Atlas', 'points': '15', 'games': '12', 'wins': '4', 'draws': '3', 'losses': '5'},
-                {'position': '11', 'team': 'Pachuca', 'points': '14', 'games': '12', 'wins': '4', 'draws': '2', 'losses': '6'},
-                {'position': '12', 'team': 'Necaxa', 'points': '13', 'games': '12', 'wins': '4', 'draws': '1', 'losses': '7'},
-                {'position': '13', 'team': 'Puebla', 'points': '12', 'games': '12', 'wins': '3', 'draws': '3', 'losses': '6'},
-                {'position': '14', 'team': 'Tijuana', 'points': '11', 'games': '12', 'wins': '3', 'draws': '2', 'losses': '7'},
-                {'position': '15', 'team': 'Mazatlán FC', 'points': '10', 'games': '12', 'wins': '3', 'draws': '1', 'losses': '8'},
-                {'position': '16', 'team': 'Querétaro', 'points': '9', 'games': '12', 'wins': '2', 'draws': '3', 'losses': '7'},
-                {'position': '17', 'team': 'Juárez', 'points': '8', 'games': '12', 'wins': '2', 'draws': '2', 'losses': '8'},
-                {'position': '18', 'team': 'Atlético San Luis', 'points': '7', 'games': '12', 'wins': '2', 'draws': '1', 'losses': '9'}
-            ]
-            
-            for team in teams_data:
-                team['source'] = 'Demo Data'
-                team['goal_diff'] = str(random.randint(-10, 15))
-            
+        """Fuente de respaldo: tabla calculada con resultados de demostración reproducibles"""
+        try:
+            engine = StandingsEngine(normalize=self.normalize_team_name)
+            engine.replay(demo_results(list(TEAM_NORMALIZER.canonical), rounds=12))
+            teams = engine.table('Demo Data')
             logger.info("✓ Usando datos de demostración")
-            return teams_data
+            return teams
             
         except Exception as e:
             logger.error(f"Error en datos de demo: {e}")
             return None
     
-    def scrape_espn_alternative(self):
+    def scrape_source(self, name, fallback=True):
+        """Motor genérico: descarga y extrae una fuente según su especificación"""
+        spec = self.source_specs[name]
+        health = self.health[name]
+        if not health.allow():
+            logger.info(f"⛔ {spec.label}: circuito abierto, se omite "
+                        f"(reintento en {health.retry_in():.0f}s)")
+        else:
+            started = time.monotonic()
+            teams = None
+            try:
+                teams = self.fetch_teams(spec, health.retries())
+            except Exception as e:
+                logger.error(f"Error en {spec.label}: {e}")
+            self.record_health(name, started, teams)
+            if teams:
+                return teams
+        
+        return self.scrape_fallback(spec) if fallback else None
+    
+    def record_health(self, name, started, teams):
+        """Registra el resultado de una consulta en el disyuntor de la fuente"""
+        health = self.health[name]
+        cancel_event = fetch_cancel.get()
+        if cancel_event is not None and cancel_event.is_set():
+            # Cancelada por el fan-out o al detener: no dice nada de la fuente
+            health.release()
+            return
+        latency = time.monotonic() - started
+        health.record(teams is not None, latency, self.is_valid_result(teams))
+    
+    def health_report(self):
+        """Estado de los disyuntores y puntuación de cada fuente"""
+        return {name: health.metrics() for name, health in self.health.items()}
+    
+    def observe_http(self, url, status, ttfb=None, download=None, size=0, attempt=0):
+        """Registra un intento HTTP: estado, reintentos, tiempos y bytes por host"""
+        host = urlparse(url).netloc
+        metrics = self.metrics
+        metrics.inc('http_requests_total', host=host, status=status)
+        if attempt:
+            metrics.inc('http_retries_total', host=host)
+        if ttfb is not None:
+            metrics.observe('http_ttfb_seconds', ttfb, host=host)
+        if download is not None:
+            metrics.observe('http_download_seconds', download, host=host)
+        if size:
+            metrics.inc('http_bytes_total', size, host=host)
+    
+    def collect_metrics(self):
+        """Indicadores de estado que se leen al exportar las métricas"""
+        gauges = [('teams', len(self.teams_data), {}), ('table_stale', int(self.stale), {})]
+        age = self.data_age()
+        if age is not None:
+            gauges.append(('table_age_seconds', round(age, 1), {}))
+        if self.cache is not None:
+            gauges.extend((f'cache_{key}', value, {}) for key, value in self.cache.stats().items())
+        for host, state in self.scheduler.metrics().items():
+            gauges.append(('scheduler_interval_seconds', state['interval'], {'host': host}))
+            gauges.append(('scheduler_wait_seconds_total', state['total_wait'], {'host': host}))
+            gauges.append(('scheduler_throttled', state['throttled'], {'host': host}))
+        for name, health in self.health.items():
+            gauges.append(('source_health_score', round(health.score(), 3), {'source': name}))
+            gauges.append(('source_circuit_open', int(health.state == 'open'), {'source': name}))
+        if self.pipeline is not None and self.pipeline.policy is not None:
+            policy = self.pipeline.policy.metrics()
+            gauges.append(('polling_interval_seconds', policy['interval'], {}))
+            # La decisión vigente como indicador 1 con su motivo en la etiqueta
+            gauges.append(('polling_reason', 1, {'reason': policy['reason']}))
+            gauges.append(('polling_stable_cycles', policy['stable_cycles'], {}))
+            gauges.append(('polling_changes_seen', policy['changes_seen'], {}))
+            gauges.append(('polling_windows', policy['windows'], {}))
+            gauges.extend(('polling_decisions', count, {'reason': reason})
+                          for reason, count in policy['decisions'].items())
+        return gauges
+    
+    def scrape_fallback(self, spec):
+        """Sigue la cadena de respaldo declarada en la fuente"""
+        if spec.fallback == 'demo':
+            return self.scrape_simple_source()
+        if spec.fallback in self.source_specs:
+            return self.scrape_source(spec.fallback)
+        return None
+    
+    def parse_source(self, name, content, rows=None):
+        """Extrae la tabla de posiciones del HTML de una fuente"""
+        spec = self.source_specs[name]
+        if rows is None:
+            parser = self.process_parser or self.parser
+            with self.metrics.span('parse', source=name, backend=parser.name):
+                rows = parser.select_rows(content, spec.row_selectors)
+        return self.extract_teams(spec, rows)
+    
+    def enable_process_parsing(self, workers=None, **options):
+        """Mueve el parseo de HTML a un pool de procesos (ver ProcessParser)"""
+        if self.process_parser is None:
+            self.process_parser = ProcessParser(self.parser.name, workers, **options)
+        return self.process_parser
+    
+    def extract_teams(self, spec, rows):
+        """Convierte las filas (listas de textos) en TeamStanding según el mapa de columnas"""
+        logger.info(f"{spec.label}: {len(rows)} filas encontradas")
+        started = time.perf_counter()
+        
+        teams = []
+        fields = spec.fields
+        label = spec.label
+        
+        for i, cells in enumerate(rows[:spec.max_rows], 1):
+            if len(cells) < spec.min_cells:
+                continue
+            try:
+                values = dict(zip(fields, spec.extract(cells)))
+                values['team'] = self.normalize_team_name(values['team'].replace('\n', ' ').strip())
+                teams.append(TeamStanding.from_values(i, values, label))
+            except Exception as e:
+                logger.warning(f"Error procesando fila {i} de {label}: {e}")
+                continue
+        
+        self.metrics.observe('extract_seconds', time.perf_counter() - started, source=spec.name)
+        logger.info(f"✓ {label}: {len(teams)} equipos")
+        return teams
+    
+    def scrape_espn_alternative(self, fallback=True):
         """Scraper alternativo para ESPN con mejor parsing"""
-        try:
-            espn_url = 'https://www.espn.com.mx/futbol/posiciones/_/liga/mex.1'
-            response = self.make_request(espn_url)
-            
-            if not response:
-                return self.scrape_ligamx_oficial()
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            teams = []
-            
-            # Buscar tabla de posiciones específica de ESPN
-            table_selectors = [
-                'table.Table--align-right',
-                'table.Table',
-                '.Table__TBODY tr',
-                'tbody tr',
-                '.standings-table tbody tr',
-                'table tbody tr'
-            ]
-            
-            rows = []
-            for selector in table_selectors:
-                if 'tr' in selector:
-                    rows = soup.select(selector)
-                else:
-                    table = soup.select_one(selector)
-                    if table:
-                        rows = table.find_all('tr')[1:]  # Skip header
-                if rows:
-                    break
-            
-            logger.info(f"Encontradas {len(rows)} filas en ESPN")
-            
-            if rows:
-                for i, row in enumerate(rows[:18], 1):
-                    cells = row.find_all(['td', 'th'])
-                    
-                    if len(cells) >= 6:
-                        try:
-                            # Extraer datos de las celdas
-                            team_cell = cells[1] if len(cells) > 1 else cells[0]
-                            team_name = team_cell.get_text(strip=True)
-                            
-                            # Limpiar nombre del equipo
-                            if team_name:
-                                team_name = team_name.replace('\n', ' ').strip()
-                                
-                            points = cells[2].get_text(strip=True) if len(cells) > 2 else '0'
-                            games = cells[3].get_text(strip=True) if len(cells) > 3 else '0'
-                            wins = cells[4].get_text(strip=True) if len(cells) > 4 else '0'
-                            draws = cells[5].get_text(strip=True) if len(cells) > 5 else '0'
-                            losses = cells[6].get_text(strip=True) if len(cells) > 6 else '0'
-                            goal_diff = cells[7].get_text(strip=True) if len(cells) > 7 else '0'
-                            
-                            team_data = {
-                                'position': str(i),
-                                'team': self.normalize_team_name(team_name),
-                                'points': points,
-                                'games': games,
-                                'wins': wins,
-                                'draws': draws,
-                                'losses': losses,
-                                'goal_diff': goal_diff,
-                                'source': 'ESPN MX'
-                            }
-                            teams.append(team_data)
-                            
-                        except Exception as e:
-                            logger.warning(f"Error procesando fila {i}: {e}")
-                            continue
-                        
-                logger.info(f"✓ ESPN: {len(teams)} equipos obtenidos")
-                return teams if teams else self.scrape_ligamx_oficial()
-            else:
-                logger.warning("No se encontraron filas de tabla en ESPN")
-                return self.scrape_ligamx_oficial()
-                
-        except Exception as e:
-            logger.error(f"Error scraping ESPN: {e}")
-            return self.scrape_ligamx_oficial()
-            
-    def scrape_ligamx_oficial(self):
+        return self.scrape_source('espn_mx', fallback)
+    
+    def scrape_ligamx_oficial(self, fallback=True):
         """Scraper para sitio oficial de Liga MX"""
-        try:
-            url = 'https://www.ligamx.net/cancha/stats'
-            response = self.make_request(url)
-            
-            if not response:
-                return self.scrape_medio_tiempo()
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            teams = []
-            
-            # Buscar tabla en Liga MX oficial
-            table_selectors = [
-                '.tabla-general tbody tr',
-                '.standings tbody tr',
-                'table tbody tr',
-                '.table-stats tbody tr'
-            ]
-            
-            rows = []
-            for selector in table_selectors:
-                rows = soup.select(selector)
-                if rows:
-                    break
-            
-            logger.info(f"Liga MX oficial: {len(rows)} filas encontradas")
-            
-            for i, row in enumerate(rows[:18], 1):
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 4:
-                    try:
-                        team_name = cells[1].get_text(strip=True) if len(cells) > 1 else f"Equipo {i}"
-                        points = cells[2].get_text(strip=True) if len(cells) > 2 else '0'
-                        
-                        team_data = {
-                            'position': str(i),
-                            'team': self.normalize_team_name(team_name),
-                            'points': points,
-                            'games': cells[3].get_text(strip=True) if len(cells) > 3 else '0',
-                            'wins': cells[4].get_text(strip=True) if len(cells) > 4 else '0',
-                            'draws': cells[5].get_text(strip=True) if len(cells) > 5 else '0',
-                            'losses': cells[6].get_text(strip=True) if len(cells) > 6 else '0',
-                            'goal_diff': cells[7].get_text(strip=True) if len(cells) > 7 else '0',
-                            'source': 'Liga MX Oficial'
-                        }
-                        teams.append(team_data)
-                    except Exception as e:
-                        logger.warning(f"Error procesando equipo {i}: {e}")
-                        continue
-            
-            logger.info(f"✓ Liga MX oficial: {len(teams)} equipos")
-            return teams if teams else self.scrape_medio_tiempo()
-            
-        except Exception as e:
-            logger.error(f"Error en Liga MX oficial: {e}")
-            return self.scrape_medio_tiempo()
+        return self.scrape_source('ligamx_oficial', fallback)
+    
+    def scrape_medio_tiempo(self, fallback=True):
+        """Scraper para Medio Tiempo como respaldo"""
+        return self.scrape_source('medio_tiempo', fallback)
+    
+    def scrape_foxsports(self, fallback=True):
+        """Scraper para Fox Sports México"""
+        return self.scrape_source('foxsports', fallback)
+    
+    def parse_espn(self, content, rows=None):
+        """Extrae la tabla de posiciones del HTML de ESPN"""
+        return self.parse_source('espn_mx', content, rows)
     
-    def scrape_medio_tiempo(self):
-        """Scraper para Medio Tiempo como respaldo"""
+    def parse_ligamx_oficial(self, content, rows=None):
+        """Extrae la tabla de posiciones del HTML de Liga MX oficial"""
+        return self.parse_source('ligamx_oficial', content, rows)
+    
+    def parse_medio_tiempo(self, content, rows=None):
+        """Extrae la tabla de posiciones del HTML de Medio Tiempo"""
+        return self.parse_source('medio_tiempo', content, rows)
+    
+    def parse_foxsports(self, content, rows=None):
+        """Extrae la tabla de posiciones del HTML de Fox Sports"""
+        return self.parse_source('foxsports', content, rows)
+
+    def get_scrapers(self):
+        """Lista de scrapers: primero las fuentes sanas, las de circuito abierto al final"""
+        specs = sorted(self.source_specs.values(), key=self.source_rank)
+        return [(spec.name, partial(self.scrape_source, spec.name)) for spec in specs]
+    
+    def source_rank(self, spec):
+        """Clave de orden: circuito abierto, puntuación de salud y prioridad declarada"""
+        health = self.health[spec.name]
+        return (health.state == 'open', -round(health.score(), 2), spec.priority)
+    
+    def is_valid_result(self, result):
+        """Necesitamos al menos 10 equipos para considerar válido un resultado"""
+        return bool(result) and len(result) >= 10
+    
+    def scrape_all_sources(self, mode=None, deadline=None, strategy=None):
+        """Ejecuta scrapers de múltiples fuentes en tiempo real"""
+        mode = mode or self.fetch_mode
+        
+        if mode == 'fanout':
+            results = self.scrape_sources_fanout(deadline=deadline, strategy=strategy)
+        else:
+            results = self.scrape_sources_serial()
+        
+        if results:
+            self.set_freshness('fresh', time.time())
+            return results
+        # Última tabla real o datos de demostración según la política de antigüedad
+        return self.fallback_results()
+    
+    def fallback_results(self):
+        """Resultados cuando fallan todas las fuentes, según self.staleness
+        
+        Vacío si se conserva la última tabla real (queda marcada como vieja)
+        o si la política no publica nada; si no, los datos de demostración.
+        """
+        age = self.data_age()
+        decision = self.staleness.fallback(age)
+        if decision == 'last':
+            logger.warning(f"🔄 Todas las fuentes fallaron; se conserva la tabla real "
+                           f"de hace {format_age(age)}")
+            self.set_freshness('stale')
+            return {}
+        if decision is None:
+            logger.warning("🔄 Todas las fuentes fallaron y no hay una tabla real vigente")
+            return {}
+        
+        logger.warning("🔄 Todas las fuentes fallaron, usando datos de demostración")
+        demo_data = self.scrape_simple_source()
+        if not demo_data:
+            return {}
+        logger.info("✓ Datos de demostración cargados")
+        self.set_freshness('demo')
+        return {'demo_data': demo_data}
+    
+    def data_age(self):
+        """Segundos desde la última confirmación por una fuente real, o None"""
+        if self.verified_at is None:
+            return None
+        return max(0.0, time.time() - self.verified_at)
+    
+    def set_freshness(self, state, verified=None):
+        """state es 'fresh', 'stale' o 'demo'; verified, la época de una confirmación real"""
+        if verified is not None:
+            self.verified_at = verified
+        self.stale = state == 'stale'
+        if self.api is not None:
+            self.api.set_freshness(None if state == 'demo' else self.verified_at, self.stale)
+    
+    def warm_start(self):
+        """Carga al arrancar la última tabla real (JSON publicado o historial), marcada como vieja
+        
+        Devuelve el origen ('json' o 'historial'), o None si no hay una tabla
+        real que la política de antigüedad permita servir.
+        """
+        loaded = self.load_published() or self.load_history_table()
+        if loaded is None:
+            return None
+        origin, teams_data, last_update, verified = loaded
+        age = max(0.0, time.time() - verified)
+        if not self.staleness.usable(age):
+            logger.info(f"🧊 La última tabla guardada ({origin}) es de hace {format_age(age)}; "
+                        f"no se usa para arrancar")
+            return None
+        
+        self.teams_data = teams_data
+        self.last_update = last_update
+        self.set_freshness('stale', verified)
+        self.metrics.inc('warm_start_total', origin=origin)
+        logger.info(f"🔥 Arranque en caliente desde {origin}: {len(teams_data)} equipos "
+                    f"confirmados hace {format_age(age)}")
+        return origin
+    
+    def load_published(self):
+        """('json', teams_data, last_update, verificación) del JSON publicado si es real"""
+        publisher = self.publisher
+        if publisher.payload is None:
+            publisher.load_previous()
+        verified = publisher.verified_at()
+        if publisher.payload is None or verified is None:
+            return None
         try:
-            url = 'https://www.mediotiempo.com/futbol/liga-mx/tabla-posiciones'
-            response = self.make_request(url)
-            
-            if not response:
-                return self.scrape_simple_source()
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            teams = []
-            
-            # Buscar tabla en Medio Tiempo
-            rows = soup.select('table tbody tr, .tabla-posiciones tr, .standings tr')
-            
-            logger.info(f"Medio Tiempo: {len(rows)} filas encontradas")
-            
-            for i, row in enumerate(rows[:18], 1):
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 3:
-                    try:
-                        team_name = cells[1].get_text(strip=True) if len(cells) > 1 else f"Equipo {i}"
-                        points = cells[2].get_text(strip=True) if len(cells) > 2 else '0'
-                        
-                        team_data = {
-                            'position': str(i),
-                            'team': self.normalize_team_name(team_name),
-                            'points': points,
-                            'games': cells[3].get_text(strip=True) if len(cells) > 3 else '0',
-                            'wins': cells[4].get_text(strip=True) if len(cells) > 4 else '0',
-                            'draws': cells[5].get_text(strip=True) if len(cells) > 5 else '0',
-                            'losses': cells[6].get_text(strip=True) if len(cells) > 6 else '0',
-                            'goal_diff': '0',
-                            'source': 'Medio Tiempo'
-                        }
-                        teams.append(team_data)
-                    except Exception as e:
-                        continue
-            
-            logger.info(f"✓ Medio Tiempo: {len(teams)} equipos")
-            return teams if teams else self.scrape_simple_source()
-            
-        except Exception as e:
-            logger.error(f"Error en Medio Tiempo: {e}")
-            return self.scrape_simple_source()
+            data = json.loads(publisher.payload)
+            teams_data = {}
+            for name, entry in data['teams'].items():
+                consensus = entry['consensus']
+                teams_data[name] = {
+                    'name': entry['name'],
+                    'sources': {
+                        source: TeamStanding.from_values(row['position'], row, source)
+                        for source, row in entry['sources'].items()
+                    },
+                    'consensus': TeamStanding.from_values(consensus['position'], consensus,
+                                                          consensus['source']),
+                    'conflicts': entry.get('conflicts', {}),
+                }
+            last_update = datetime.fromisoformat(data['last_update'])
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"No se pudo cargar {publisher.path} para arrancar: {e}")
+            return None
+        # Una tabla de demostración no vale como última tabla real
+        if not any(source != 'demo_data' for data in teams_data.values() for source in data['sources']):
+            return None
+        return 'json', teams_data, last_update, verified
     
-    def scrape_foxsports(self):
-        """Scraper para Fox Sports México"""
+    def load_history_table(self):
+        """('historial', teams_data, last_update, verificación) de la última tabla del historial"""
+        if self.history is None or not os.path.exists(self.history.path):
+            return None
         try:
-            url = 'https://www.foxsports.com.mx/futbol/liga-mx/tabla-de-posiciones'
-            response = self.make_request(url)
-            
-            if not response:
-                return None
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            teams = []
-            
-            # Buscar tabla en Fox Sports
-            rows = soup.select('table tbody tr, .standings-table tr, .tabla tr')
-            
-            logger.info(f"Fox Sports: {len(rows)} filas encontradas")
-            
-            for i, row in enumerate(rows[:18], 1):
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 3:
-                    try:
-                        team_name = cells[1].get_text(strip=True) if len(cells) > 1 else f"Equipo {i}"
-                        points = cells[2].get_text(strip=True) if len(cells) > 2 else '0'
-                        
-                        team_data = {
-                            'position': str(i),
-                            'team': self.normalize_team_name(team_name),
-                            'points': points,
-                            'games': cells[3].get_text(strip=True) if len(cells) > 3 else '0',
-                            'wins': cells[4].get_text(strip=True) if len(cells) > 4 else '0',
-                            'draws': cells[5].get_text(strip=True) if len(cells) > 5 else '0',
-                            'losses': cells[6].get_text(strip=True) if len(cells) > 6 else '0',
-                            'goal_diff': cells[7].get_text(strip=True) if len(cells) > 7 else '0',
-                            'source': 'Fox Sports MX'
-                        }
-                        teams.append(team_data)
-                    except Exception as e:
-                        continue
-            
-            logger.info(f"✓ Fox Sports: {len(teams)} equipos")
-            return teams if teams else None
-            
-        except Exception as e:
-            logger.error(f"Error en Fox Sports: {e}")
+            last_update = self.history.last_update()
+            table = self.history.table_as_of() if last_update else []
+        except sqlite3.Error as e:
+            logger.warning(f"No se pudo leer el historial para arrancar: {e}")
             return None
-
-    def scrape_all_sources(self):
-        """Ejecuta scrapers de múltiples fuentes en tiempo real"""
+        if not table:
+            return None
+        teams_data = {
+            standing.team: {
+                'name': standing.team,
+                'sources': {standing.source: standing},
+                'consensus': standing,
+                'conflicts': {},
+            }
+            for standing in table
+        }
+        return 'historial', teams_data, last_update, last_update.timestamp()
+    
+    def scrape_sources_serial(self):
+        """Intenta cada scraper en orden hasta obtener datos reales"""
         results = {}
         
-        # Lista de scrapers en orden de prioridad
-        scrapers = [
-            ('espn_mx', self.scrape_espn_alternative),
-            ('ligamx_oficial', self.scrape_ligamx_oficial),
-            ('foxsports', self.scrape_foxsports),
-            ('medio_tiempo', self.scrape_medio_tiempo)
-        ]
-        
-        # Intentar cada scraper hasta obtener datos reales
-        for source_name, scraper_func in scrapers:
+        for source_name, scraper_func in self.get_scrapers():
             try:
                 logger.info(f"🔄 Intentando {source_name}...")
                 result = scraper_func()
                 
-                if result and len(result) >= 10:  # Necesitamos al menos 10 equipos para considerarlo válido
+                if self.is_valid_result(result):
                     results[source_name] = result
                     logger.info(f"✅ {source_name}: {len(result)} equipos obtenidos")
                     break  # Usar la primera fuente exitosa
@@ -448,206 +4052,807 @@ class LigaMXScraper:
                 logger.error(f"❌ Error en {source_name}: {e}")
                 continue
         
-        # Solo usar datos de demostración como último recurso
-        if not results:
-            logger.warning("🔄 Todas las fuentes fallaron, usando datos de demostración")
-            demo_data = self.scrape_simple_source()
-            if demo_data:
-                results['demo_data'] = demo_data
-                logger.info("✓ Datos de demostración cargados")
-        
         return results
     
-    def consolidate_data(self, results):
-        """Consolida datos de múltiples fuentes"""
-        consolidated = {}
+    def _run_fanout_worker(self, source_name, scraper_func, cancel_event, deadline=None):
+        """Ejecuta un scraper sin cadena de respaldo dentro del fan-out
         
-        for source, teams in results.items():
-            for team in teams:
-                team_name = self.normalize_team_name(team['team'])
-                
-                if team_name not in consolidated:
-                    consolidated[team_name] = {
-                        'name': team_name,
-                        'sources': {},
-                        'consensus': {}
-                    }
+        deadline es el time.monotonic() en que vence el ciclo; las esperas del
+        planificador no pasan de ahí.
+        """
+        with fetch_scope(cancel_event, deadline):
+            logger.info(f"🔄 Consultando {source_name} en paralelo...")
+            return scraper_func(fallback=False)
+    
+    def scrape_sources_fanout(self, deadline=None, strategy=None):
+        """Consulta todas las fuentes en paralelo con un límite global de tiempo"""
+        deadline = self.cycle_deadline if deadline is None else deadline
+        strategy = strategy or self.fanout_strategy
+        scrapers = self.get_scrapers()
+        priority = {name: i for i, (name, _) in enumerate(scrapers)}
+        
+        cancel_event = CancelEvent()
+        ends = time.monotonic() + deadline
+        executor = concurrent_futures.ThreadPoolExecutor(max_workers=len(scrapers),
+                                                         thread_name_prefix='fanout')
+        futures = {
+            executor.submit(self._run_fanout_worker, name, func, cancel_event, ends): name
+            for name, func in scrapers
+        }
+        
+        valid = {}
+        started = time.monotonic()
+        try:
+            for future in concurrent_futures.as_completed(futures, timeout=deadline):
+                source_name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Error en {source_name}: {e}")
+                    continue
                 
-                consolidated[team_name]['sources'][source] = team
+                if self.is_valid_result(result):
+                    valid[source_name] = result
+                    logger.info(f"✅ {source_name}: {len(result)} equipos obtenidos")
+                    if strategy == 'first':
+                        break
+                else:
+                    logger.warning(f"⚠️ {source_name}: datos insuficientes o vacíos")
+        except concurrent_futures.TimeoutError:
+            pending = [name for future, name in futures.items() if not future.done()]
+            logger.warning(f"⏱️ Límite de {deadline}s alcanzado, ignorando: {', '.join(pending)}")
+        finally:
+            # Las fuentes lentas se cancelan en su siguiente espera
+            cancel_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        logger.info(f"⏱️ Fan-out completado en {time.monotonic() - started:.2f}s")
+        return self.select_fanout_results(valid, priority, strategy)
+    
+    def select_fanout_results(self, valid, priority, strategy):
+        """Fuentes válidas que pasan al consenso según la estrategia"""
+        if not valid:
+            return {}
+        if strategy == 'all':
+            return {name: valid[name] for name in sorted(valid, key=priority.get)}
+        
+        # 'first' ya cortó en la primera; 'best': la de más equipos, desempatando por prioridad
+        best = max(valid, key=lambda name: (len(valid[name]), -priority[name]))
+        return {best: valid[best]}
+    
+    def consolidate_data(self, results):
+        """Consolida datos de múltiples fuentes con voto ponderado por campo"""
+        weights = {}
+        fields = {}
+        for source in results:
+            spec = self.source_specs.get(source)
+            if spec is not None:
+                weights[source] = spec.weight
+                fields[source] = spec.fields
+        
+        with self.metrics.span('consolidate'):
+            consolidated, self.conflicts = self.consensus.consolidate(
+                results, weights, fields, self.normalize_team_name
+            )
+        self.metrics.inc('conflicts_total', len(self.conflicts))
+        if self.conflicts:
+            logger.warning(f"⚖️ {len(self.conflicts)} discrepancias entre fuentes")
+            for conflict in self.conflicts:
+                logger.debug(f"   {conflict['team']} {conflict['field']}: "
+                             f"{conflict['values']} -> {conflict['consensus']}")
         
-        # Calcular consenso
-        for team_name, data in consolidated.items():
-            sources = data['sources']
-            if sources:
-                primary_source = list(sources.values())[0]
-                data['consensus'] = primary_source
+        if self.engine is not None and self.engine.matches:
+            self.engine_discrepancies = self.engine.validate(
+                data['consensus'] for data in consolidated.values()
+            )
+            self.metrics.inc('engine_discrepancies_total', len(self.engine_discrepancies))
+            if self.engine_discrepancies:
+                logger.warning(f"🧮 {len(self.engine_discrepancies)} diferencias con la tabla "
+                               f"calculada desde resultados")
+                for item in self.engine_discrepancies:
+                    logger.debug(f"   {item['team']} {item['field']}: "
+                                 f"calculado {item['computed']}, scrapeado {item['scraped']}")
         
         return consolidated
     
+    def project_standings(self, simulations=100_000, seed=None, path=CALENDAR_FILE, workers=1):
+        """Simula el resto del torneo desde la tabla actual y los partidos pendientes de path"""
+        standings = [data['consensus'] for data in self.teams_data.values() if data['consensus']]
+        goals_for = None
+        if self.engine is not None:
+            goals_for = {team: stats[4] for team, stats in self.engine.stats.items()}
+        simulator = SeasonSimulator(standings, SeasonSimulator.remaining_fixtures(path),
+                                    goals_for=goals_for, normalize=self.normalize_team_name)
+        with self.metrics.span('projection'):
+            self.projection = simulator.run(simulations, seed, workers)
+        logger.info(f"🎲 {simulations} simulaciones de {len(simulator.fixtures)} partidos "
+                    f"pendientes (semilla {simulator.seed})")
+        return self.projection
+    
+    def load_results(self, path=CALENDAR_FILE):
+        """Carga resultados de partidos para validar cada consenso contra la tabla calculada"""
+        engine = StandingsEngine.from_file(path, normalize=self.normalize_team_name)
+        self.engine = engine if engine.matches else None
+        if self.engine is not None:
+            logger.info(f"🧮 {len(engine.matches)} resultados cargados de {path}")
+        return self.engine
+    
+    def serve_api(self, host='127.0.0.1', port=8080):
+        """Arranca la API de lectura en su propio hilo y la alimenta con cada publicación"""
+        server = StandingsServer(host, port, metrics=self.metrics)
+        if self.publisher.payload is None:
+            self.publisher.load_previous()
+        if self.publisher.payload is not None:
+            server.publish(self.publisher.payload, self.publisher.digest)
+            # Publicada por un proceso anterior: vieja hasta que este la confirme
+            server.set_freshness(self.verified_at or self.publisher.verified_at(),
+                                 self.stale or self.verified_at is None)
+        server.start()
+        self.publisher.listeners.append(server.publish)
+        self.api = server
+        return server
+    
+    def record_history(self, sources=()):
+        """Añade al historial las filas de consenso que cambiaron en este ciclo"""
+        if self.history is None or not self.teams_data:
+            return 0
+        try:
+            standings = [data['consensus'] for data in self.teams_data.values()]
+            with self.metrics.span('history'):
+                changed = self.history.record(standings, self.last_update, sources)
+            if changed:
+                logger.info(f"🗂️ Historial: {changed} filas cambiaron")
+            return changed
+        except sqlite3.Error as e:
+            logger.error(f"Error guardando historial: {e}")
+            return 0
+    
     def normalize_team_name(self, name):
-        """Normaliza nombres de equipos"""
-        if not name:
-            return "Equipo Desconocido"
-            
-        name = name.lower().strip()
-        
-        # Mapeo de nombres
-        name_mapping = {
-            'américa': 'Club América',
-            'america': 'Club América',
-            'cruz azul': 'Cruz Azul',
-            'chivas': 'Guadalajara',
-            'guadalajara': 'Guadalajara',
-            'pumas': 'Pumas UNAM',
-            'tigres': 'Tigres UANL',
-            'monterrey': 'Monterrey',
-            'santos': 'Santos Laguna',
-            'toluca': 'Toluca',
-            'león': 'León',
-            'leon': 'León',
-            'atlas': 'Atlas',
-            'necaxa': 'Necaxa',
-            'puebla': 'Puebla',
-            'pachuca': 'Pachuca',
-            'tijuana': 'Tijuana',
-            'mazatlán': 'Mazatlán FC',
-            'mazatlan': 'Mazatlán FC',
-            'querétaro': 'Querétaro',
-            'queretaro': 'Querétaro',
-            'juárez': 'Juárez',
-            'juarez': 'Juárez',
-            'atlético san luis': 'Atlético San Luis',
-            'atletico san luis': 'Atlético San Luis',
-            'san luis': 'Atlético San Luis'
-        }
+        """Normaliza nombres de equipos con los alias de la competición"""
+        return self.normalizer.normalize(name)
+    
+    def run_continuous_scraping(self, interval_minutes=1, jitter=0.05, policy=None, warm_start=True):
+        """Ejecuta scraping continuo en tiempo real (intervalo adaptativo con policy)"""
+        if policy is None:
+            print(f"🚀 Iniciando scraper Liga MX TIEMPO REAL (actualización cada {interval_minutes} minuto)")
+        else:
+            print(f"🚀 Iniciando scraper Liga MX TIEMPO REAL (intervalo adaptativo, "
+                  f"{len(policy.windows)} ventanas de partido en el calendario)")
+        print("🔴 MODO TIEMPO REAL ACTIVADO - Datos actualizados constantemente")
         
-        for key, value in name_mapping.items():
-            if key in name:
-                return value
+        # Arranque en caliente: la última tabla real se muestra (y se sirve) ya,
+        # marcada como vieja, mientras el primer ciclo la refresca en segundo plano
+        if warm_start and not self.teams_data and self.warm_start():
+            self.display_table()
         
-        # Si no se encuentra mapping, capitalizar primera letra
-        return name.title()
+        # Descarga, parseo y publicación corren en los hilos del pipeline;
+        # este hilo sólo muestra la cuenta regresiva
+        pipeline = RefreshPipeline(self, interval=interval_minutes * 60, jitter=jitter,
+                                   policy=policy).start()
+        self.pipeline = pipeline
+        try:
+            with self.renderer.capture_logs():
+                self.countdown(pipeline)
+        except KeyboardInterrupt:
+            self.renderer.close()
+            print("🛑 Deteniendo scraper en tiempo real...")
+        finally:
+            pipeline.stop()
+            self.renderer.close()
     
-    def run_continuous_scraping(self, interval_minutes=1):
-        """Ejecuta scraping continuo en tiempo real"""
-        print(f"🚀 Iniciando scraper Liga MX TIEMPO REAL (actualización cada {interval_minutes} minuto)")
-        print("🔴 MODO TIEMPO REAL ACTIVADO - Datos actualizados constantemente")
+    def countdown(self, pipeline, step=1, plain_every=30):
+        """Cuenta regresiva hasta el próximo ciclo sin bloquear el trabajo del pipeline
         
-        while True:
-            try:
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                print(f"\n🔄 ACTUALIZANDO DATOS EN TIEMPO REAL - {timestamp}")
-                
-                # Ejecutar scrapers
-                results = self.scrape_all_sources()
-                
-                if results and any(source != 'demo_data' for source in results.keys()):
-                    # Consolidar datos reales
-                    self.teams_data = self.consolidate_data(results)
-                    self.last_update = datetime.now()
-                    
-                    # Mostrar resultados
-                    self.display_table()
-                    
-                    # Guardar en JSON
-                    self.save_to_json()
-                    
-                    source_names = list(results.keys())
-                    print(f"✅ DATOS REALES obtenidos de: {', '.join(source_names)}")
-                    
-                elif results:
-                    # Solo datos de demostración disponibles
-                    self.teams_data = self.consolidate_data(results)
-                    self.last_update = datetime.now()
-                    self.display_table()
-                    self.save_to_json()
-                    print("⚠️  Usando datos de demostración (fuentes reales no disponibles)")
-                    
-                else:
-                    print("❌ No se pudieron obtener datos de ninguna fuente")
-                
-                # Esperar menos tiempo para más frecuencia
-                sleep_time = interval_minutes * 60
-                print(f"⏰ Próxima actualización en {interval_minutes} minuto...")
-                
-                # Mostrar countdown más detallado
-                for remaining in range(sleep_time, 0, -5):
-                    time.sleep(5)
-                    if remaining <= 30:
-                        print(f"⌛ {remaining}s restantes...")
-                    elif remaining % 30 == 0:
-                        print(f"⌛ {remaining}s restantes...")
-                
-            except KeyboardInterrupt:
-                print("\n🛑 Deteniendo scraper en tiempo real...")
-                break
-            except Exception as e:
-                logger.error(f"Error general: {e}")
-                print(f"⚠️  Error detectado, reintentando en 15 segundos...")
-                time.sleep(15)  # Esperar menos tiempo para recuperación rápida
+        En una terminal se actualiza cada step segundos en la línea de estado;
+        en texto plano sólo escribe una línea cada plain_every segundos.
+        """
+        renderer = self.renderer
+        step = step if renderer.live else min(5, plain_every)
+        last_bucket = None
+        while not pipeline.stopped:
+            remaining = int(pipeline.seconds_to_next_tick())
+            if renderer.live:
+                renderer.status(f"⌛ {remaining}s para la siguiente actualización")
+            elif remaining and remaining // plain_every != last_bucket:
+                last_bucket = remaining // plain_every
+                renderer.status(f"⌛ {remaining}s restantes...")
+            time.sleep(step)
     
     def display_table(self):
-        """Muestra la tabla de posiciones mejorada"""
+        """Muestra la tabla de posiciones; en una terminal sólo redibuja las filas que cambian"""
         if not self.teams_data:
-            print("❌ No hay datos para mostrar")
+            self.renderer.notice("❌ No hay datos para mostrar")
             return
-            
-        print("\n" + "="*90)
-        print("🏆 TABLA GENERAL LIGA MX - TORNEO CLAUSURA 2024")
-        print("="*90)
-        print(f"{'Pos':<4} {'Equipo':<20} {'Pts':<5} {'PJ':<4} {'G':<3} {'E':<3} {'P':<3} {'DG':<4} {'Fuente':<12}")
-        print("-"*90)
-        
-        # Ordenar por puntos
-        try:
-            sorted_teams = sorted(
-                self.teams_data.values(), 
-                key=lambda x: int(x['consensus'].get('points', 0)), 
-                reverse=True
-            )
-        except:
-            sorted_teams = list(self.teams_data.values())
+        footer = ''
+        if self.last_update:
+            footer = f"🕐 Última actualización: {self.last_update.strftime('%Y-%m-%d %H:%M:%S')}"
+            if self.stale and self.verified_at is not None:
+                footer += f"  ⚠️ SIN CONFIRMAR desde hace {format_age(self.data_age())}"
+        self.renderer.render(self.table_lines(), footer)
+    
+    def table_lines(self):
+        """Líneas de la tabla de posiciones (sin la hora de actualización)"""
+        projection = self.projection or {}
+        header = f"{'Pos':<4} {'Equipo':<20} {'Pts':<5} {'PJ':<4} {'G':<3} {'E':<3} {'P':<3} {'DG':<4} {'Fuente':<12}"
+        if projection:
+            header += f" {'Lig%':>6} {'Rep%':>6}"
+        lines = ['', '=' * 90, f"🏆 {self.title}", '=' * 90, header, '-' * 90]
+        
+        # Ordenar por puntos y diferencia de goles (campos ya enteros)
+        sorted_teams = sorted(
+            self.teams_data.values(),
+            key=lambda x: x['consensus'].sort_key()
+        )
         
-        for i, team in enumerate(sorted_teams[:18], 1):
+        for i, team in enumerate(sorted_teams[:self.max_rows], 1):
             consensus = team['consensus']
-            print(f"{i:<4} {consensus.get('team', 'N/A'):<20} "
-                  f"{consensus.get('points', 'N/A'):<5} "
-                  f"{consensus.get('games', 'N/A'):<4} "
-                  f"{consensus.get('wins', 'N/A'):<3} "
-                  f"{consensus.get('draws', 'N/A'):<3} "
-                  f"{consensus.get('losses', 'N/A'):<3} "
-                  f"{consensus.get('goal_diff', 'N/A'):<4} "
-                  f"{consensus.get('source', 'N/A'):<12}")
-        
-        print("="*90)
-        if self.last_update:
-            print(f"🕐 Última actualización: {self.last_update.strftime('%Y-%m-%d %H:%M:%S')}")
+            lines.append(f"{i:<4} {consensus.team:<20} "
+                         f"{consensus.points:<5} "
+                         f"{consensus.games:<4} "
+                         f"{consensus.wins:<3} "
+                         f"{consensus.draws:<3} "
+                         f"{consensus.losses:<3} "
+                         f"{consensus.goal_diff:<4} "
+                         f"{consensus.source:<12}"
+                         + (self.format_odds(projection.get(consensus.team)) if projection else ''))
+        
+        lines.append('=' * 90)
+        return lines
+    
+    @staticmethod
+    def format_odds(odds):
+        """Columnas de probabilidad de liguilla directa y de play-in"""
+        if not odds:
+            return f" {'-':>6} {'-':>6}"
+        return f" {odds['liguilla'] * 100:>6.1f} {odds['play_in'] * 100:>6.1f}"
+    
+    def serialize_teams(self):
+        """teams_data con la forma JSON histórica (valores como texto)"""
+        return {
+            team_name: {
+                'name': data['name'],
+                'sources': {source: team.to_dict() for source, team in data['sources'].items()},
+                'consensus': data['consensus'].to_dict() if data['consensus'] else {},
+                'conflicts': data.get('conflicts', {}),
+            }
+            for team_name, data in self.teams_data.items()
+        }
     
     def save_to_json(self):
-        """Guarda los datos en archivo JSON"""
+        """Guarda los datos en archivo JSON si la tabla cambió desde la última vez"""
         try:
             data = {
                 'last_update': self.last_update.isoformat() if self.last_update else None,
                 'total_teams': len(self.teams_data),
-                'teams': self.teams_data,
+                'teams': self.serialize_teams(),
+                'projection': self.projection,
                 'metadata': {
                     'scraper_version': '2.0',
+                    'competition': self.competition,
                     'update_interval': '3 minutes',
                     'sources_available': list(self.sources.keys())
                 }
             }
             
-            with open('liga_mx_table.json', 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            print(f"💾 Datos guardados en liga_mx_table.json ({len(self.teams_data)} equipos)")
+            path = self.publisher.path
+            with self.metrics.span('save_json'):
+                written = self.publisher.publish(data)
+            self.metrics.inc('publish_total', result='written' if written else 'unchanged')
+            if written:
+                self.renderer.notice(f"💾 Datos guardados en {path} ({len(self.teams_data)} equipos)")
+                return True
+            self.renderer.notice(f"⏸️ Sin cambios en la tabla, {path} se conserva")
+            return False
             
         except Exception as e:
             logger.error(f"Error guardando JSON: {e}")
 
-def main():
-    scraper = LigaMXScraper()
+class AsyncLigaMXScraper(LigaMXScraper):
+    """Scraper asíncrono con un pool de conexiones compartido (requiere aiohttp)"""
+    
+    def __init__(self, limit_per_host=1, max_connections=20):
+        super().__init__()
+        self.limit_per_host = limit_per_host
+        self.max_connections = max_connections
+        self.http = None
+        
+        # Loop dedicado para los wrappers síncronos, conserva el pool entre ciclos
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()  # run_sync puede llamarse desde varios hilos
+        self._sync_calls = set()  # futures de run_sync aún en curso
+    
+    async def __aenter__(self):
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def open(self):
+        """Crea la sesión aiohttp; debe llamarse dentro del loop que la usará"""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp no está instalado: pip install aiohttp")
+        if self.http is None or self.http.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.limit_per_host,
+                ssl=False,
+                ttl_dns_cache=300
+            )
+            self.http = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=30),
+                trace_configs=[self.trace_config()]
+            )
+        return self.http
+    
+    def trace_config(self):
+        """Tiempos de DNS y de conexión por host a partir de las trazas de aiohttp"""
+        metrics = self.metrics
+        trace = aiohttp.TraceConfig()
+        
+        async def request_start(session, ctx, params):
+            ctx.host = urlparse(str(params.url)).netloc
+        
+        async def dns_start(session, ctx, params):
+            ctx.dns_started = time.perf_counter()
+        
+        async def dns_end(session, ctx, params):
+            metrics.observe('http_dns_seconds', time.perf_counter() - ctx.dns_started,
+                            host=getattr(ctx, 'host', params.host))
+        
+        async def connect_start(session, ctx, params):
+            ctx.connect_started = time.perf_counter()
+        
+        async def connect_end(session, ctx, params):
+            metrics.observe('http_connect_seconds', time.perf_counter() - ctx.connect_started,
+                            host=getattr(ctx, 'host', ''))
+        
+        async def connection_reused(session, ctx, params):
+            metrics.inc('http_connections_reused_total', host=getattr(ctx, 'host', ''))
+        
+        trace.on_request_start.append(request_start)
+        trace.on_dns_resolvehost_start.append(dns_start)
+        trace.on_dns_resolvehost_end.append(dns_end)
+        trace.on_connection_create_start.append(connect_start)
+        trace.on_connection_create_end.append(connect_end)
+        trace.on_connection_reuseconn.append(connection_reused)
+        return trace
+    
+    async def close(self):
+        """Cierra la sesión y libera las conexiones del pool"""
+        if self.http is not None and not self.http.closed:
+            await self.http.close()
+        self.http = None
+    
+    async def _sleep(self, seconds):
+        """Espera sin bloquear el event loop; devuelve True si el ciclo fue cancelado"""
+        cancel_event = fetch_cancel.get()
+        if cancel_event is None:
+            await asyncio.sleep(seconds)
+            return False
+        if cancel_event.is_set():
+            return True
+        if not isinstance(cancel_event, CancelEvent):
+            await asyncio.sleep(seconds)
+            return cancel_event.is_set()
+        
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        remove = cancel_event.add_callback(lambda: loop.call_soon_threadsafe(wake.set))
+        try:
+            await asyncio.wait_for(wake.wait(), seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            remove()
+    
+    async def make_request(self, url, retries=3):
+        """Versión asíncrona de make_request con el mismo planificador por host"""
+        http = await self.open()
+        
+        for attempt in range(retries):
+            try:
+                delay = self.scheduler.reserve(url, self.wait_budget())
+                if delay is None:
+                    self.log_over_budget(url)
+                    return None
+                if delay > 0:
+                    logger.info(f"Esperando {delay:.2f}s antes del intento {attempt + 1}")
+                    self.metrics.observe('scheduler_wait_seconds', delay, host=urlparse(url).netloc)
+                    if await self._sleep(delay):
+                        return None
+                
+                headers = self.get_random_headers()
+                if self.cache is not None:
+                    headers.update(self.cache.conditional_headers(url))
+                
+                started = time.monotonic()
+                async with http.get(url, headers=headers, allow_redirects=True) as resp:
+                    ttfb = time.monotonic() - started
+                    content = await resp.read()
+                    response = FetchedResponse(url, resp.status, content, resp.headers.copy())
+                latency = time.monotonic() - started
+                self.observe_http(url, response.status_code, ttfb, latency - ttfb, len(content), attempt)
+                self.scheduler.record(url, response.status_code, latency, response.headers.get('Retry-After'))
+                
+                logger.info(f"Response status: {response.status_code} para {url}")
+                
+                if response.status_code == 200:
+                    return self.cache.store(url, response) if self.cache is not None else response
+                elif response.status_code == 304 and self.cache is not None:
+                    cached = self.cache.not_modified_response(url)
+                    if cached is not None:
+                        return cached
+                elif response.status_code == 403:
+                    logger.warning(f"Acceso prohibido (403) - {url}")
+                elif response.status_code == 429:
+                    logger.warning(f"Rate limited (429) - {url}")
+                elif response.status_code in [404, 500, 502, 503]:
+                    logger.warning(f"Error del servidor ({response.status_code}) - {url}")
+                    
+            except asyncio.TimeoutError:
+                self.scheduler.record(url)
+                self.observe_http(url, 'timeout', attempt=attempt)
+                logger.warning(f"Timeout en intento {attempt + 1}")
+            except aiohttp.ClientConnectionError:
+                self.scheduler.record(url)
+                self.observe_http(url, 'connection_error', attempt=attempt)
+                logger.warning(f"Error de conexión en intento {attempt + 1}")
+            except Exception as e:
+                self.scheduler.record(url)
+                self.observe_http(url, 'error', attempt=attempt)
+                logger.error(f"Error en intento {attempt + 1}: {e}")
+                
+        return None
+    
+    async def fetch_table_rows(self, url, hints=(), retries=3):
+        """Versión asíncrona de la descarga en streaming acotada a la tabla"""
+        http = await self.open()
+        
+        for attempt in range(retries):
+            try:
+                delay = self.scheduler.reserve(url, self.wait_budget())
+                if delay is None:
+                    self.log_over_budget(url)
+                    return None
+                if delay > 0:
+                    logger.info(f"Esperando {delay:.2f}s antes del intento {attempt + 1}")
+                    if await self._sleep(delay):
+                        return None
+                
+                started = time.monotonic()
+                async with http.get(url, headers=self.get_random_headers(), allow_redirects=True) as resp:
+                    latency = time.monotonic() - started
+                    self.scheduler.record(url, resp.status, latency, resp.headers.get('Retry-After'))
+                    
+                    if resp.status != 200:
+                        logger.warning(f"Response status: {resp.status} para {url}")
+                        self.observe_http(url, resp.status, latency, attempt=attempt)
+                        continue
+                    
+                    table_parser = StandingsTableParser(hints=hints)
+                    decoder = None
+                    received = 0
+                    async for chunk in resp.content.iter_chunked(self.stream_chunk_size):
+                        if decoder is None:
+                            decoder = stream_decoder(resp.headers.get('Content-Type'), chunk)
+                        received += len(chunk)
+                        table_parser.feed(decoder.decode(chunk))
+                        if table_parser.done:
+                            # Cerrar sin leer el resto descarta la conexión
+                            resp.close()
+                            break
+                    else:
+                        if decoder is not None:
+                            table_parser.feed(decoder.decode(b'', final=True))
+                        table_parser.close()
+                
+                download = time.monotonic() - started - latency
+                self.observe_http(url, 200, latency, download, received, attempt)
+                rows = table_parser.result() or []
+                self.stream_stats[url] = received
+                logger.info(f"📉 Streaming {url}: {received} bytes leídos, {len(rows)} filas")
+                return rows
+                
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                self.scheduler.record(url)
+                self.observe_http(url, 'error', attempt=attempt)
+                logger.warning(f"Error de red en streaming (intento {attempt + 1}): {e}")
+        
+        return None
+    
+    def fetch_source(self, spec, retries=3):
+        """Etapa de descarga para hilos externos (RefreshPipeline) sobre el loop de fondo"""
+        if self.streaming:
+            return self.run_sync(self.fetch_table_rows(spec.url, spec.stream_hints, retries))
+        return self.run_sync(self.make_request(spec.url, retries)) or None
+    
+    async def fetch_teams(self, spec, retries=3):
+        """Descarga y parsea una fuente; el parseo corre fuera del event loop"""
+        if self.streaming:
+            rows = await self.fetch_table_rows(spec.url, spec.stream_hints, retries)
+            return None if rows is None else self.extract_teams(spec, rows)
+        
+        response = await self.make_request(spec.url, retries)
+        if not response:
+            return None
+        parser = partial(self.parse_source, spec.name)
+        return await asyncio.to_thread(self.parse_response, response, parser, spec.name)
+    
+    async def scrape_source(self, name, fallback=True):
+        """Motor genérico asíncrono; los scrape_* heredados devuelven esta corrutina"""
+        spec = self.source_specs[name]
+        health = self.health[name]
+        if not health.allow():
+            logger.info(f"⛔ {spec.label}: circuito abierto, se omite "
+                        f"(reintento en {health.retry_in():.0f}s)")
+        else:
+            started = time.monotonic()
+            teams = None
+            try:
+                teams = await self.fetch_teams(spec, health.retries())
+            except asyncio.CancelledError:
+                health.release()
+                raise
+            except Exception as e:
+                logger.error(f"Error en {spec.label}: {e}")
+            self.record_health(name, started, teams)
+            if teams:
+                return teams
+        
+        return await self.scrape_fallback(spec) if fallback else None
+    
+    async def scrape_fallback(self, spec):
+        """Sigue la cadena de respaldo declarada en la fuente"""
+        if spec.fallback == 'demo':
+            return self.scrape_simple_source()
+        if spec.fallback in self.source_specs:
+            return await self.scrape_source(spec.fallback)
+        return None
+    
+    async def scrape_all_sources_async(self, mode=None, deadline=None, strategy=None):
+        """Ejecuta los scrapers de forma concurrente dentro del event loop"""
+        mode = mode or self.fetch_mode
+        
+        if mode == 'fanout':
+            results = await self.scrape_sources_fanout_async(deadline=deadline, strategy=strategy)
+        else:
+            results = await self.scrape_sources_serial_async()
+        
+        if results:
+            self.set_freshness('fresh', time.time())
+            return results
+        return self.fallback_results()
+    
+    async def scrape_sources_serial_async(self):
+        """Intenta cada scraper en orden hasta obtener datos reales"""
+        for source_name, scraper_func in self.get_scrapers():
+            try:
+                logger.info(f"🔄 Intentando {source_name}...")
+                result = await scraper_func()
+                if self.is_valid_result(result):
+                    logger.info(f"✅ {source_name}: {len(result)} equipos obtenidos")
+                    return {source_name: result}
+                logger.warning(f"⚠️ {source_name}: datos insuficientes o vacíos")
+            except Exception as e:
+                logger.error(f"❌ Error en {source_name}: {e}")
+        return {}
+    
+    async def scrape_sources_fanout_async(self, deadline=None, strategy=None):
+        """Consulta todas las fuentes a la vez con un límite global de tiempo"""
+        deadline = self.cycle_deadline if deadline is None else deadline
+        strategy = strategy or self.fanout_strategy
+        scrapers = self.get_scrapers()
+        priority = {name: i for i, (name, _) in enumerate(scrapers)}
+        
+        tasks = {
+            asyncio.create_task(func(fallback=False), name=f"fanout-{name}"): name
+            for name, func in scrapers
+        }
+        loop = asyncio.get_running_loop()
+        end_time = loop.time() + deadline
+        pending = set(tasks)
+        valid = {}
+        
+        try:
+            while pending:
+                remaining = end_time - loop.time()
+                if remaining <= 0:
+                    names = ', '.join(tasks[task] for task in pending)
+                    logger.warning(f"⏱️ Límite de {deadline}s alcanzado, ignorando: {names}")
+                    break
+                    
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    source_name = tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.error(f"❌ Error en {source_name}: {e}")
+                        continue
+                    
+                    if self.is_valid_result(result):
+                        valid[source_name] = result
+                        logger.info(f"✅ {source_name}: {len(result)} equipos obtenidos")
+                    else:
+                        logger.warning(f"⚠️ {source_name}: datos insuficientes o vacíos")
+                
+                if valid and strategy == 'first':
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        return self.select_fanout_results(valid, priority, strategy)
+    
+    async def run_continuous_scraping_async(self, interval_minutes=1, warm_start=True):
+        """Scraping continuo sin bloquear el event loop de la aplicación"""
+        async with self:
+            if warm_start and not self.teams_data:
+                await asyncio.to_thread(self.warm_start)
+            while True:
+                try:
+                    results = await self.scrape_all_sources_async()
+                    if results:
+                        self.teams_data = self.consolidate_data(results)
+                        self.last_update = datetime.now()
+                        await asyncio.to_thread(self.save_to_json)
+                        # Los datos de demostración no entran al historial
+                        if any(source != 'demo_data' for source in results):
+                            await asyncio.to_thread(self.record_history, list(results))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error general: {e}")
+                
+                await asyncio.sleep(interval_minutes * 60)
+    
+    def _ensure_loop(self):
+        """Arranca (una sola vez) el loop de fondo usado por los wrappers síncronos"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name='async-scraper', daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+    
+    def run_sync(self, coro):
+        """Ejecuta una corrutina en el loop de fondo y espera su resultado"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        self._sync_calls.add(future)
+        try:
+            return future.result()
+        finally:
+            self._sync_calls.discard(future)
+    
+    def scrape_all_sources(self, mode=None, deadline=None, strategy=None):
+        """Wrapper síncrono para código existente (main, run_continuous_scraping)"""
+        return self.run_sync(self.scrape_all_sources_async(mode, deadline, strategy))
+    
+    def shutdown(self):
+        """Cierra la sesión y detiene el loop de fondo"""
+        if self._loop is None:
+            return
+        # Los hilos que esperan en run_sync (p. ej. RefreshPipeline) no deben quedar colgados
+        for future in list(self._sync_calls):
+            future.cancel()
+        self.run_sync(self.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+        self._loop_thread = None
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+
+
+def cached_table(path, max_age):
+    """Bytes de la tabla publicada en path si se verificó hace menos de max_age segundos
+    
+    La antigüedad es la del mtime del archivo: JsonPublisher sólo lo reescribe
+    cuando la tabla cambia y `once` lo toca cuando la confirma sin cambios.
+    """
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def build_scraper(args):
+    """Scraper para once/watch/serve según las opciones comunes del CLI"""
+    engine = args.engine
+    if engine == 'auto':
+        # El motor asíncrono comparte un pool de conexiones entre todas las fuentes
+        engine = 'async' if aiohttp is not None else 'sync'
+    scraper = AsyncLigaMXScraper() if engine == 'async' else LigaMXScraper()
+    scraper.parser_backend = args.parser
+    scraper.publisher = JsonPublisher(args.output)
+    scraper.staleness = StalenessPolicy(args.max_staleness, demo_fallback=not args.no_demo)
+    if args.parse_processes:
+        scraper.enable_process_parsing(args.parse_processes)
+    if args.results:
+        scraper.load_results(args.results)
+    return scraper
+
+
+def close_scraper(scraper):
+    if scraper.process_parser is not None:
+        scraper.process_parser.close()
+    if isinstance(scraper, AsyncLigaMXScraper):
+        scraper.shutdown()
+
+
+def command_once(args):
+    """Un ciclo completo y termina; 0 con datos reales, 1 con datos de demostración"""
+    if args.json and not args.competitions:
+        # Camino rápido: la tabla publicada sin importar la pila HTTP ni los parsers
+        payload = cached_table(args.output, args.max_age)
+        if payload is not None:
+            sys.stdout.buffer.write(payload)
+            sys.stdout.buffer.write(b'\n')
+            return 0
+    
+    if args.competitions:
+        runner = CompetitionRunner.from_file(args.competitions, display=not args.json)
+        try:
+            summary = runner.run_once()
+        finally:
+            runner.stop()
+        if args.json:
+            print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return 0 if summary else 1
     
+    scraper = build_scraper(args)
+    if args.json:
+        # stdout queda reservado para el JSON
+        scraper.renderer = TableRenderer(sys.stderr)
+    try:
+        # La última tabla real da la edad con la que la política decide si
+        # conservarla o recurrir a la demostración cuando fallan las fuentes
+        if not args.no_warm_start:
+            scraper.warm_start()
+        results = scraper.scrape_all_sources()
+        if not results:
+            if not scraper.teams_data:
+                logger.error("❌ No se obtuvieron datos de ninguna fuente")
+                return 1
+            # Se conserva la tabla publicada: no se reescribe y se muestra como vieja
+            if args.json and scraper.publisher.payload is not None:
+                sys.stdout.buffer.write(scraper.publisher.payload + b'\n')
+            elif not args.json:
+                scraper.display_table()
+            return 1
+        scraper.teams_data = scraper.consolidate_data(results)
+        scraper.last_update = datetime.now()
+        if args.project:
+            scraper.project_standings(args.project, seed=args.seed)
+        if not args.json:
+            scraper.display_table()
+        scraper.save_to_json()  # sin cambios sólo renueva el mtime (antigüedad para --max-age)
+        real = any(source != 'demo_data' for source in results)
+        if real:
+            scraper.record_history(list(results))
+        if args.json and scraper.publisher.payload is not None:
+            sys.stdout.buffer.write(scraper.publisher.payload)
+            sys.stdout.buffer.write(b'\n')
+        return 0 if real else 1
+    finally:
+        close_scraper(scraper)
+
+
+def print_banner():
     print("🏆 SCRAPER LIGA MX - TIEMPO REAL MULTIFUENTES v3.0")
     print("=" * 70)
     print("🔴 MODO TIEMPO REAL ACTIVADO:")
@@ -655,18 +4860,133 @@ def main():
     print("✓ Liga MX Oficial - Fuente primaria")
     print("✓ Fox Sports MX - Datos alternativos")
     print("✓ Medio Tiempo - Respaldo confiable")
-    print("✓ Actualización cada 1 minuto")
+    print("✓ Actualización adaptativa según calendario y cambios")
     print("✓ Anti-detección avanzado")
     print("✓ Headers realistas 2024")
     print("✓ Manejo inteligente de errores")
     print("✓ Datos reales vs demostración")
     print("=" * 70)
+
+
+def command_watch(args):
+    """Actualización continua (y API de lectura con serve) hasta Ctrl+C"""
+    if args.competitions:
+        runner = CompetitionRunner.from_file(args.competitions, display=True)
+        try:
+            runner.run_forever(interval=args.interval)
+        except KeyboardInterrupt:
+            print("\n👋 ¡Scraper en tiempo real detenido! ¡Hasta luego!")
+        finally:
+            runner.stop()
+        return 0
     
+    scraper = build_scraper(args)
+    print_banner()
     try:
-        # Ejecutar scraping en tiempo real (cada minuto)
-        scraper.run_continuous_scraping(interval_minutes=1)
+        if args.command == 'serve':
+            scraper.serve_api(args.host, args.port)
+        # Sondeo adaptativo: rápido en partidos y con cambios, espaciado con la tabla estable
+        policy = PollingPolicy.from_file(base_interval=args.interval)
+        scraper.metrics.start_dump('liga_mx_metricas.json', interval=60)
+        scraper.run_continuous_scraping(interval_minutes=args.interval / 60, policy=policy,
+                                        warm_start=not args.no_warm_start)
     except KeyboardInterrupt:
         print("\n👋 ¡Scraper en tiempo real detenido! ¡Hasta luego!")
+    finally:
+        scraper.metrics.stop_dump()
+        if scraper.api is not None:
+            scraper.api.stop()
+        close_scraper(scraper)
+    return 0
+
+
+def command_bench(args):
+    """Ejecuta benchmarks/<nombre>.py (o bench_<nombre>.py) con el resto de argumentos"""
+    available = sorted(name[:-3] for name in os.listdir(BENCHMARKS_DIR) if name.endswith('.py'))
+    name = args.name if args.name in available else f'bench_{args.name}'
+    if name not in available:
+        print(f"Benchmark desconocido: {args.name}. Disponibles: "
+              f"{', '.join(n.removeprefix('bench_') for n in available)}", file=sys.stderr)
+        return 2
+    path = os.path.join(BENCHMARKS_DIR, f'{name}.py')
+    sys.argv = [path] + args.args
+    try:
+        runpy.run_path(path, run_name='__main__')
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
+
+def build_cli():
+    parser = argparse.ArgumentParser(
+        prog='tabla.py',
+        description='Tabla general de la Liga MX en tiempo real desde varias fuentes',
+    )
+    commands = parser.add_subparsers(dest='command', metavar='{' + ','.join(CLI_COMMANDS) + '}')
+    
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--engine', choices=('auto', 'sync', 'async'), default='auto',
+                        help='Motor de descarga (auto: asíncrono si aiohttp está instalado)')
+    common.add_argument('--parser', default='auto',
+                        choices=['auto'] + list(PARSER_BACKENDS), help='Backend de parseo HTML')
+    common.add_argument('--output', default='liga_mx_table.json', help='JSON publicado')
+    common.add_argument('--competitions', nargs='?', const=COMPETITIONS_FILE, metavar='ARCHIVO',
+                        help='Todas las competiciones habilitadas de ARCHIVO (competiciones.json)')
+    common.add_argument('--results', nargs='?', const=CALENDAR_FILE, metavar='ARCHIVO',
+                        help='Valida cada consenso contra la tabla calculada con los resultados de ARCHIVO')
+    common.add_argument('--parse-processes', type=int, default=0, metavar='N',
+                        help='Parsea el HTML en un pool de N procesos')
+    common.add_argument('--max-staleness', type=float, default=86400.0, metavar='SEG',
+                        help='Con las fuentes caídas se sirve la última tabla real hasta esta '
+                             'antigüedad; después, la demostración (por defecto 86400)')
+    common.add_argument('--no-demo', action='store_true',
+                        help='Nunca publica datos de demostración')
+    common.add_argument('--no-warm-start', action='store_true',
+                        help='No arranca con la última tabla guardada')
+    
+    once = commands.add_parser('once', parents=[common],
+                               help='Un ciclo: descarga, muestra y guarda la tabla y termina '
+                                    '(código 1 si sólo hubo datos de demostración)')
+    once.add_argument('--json', action='store_true',
+                      help='Imprime la tabla publicada en JSON; si es reciente no descarga nada')
+    once.add_argument('--max-age', type=float, default=300.0, metavar='SEG',
+                      help='Antigüedad máxima de la tabla guardada para --json (por defecto 300)')
+    once.add_argument('--project', type=int, default=0, metavar='N',
+                      help='Proyección Monte Carlo con N simulaciones')
+    once.add_argument('--seed', type=int, help='Semilla de la proyección')
+    
+    for name, help_text in (('watch', 'Actualización continua con intervalo adaptativo (por defecto)'),
+                            ('serve', 'Actualización continua y API HTTP de lectura')):
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.add_argument('--interval', type=float, default=60.0, metavar='SEG',
+                             help='Intervalo base entre ciclos (por defecto 60)')
+        if name == 'serve':
+            command.add_argument('--host', default='127.0.0.1')
+            command.add_argument('--port', type=int, default=8080)
+    
+    bench = commands.add_parser('bench', help='Ejecuta un benchmark de benchmarks/')
+    bench.add_argument('name', help='cycle, parsers, render, startup...')
+    bench.add_argument('args', nargs=argparse.REMAINDER, help='Argumentos del benchmark')
+    return parser
+
+
+CLI_COMMANDS = ('once', 'watch', 'serve', 'bench')
+
+
+def main(argv=None):
+    parser = build_cli()
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in CLI_COMMANDS + ('-h', '--help'):
+        # Sin subcomando se conserva el comportamiento histórico: watch
+        # (también con opciones sueltas, como `tabla.py --interval 5`)
+        argv.insert(0, 'watch')
+    args = parser.parse_args(argv)
+    
+    if args.command == 'once':
+        return command_once(args)
+    if args.command == 'bench':
+        return command_bench(args)
+    return command_watch(args)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())